@@ -0,0 +1,70 @@
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from openreview_stream import json_to_csv
+
+words = "the model results method baseline dataset we propose experiments shows improvement paper reviewer".split()
+
+
+def write_dump(path, n_records, seed=0):
+    """Synthetic API2 review dump with review-sized text fields, written record by record."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("[")
+        for i in range(n_records):
+            content = {key: {"value": " ".join(rng.choice(words) for _ in range(rng.randint(50, 300)))}
+                       for key in ["summary", "strengths", "weaknesses", "questions"]}
+            content["rating"] = {"value": rng.randint(1, 10)}
+            record = {"id": f"review{i}", "forum": f"paper{i // 4}", "content": content,
+                      "cdate": 1690000000000 + i, "readers": ["everyone"], "signatures": [f"Reviewer_{i}"]}
+            f.write(("," if i else "") + json.dumps(record))
+        f.write("]")
+
+def load_all_to_csv(json_file, csv_file):
+    # the previous converter: json.load, a list of flat dicts, then one write
+    with open(json_file, 'r') as f:
+        data = json.load(f)
+    content_keys = sorted({k for record in data for k in record.get("content", {})})
+    csv_data = [{**{k: v for k, v in record.items() if k != "content"},
+                 **{k: record["content"].get(k, {}).get('value', '') for k in content_keys}} for record in data]
+    headers = ["id"] + content_keys + sorted(k for k in data[0] if k not in ["id", "content"])
+    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=headers)
+        writer.writeheader()
+        writer.writerows(csv_data)
+
+def measure(convert, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    convert(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Peak memory of json.load vs. streaming conversion.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 8000, 32000], help="records per dump")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    print(f"{'records':>8} {'dump MB':>8} {'json.load MB':>13} {'stream MB':>10} {'zip stream MB':>14} {'load s':>7} {'stream s':>9}")
+    for n_records in args.sizes:
+        json_file = os.path.join(tmp_dir, f"dump{n_records}.json")
+        zip_file = json_file + ".zip"
+        write_dump(json_file, n_records)
+        with zipfile.ZipFile(zip_file, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.write(json_file, arcname="reviews.json")
+        load_time, load_peak = measure(load_all_to_csv, json_file, os.path.join(tmp_dir, "a.csv"))
+        stream_time, stream_peak = measure(json_to_csv, json_file, os.path.join(tmp_dir, "b.csv"), 2)
+        _, zip_peak = measure(json_to_csv, zip_file, os.path.join(tmp_dir, "c.csv"), 2)
+        size = os.path.getsize(json_file) / 1024 / 1024
+        print(f"{n_records:>8} {size:>8.1f} {load_peak:>13.1f} {stream_peak:>10.1f} {zip_peak:>14.1f} "
+              f"{load_time:>7.2f} {stream_time:>9.2f}")
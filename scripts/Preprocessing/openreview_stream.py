@@ -0,0 +1,169 @@
+import argparse
+import csv
+import itertools
+import os
+import zipfile
+import ijson
+
+# content keys that come first in the CSV, per OpenReview API version (have to manually check and order the columns
+# for easy processing later). API1 keeps only these; API2 appends every other content key it finds, sorted.
+content_schemas = {
+    1: {
+        "ordered_content_keys": [
+            "summary_of_the_paper",
+            "strength_and_weaknesses",
+            "clarity,_quality,_novelty_and_reproducibility",
+            "summary_of_the_review",
+            "confidence",
+            "correctness",
+            "technical_novelty_and_significance",
+            "empirical_novelty_and_significance",
+            "flag_for_ethics_review",
+            "recommendation"
+        ],
+        "extra_content_keys": False
+    },
+    2: {
+        "ordered_content_keys": [
+            "summary",
+            "strengths",
+            "weaknesses",
+            "questions",
+            "limitations",
+            "flag_for_ethics_review",
+            "rating",
+            "confidence",
+            "Reviewer_Confidence",
+            "code_of_conduct",
+            "contribution",
+            "presentation",
+            "soundness"
+        ],
+        "extra_content_keys": True
+    }
+}
+
+
+def content_value(value, api):
+    """API1 stores content values directly (lists are joined), API2 wraps each one as {"value": ...}."""
+    if api == 1:
+        return ", ".join(value) if isinstance(value, list) else value
+    return value.get('value', '') if isinstance(value, dict) else ''
+
+
+class open_json:
+    """Open a plain JSON file, or a JSON member of a zip archive, as a binary stream without extracting it."""
+
+    def __init__(self, path, member=None):
+        self.path = path
+        self.member = member
+        self.archive = None
+
+    def __enter__(self):
+        if not zipfile.is_zipfile(self.path):
+            self.stream = open(self.path, 'rb')
+            return self.stream
+        self.archive = zipfile.ZipFile(self.path)
+        member = self.member or only_json_member(self.archive)
+        self.stream = self.archive.open(member)
+        return self.stream
+
+    def __exit__(self, *exc):
+        self.stream.close()
+        if self.archive:
+            self.archive.close()
+
+def archive_json_names(archive):
+    return [name for name in archive.namelist() if name.endswith('.json') and not name.startswith('__MACOSX')]
+
+def json_members(zip_path):
+    with zipfile.ZipFile(zip_path) as archive:
+        return archive_json_names(archive)
+
+def only_json_member(archive):
+    members = archive_json_names(archive)
+    if len(members) != 1:
+        raise ValueError(f"{archive.filename} holds {len(members)} JSON files; pass member= to pick one")
+    return members[0]
+
+
+def record_events(stream):
+    """(record prefix, parser events) of a stream: records are the items of a top-level array, or the
+    top-level object itself when the dump holds a single note."""
+    events = ijson.parse(stream, use_float=True)
+    first = next(events, None)
+    if first is None:
+        return 'item', iter(())
+    return ('' if first[1] == 'start_map' else 'item'), itertools.chain([first], events)
+
+def iter_records(path, member=None):
+    """Yield the records of a JSON array one at a time; a single top-level object is yielded as one record."""
+    with open_json(path, member) as stream:
+        prefix, events = record_events(stream)
+        yield from ijson.items(events, prefix)
+
+def discover_keys(path, member=None):
+    """Top-level and content keys of all records, from parser events only (no record is built)."""
+    top_keys, content_keys = {}, {}
+    with open_json(path, member) as stream:
+        record, events = record_events(stream)
+        content = f"{record}.content" if record else "content"
+        for prefix, event, value in events:
+            if event != 'map_key':
+                continue
+            if prefix == record:
+                top_keys[value] = None
+            elif prefix == content:
+                content_keys[value] = None
+    return list(top_keys), list(content_keys)
+
+def csv_headers(top_keys, content_keys, api):
+    """Column order id, content keys, other metadata; also returns the content keys to flatten."""
+    schema = content_schemas[api]
+    all_content_keys = list(schema["ordered_content_keys"])
+    if schema["extra_content_keys"]:
+        all_content_keys += [key for key in sorted(content_keys) if key not in all_content_keys]
+    other_keys = sorted(k for k in top_keys if k not in ["id", "content"] + all_content_keys)
+    return ["id"] + all_content_keys + other_keys, all_content_keys
+
+def flatten(record, all_content_keys, api):
+    flat_record = {}
+    for key, value in record.items():
+        if key == "content" and isinstance(value, dict):
+            for sub_key in all_content_keys:
+                flat_record[sub_key] = content_value(value.get(sub_key, "" if api == 1 else {}), api)
+        else:
+            flat_record[key] = value
+    return flat_record
+
+def json_to_csv(json_file, csv_file, api, member=None):
+    """Stream an OpenReview JSON dump (or a JSON member of a zip) into a CSV; memory does not grow with the dump."""
+    top_keys, content_keys = discover_keys(json_file, member)
+    headers, all_content_keys = csv_headers(top_keys, content_keys, api)
+
+    count = 0
+    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=headers, extrasaction='ignore')
+        writer.writeheader()
+        for record in iter_records(json_file, member):
+            writer.writerow(flatten(record, all_content_keys, api))
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert OpenReview JSON dumps (plain or zipped) to CSV.")
+    parser.add_argument("input", help="<venue>_reviews.json or a zip archive such as all_rebuttals.zip")
+    parser.add_argument("output", help="output CSV, or a folder when converting every JSON member of a zip")
+    parser.add_argument("--api", type=int, choices=[1, 2], required=True, help="OpenReview API version of the dump")
+    parser.add_argument("--member", help="JSON member of the zip archive to convert")
+    args = parser.parse_args()
+
+    if zipfile.is_zipfile(args.input) and not args.member and len(json_members(args.input)) > 1:
+        os.makedirs(args.output, exist_ok=True)
+        for member in json_members(args.input):
+            csv_file = os.path.join(args.output, os.path.splitext(os.path.basename(member))[0] + '.csv')
+            print(f"{member}: {json_to_csv(args.input, csv_file, args.api, member)} rows -> {csv_file}")
+    else:
+        count = json_to_csv(args.input, args.output, args.api, args.member)
+        print(f"JSON data has been successfully converted to CSV and saved as {args.output} ({count} rows).")
@@ -0,0 +1,33 @@
+import argparse
+import random
+import statistics
+import time
+from bench_reference_parser import old_extract_years, synthetic_paper
+from reference_parser import reference_years
+
+
+def latency(function, texts):
+    """Median and worst per-paper latency in ms."""
+    times = []
+    for text in texts:
+        start = time.perf_counter()
+        function(text)
+        times.append(1000 * (time.perf_counter() - start))
+    return statistics.median(times), max(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-paper latency of citation-year extraction on long reference lists.")
+    parser.add_argument("--refs", type=int, nargs="+", default=[50, 100, 200, 400, 800], help="references per paper")
+    parser.add_argument("--papers", type=int, default=20, help="papers per size")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'refs':>5} {'regex + arXiv rewrite ms':>25} {'max':>8} {'single scan ms':>15} {'max':>8} {'speed-up':>9}")
+    for n_refs in args.refs:
+        papers = [[rng.randint(1990, 2024) for _ in range(n_refs)] for _ in range(args.papers)]
+        texts = [synthetic_paper(years, rng) for years in papers]
+        assert all(sorted(reference_years(t)) == sorted(years) for t, years in zip(texts, papers))
+        old_median, old_max = latency(old_extract_years, texts)
+        new_median, new_max = latency(reference_years, texts)
+        print(f"{n_refs:>5} {old_median:>25.2f} {old_max:>8.2f} {new_median:>15.2f} {new_max:>8.2f} {old_median / new_median:>8.1f}x")
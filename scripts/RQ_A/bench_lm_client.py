@@ -0,0 +1,54 @@
+'''pip install aiohttp'''
+
+import asyncio
+import threading
+import time
+from aiohttp import web
+from lm_client import ChatClient
+
+# mock server settings: simulated inference time per request
+host = '127.0.0.1'
+port = 8765
+latency = 0.05
+
+n_reviews = 256
+concurrency_levels = [1, 4, 16, 64]
+
+review_text = "summary: The paper proposes a new method. weaknesses: The related work misses several papers."
+question = "Does this peer review explicitly suggest the authors of the paper to cite any specific literature?"
+
+
+# minimal OpenAI-compatible /v1/chat/completions endpoint
+async def chat_completions(request):
+    payload = await request.json()
+    await asyncio.sleep(latency)
+    return web.json_response({
+        "model": payload.get("model"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "Yes, mock answer."}}]
+    })
+
+def start_mock_server():
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_post('/v1/chat/completions', chat_completions)
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, host, port).start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+def run_benchmark():
+    start_mock_server()
+    jobs = [(f"{review_text} ({i})", question) for i in range(n_reviews)]
+    api_url = f'http://{host}:{port}/v1/chat/completions'
+
+    print(f"{n_reviews} reviews, simulated latency {latency * 1000:.0f} ms per request")
+    for concurrency in concurrency_levels:
+        client = ChatClient(api_url, model="mock-model", concurrency=concurrency)
+        start = time.perf_counter()
+        responses = client.complete_all(jobs)
+        elapsed = time.perf_counter() - start
+        failed = sum(response is None for response in responses)
+        print(f"concurrency {concurrency:>3}: {n_reviews / elapsed:8.1f} reviews/s ({elapsed:.2f} s, {failed} failed)")
+
+if __name__ == "__main__":
+    run_benchmark()
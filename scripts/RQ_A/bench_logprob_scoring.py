@@ -0,0 +1,96 @@
+'''pip install aiohttp'''
+
+import asyncio
+import math
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+import pandas as pd
+from aiohttp import web
+from lm_client import ChatClient
+from prompt_eval import evaluate, load_gold, prediction_matrix
+
+# mock server settings: prompt processing per request and decoding per generated token
+host = '127.0.0.1'
+port = 8766
+prefill = 0.02
+per_token = 0.003
+explanation_tokens = 120
+
+n_reviews = 96
+concurrency = 16
+question = "Does this peer review suggest the authors of the paper to refer to any other literature? Answer yes or no at the beginning."
+
+# hidden truth of every mock review and the model's belief in "yes", which the mock answers are drawn from
+rng = np.random.default_rng(0)
+truth = rng.integers(0, 2, n_reviews)
+belief = 1 / (1 + np.exp(-(1.2 * (2 * truth - 1) + rng.normal(0, 1.5, n_reviews))))
+completion_tokens = {"generate": 0, "score": 0}
+
+
+# OpenAI-compatible /v1/chat/completions endpoint that "decodes" max_tokens (or a full explanation) token by token
+async def chat_completions(request):
+    payload = await request.json()
+    review = int(payload["messages"][1]["content"].split("review ")[1].split(":")[0])
+    p_yes = belief[review]
+    answer = "Yes" if p_yes >= 0.5 else "No"
+    n_tokens = min(payload.get("max_tokens", explanation_tokens), explanation_tokens)
+    await asyncio.sleep(prefill + per_token * n_tokens)
+    choice = {"index": 0, "message": {"role": "assistant", "content": answer + ", the reviewer ... " * (n_tokens > 1)}}
+    if payload.get("logprobs"):
+        completion_tokens["score"] += n_tokens
+        choice["logprobs"] = {"content": [{"token": answer, "logprob": math.log(max(p_yes, 1 - p_yes)), "top_logprobs": [
+            {"token": "Yes", "logprob": math.log(p_yes * 0.9)}, {"token": "No", "logprob": math.log((1 - p_yes) * 0.9)},
+            {"token": " yes", "logprob": math.log(p_yes * 0.1)}, {"token": " no", "logprob": math.log((1 - p_yes) * 0.1)}]}]}
+    else:
+        completion_tokens["generate"] += n_tokens
+    return web.json_response({"model": payload.get("model"), "choices": [choice],
+                              "usage": {"completion_tokens": n_tokens}})
+
+def start_mock_server():
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_post('/v1/chat/completions', chat_completions)
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, host, port).start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+
+if __name__ == "__main__":
+    start_mock_server()
+    api_url = f'http://{host}:{port}/v1/chat/completions'
+    jobs = [(f"review {i}: The related work misses several papers.", question) for i in range(n_reviews)]
+    ids = [f"r{i}" for i in range(n_reviews)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        gold_file = os.path.join(folder, "gold.csv")
+        pd.DataFrame({"id": ids, "citation_suggestions": truth}).to_csv(gold_file, index=False)
+        timings = {}
+        files = []
+        for mode, score_yes_no in [("generate", False), ("score", True)]:
+            client = ChatClient(api_url, model="mock-model", concurrency=concurrency,
+                                extra_params={"stream": False, "max_tokens": 500}, score_yes_no=score_yes_no)
+            start = time.perf_counter()
+            responses = client.complete_all(jobs)
+            timings[mode] = time.perf_counter() - start
+            if score_yes_no:
+                scores = [float(r) for r in responses]
+            else:
+                scores = [1.0 if r.lower().startswith("yes") else 0.0 for r in responses]
+            files.append(os.path.join(folder, f"mock_{mode}.csv"))
+            pd.DataFrame({"id": ids, "score": scores}).to_csv(files[-1], index=False)
+
+        gold = load_gold(gold_file)
+        results, curves = evaluate(gold, prediction_matrix(gold, files), n_bootstrap=1000)
+
+    print(f"{n_reviews} reviews, {concurrency} at a time; mock server: {prefill * 1000:.0f} ms per request + "
+          f"{per_token * 1000:.0f} ms per generated token, {explanation_tokens}-token explanations")
+    print(f"{'':>22} {'seconds':>8} {'ms/request':>10} {'tokens/review':>14} {'PR curve points':>16} {'PR-AUC (95% CI)':>22}")
+    for (mode, seconds), (_, row) in zip(timings.items(), results.iterrows()):
+        print(f"{mode + (' (yes/no text)' if mode == 'generate' else ' (1 token, P(yes))'):>22} {seconds:>8.2f} "
+              f"{1000 * seconds / n_reviews * concurrency:>10.0f} {completion_tokens[mode] / n_reviews:>14.0f} "
+              f"{len(curves[row['File']][0]):>16} "
+              f"{row['PR_AUC']:>8.3f} ({row['PR_AUC_lower']:.3f}-{row['PR_AUC_upper']:.3f})")
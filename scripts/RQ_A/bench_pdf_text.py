@@ -0,0 +1,75 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from PyPDF2 import PdfReader
+from pdf_text import TextCache, iter_pdf_pages, pdf_files
+
+words = "learning neural networks attention graph language model robust efficient training via deep".split()
+
+
+def write_pdf(path, n_pages, rng, lines_per_page=50):
+    """Minimal text-only PDF: one Helvetica content stream per page, written without a PDF library."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(n_pages):
+        lines = [" ".join(rng.choice(words) for _ in range(12)) for _ in range(lines_per_page)]
+        if rng.random() < 0.3:
+            lines.append(f"In Proceedings of ICLR, {rng.randint(1990, 2023)}.")
+        stream = "BT /F1 9 Tf 11 TL 40 780 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {n_pages} >>"
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n" + "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    with open(path, "w", encoding="latin-1") as f:
+        f.write(out)
+
+def serial_extract(paths):
+    # the previous get_cited_titles.py: one process, extract_text called twice per page
+    for path in paths:
+        reader = PdfReader(path)
+        "\n".join([page.extract_text() for page in reader.pages if page.extract_text()])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pages/sec of PDF text extraction at 1..N workers and from the cache.")
+    parser.add_argument("--files", type=int, default=48, help="synthetic PDFs")
+    parser.add_argument("--pages", type=int, default=12, help="pages per PDF")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="worker counts (default: 1, 2, 4, ... cores)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    tmp_dir = tempfile.mkdtemp()
+    for i in range(args.files):
+        write_pdf(os.path.join(tmp_dir, f"submission{i}.pdf"), args.pages, rng)
+    paths = pdf_files(tmp_dir)
+    total_pages = args.files * args.pages
+    worker_counts = args.workers or sorted({1, os.cpu_count()} | {w for w in (2, 4, 8, 16, 32) if w < os.cpu_count()})
+
+    start = time.perf_counter()
+    serial_extract(paths)
+    print(f"{'serial, 2x extract_text':>24}: {total_pages / (time.perf_counter() - start):8.1f} pages/s")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = list(iter_pdf_pages(paths, workers=workers, cache=False, progress=False))
+        elapsed = time.perf_counter() - start
+        assert all(pages and len(pages) == args.pages for _, pages in results)
+        print(f"{f'{workers} worker(s)':>24}: {total_pages / elapsed:8.1f} pages/s")
+
+    cache = TextCache(os.path.join(tmp_dir, "cache.sqlite"))
+    list(iter_pdf_pages(paths, cache=cache, progress=False))
+    start = time.perf_counter()
+    list(iter_pdf_pages(paths, cache=cache, progress=False))
+    print(f"{'warm cache':>24}: {total_pages / (time.perf_counter() - start):8.1f} pages/s")
+    print(f"cache: {cache.stats()}")
@@ -0,0 +1,83 @@
+import argparse
+import os
+import tempfile
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, auc, f1_score, precision_recall_curve, recall_score
+from prompt_eval import add_run, evaluate_files, load_gold, prediction_matrix
+
+warnings.filterwarnings("ignore")   # sklearn's zero-division warnings of degenerate resamples
+
+
+def write_runs(folder, n_reviews, n_runs, rng):
+    """Gold file and n_runs prediction files with continuous scores and about 5% of the reviews missing."""
+    ids = [f"r{i}" for i in range(n_reviews)]
+    labels = rng.integers(0, 2, n_reviews)
+    pd.DataFrame({"id": ids, "review": "text " * 50, "citation_suggestions": labels}).to_csv(
+        os.path.join(folder, "gold.csv"), index=False)
+    files = []
+    for k in range(n_runs):
+        scores = np.clip(labels * rng.uniform(0.2, 0.6) + rng.random(n_reviews) * 0.6, 0, 1).round(2)
+        kept = rng.random(n_reviews) > 0.05
+        file = os.path.join(folder, f"venue_model_{k}.csv")
+        pd.DataFrame({"id": np.array(ids)[kept], "review": "text " * 50, "response": "Yes, the reviewer ...",
+                      "binary_label": scores[kept]}).to_csv(file, index=False)
+        files.append(file)
+    return os.path.join(folder, "gold.csv"), files
+
+# the former per-file loop: read whole files, merge on id, sklearn per run (and per resample for intervals)
+def old_evaluate(gold_file, files, n_bootstrap, rng):
+    reference_df = pd.read_csv(gold_file)
+    results = []
+    for file in files:
+        merged_df = reference_df.merge(pd.read_csv(file), on="id", suffixes=("_ref", "_pred"))
+        y_true = merged_df["citation_suggestions"].to_numpy()
+        scores = merged_df["binary_label"].to_numpy(dtype=float)
+        row = []
+        for sample in [np.arange(len(y_true))] + [rng.integers(0, len(y_true), len(y_true)) for _ in range(n_bootstrap)]:
+            y, s = y_true[sample], scores[sample]
+            precision, recall, _ = precision_recall_curve(y, s)
+            row.append((accuracy_score(y, s >= 0.5), recall_score(y, s >= 0.5), f1_score(y, s >= 0.5), auc(recall, precision)))
+        results.append(row[0])
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-file merge + sklearn loop vs. the prompt_eval score matrix.")
+    parser.add_argument("--reviews", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=36, help="models x prompts")
+    parser.add_argument("--resamples", type=int, default=1000)
+    parser.add_argument("--old-resamples", type=int, default=20, help="resamples for the former loop")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as folder:
+        gold_file, files = write_runs(folder, args.reviews, args.runs, rng)
+        print(f"{args.runs} runs over {args.reviews} reviews")
+
+        start = time.perf_counter()
+        old = old_evaluate(gold_file, files, args.old_resamples, rng)
+        old_time = time.perf_counter() - start
+        start = time.perf_counter()
+        results, _ = evaluate_files(gold_file, files, args.resamples)
+        new_time = time.perf_counter() - start
+
+        # one more model/prompt: one column read, the gold labels and the other runs are not read again
+        gold = load_gold(gold_file)
+        start = time.perf_counter()
+        matrix = prediction_matrix(gold, files[:-1])
+        reload_time = time.perf_counter() - start
+        start = time.perf_counter()
+        add_run(matrix, files[-1])
+        add_time = time.perf_counter() - start
+
+    per_old = old_time / (1 + args.old_resamples)
+    print(f"{'':>30} {'resamples':>10} {'seconds':>8}")
+    print(f"{'merge + sklearn per file':>30} {args.old_resamples:>10} {old_time:>8.2f}"
+          f"   (~{per_old * (1 + args.resamples):.0f} s for {args.resamples})")
+    print(f"{'prompt_eval.evaluate_files':>30} {args.resamples:>10} {new_time:>8.2f}")
+    print(f"reading all {args.runs - 1} other runs again: {reload_time:.2f} s, add_run for one more: {add_time:.3f} s")
+    same = np.allclose(np.array(old), results[["Accuracy", "Recall", "F1", "PR_AUC"]].to_numpy())
+    print("same point estimates as sklearn:", same)
@@ -0,0 +1,115 @@
+import argparse
+import glob
+import os
+import random
+import re
+import time
+import pandas as pd
+from reference_parser import parse_references
+
+corpus_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'processed_data',
+                             'processed_data_for_citations_in_paper')
+words = "learning neural networks attention graph language model robust efficient training via deep".split()
+surnames = "Smith Chen Wang Garcia Kumar Müller Rossi Kim Nguyen Ivanov Dubois Tanaka".split()
+
+
+def synthetic_reference(year, rng):
+    """One reference in an ICLR/NeurIPS (year last), ACL (year after the authors) or arXiv style."""
+    authors = ", ".join(f"{rng.choice('ABCDEFGHJKLMN')}. {rng.choice(surnames)}" for _ in range(rng.randint(1, 4)))
+    title = " ".join(rng.choice(words) for _ in range(rng.randint(4, 10))).capitalize()
+    style = rng.random()
+    if year >= 2008 and style < 0.2:
+        arxiv_id = f"{year % 100:02d}{rng.randint(1, 12):02d}.{rng.randint(1, 19999):05d}"
+        return f"{authors}. {title}. arXiv preprint\narXiv:{arxiv_id}, {year}."
+    if style < 0.5:
+        return f"{authors}. {year}. {title}. In Proceedings of\nthe Conference, pages {rng.randint(1, 900)}–{rng.randint(901, 999)}."
+    return f"{authors}. {title}. In Advances in Neural\nInformation Processing Systems, pp. {rng.randint(1, 900)}, {year}."
+
+def synthetic_paper(years, rng):
+    """Body, references section built from a paper's extracted years, and an appendix, as PDF text."""
+    body = "\n".join(" ".join(rng.choice(words) for _ in range(14)) for _ in range(200))
+    references = "\n".join(synthetic_reference(year, rng) for year in years)
+    appendix = "\n".join(" ".join(rng.choice(words) for _ in range(14)) for _ in range(50))
+    return f"{body}\nREFERENCES\n{references}\nA APPENDIX\n{appendix} in 2019.\n"
+
+def load_corpus(limit=None):
+    """Extracted years of every paper in processed_data_for_citations_in_paper (the four venue files)."""
+    papers = []
+    for path in sorted(glob.glob(os.path.join(corpus_folder, "*_citation_analysis_results.csv"))):
+        if os.path.basename(path).startswith("updated_"):
+            continue  # same papers with the citation age added
+        df = pd.read_csv(path, nrows=limit)
+        papers.extend([int(y) for y in str(s).split(",")] for s in df["extracted_years"].dropna())
+    return papers
+
+
+# the two previous jobs: years from extract_citation_years.py and reference strings from get_cited_titles.py
+def old_extract_years(text):
+    references_start = re.search(r"\bREFERENCES\b", text)
+    if not references_start:
+        return []
+    references_text = text[references_start.start():]
+    year_matches = re.findall(r"(?:\s?\(?)(19[0-9]{2}|20([01][0-9]|2[0-5]))(?:\)?[a-zA-Z]*\.?|\s?[a-zA-Z]+\s?\d{4}[\.]?)", references_text)
+    years = [int(match[0]) for match in year_matches]
+    processed_years = []
+    for year in years:
+        if re.search(rf"arXiv:\s?{year}", references_text):
+            processed_years.append(int("20" + str(year)[:2]))
+        else:
+            processed_years.append(year)
+    return processed_years
+
+def old_extract_references(text):
+    match = re.search(r"\bREFERENCES\b", text, re.IGNORECASE)
+    if not match:
+        return []
+    references_text = text[match.end():].strip()
+    stop_match = re.search(r"\b(Appendix|Acknowledgments)\b", references_text, re.IGNORECASE)
+    if stop_match:
+        references_text = references_text[:stop_match.start()].strip()
+    references, current_ref = [], ""
+    ref_boundary_pattern = re.compile(r".*(\d{4}[a-z]?\.|https?://\S+)$")
+    for line in references_text.split("\n"):
+        line = line.strip()
+        current_ref = current_ref + " " + line if current_ref else line
+        if ref_boundary_pattern.match(line):
+            references.append(" ".join(current_ref.split()))
+            current_ref = ""
+    if current_ref:
+        references.append(" ".join(current_ref.split()))
+    return references
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Two regex jobs vs. the single-pass reference parser on the citation corpus.")
+    parser.add_argument("--limit", type=int, default=None, help="papers per venue (default: all)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = load_corpus(args.limit)
+    n_references = sum(len(years) for years in corpus)
+    old_time = new_time = 0.0
+    old_exact = new_exact = old_count = new_count = titled = text_size = 0
+    # papers are generated one at a time so the whole corpus never sits in memory as text
+    for years in corpus:
+        text = synthetic_paper(years, rng)
+        text_size += len(text)
+        start = time.perf_counter()
+        old_years, old_references = old_extract_years(text), old_extract_references(text)
+        old_time += time.perf_counter() - start
+        start = time.perf_counter()
+        records = parse_references(text)
+        new_time += time.perf_counter() - start
+
+        # agreement with the years the synthetic paper was built from
+        old_exact += sorted(years) == sorted(old_years)
+        new_exact += sorted(years) == sorted(r["year"] for r in records if r["year"])
+        old_count += len(old_references) == len(years)
+        new_count += len(records) == len(years)
+        titled += sum(r["title"] is not None for r in records)
+
+    print(f"{len(corpus)} papers, {n_references} references, {text_size / 1024 / 1024:.0f} MB of text")
+    print(f"{'':>22} {'seconds':>8} {'ms/paper':>9} {'papers with exact years':>23} {'papers with all refs':>21}")
+    print(f"{'two regex jobs':>22} {old_time:>8.1f} {1000 * old_time / len(corpus):>9.2f} {old_exact:>23} {old_count:>21}")
+    print(f"{'reference parser':>22} {new_time:>8.1f} {1000 * new_time / len(corpus):>9.2f} {new_exact:>23} {new_count:>21}")
+    print(f"candidate titles for {titled / n_references:.1%} of the references")
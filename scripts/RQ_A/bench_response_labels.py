@@ -0,0 +1,74 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+import response_labels
+from response_labels import LabelStore, csv_files, label_response, update
+
+annotated_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'processed_data',
+                                'annotated_data_for_reviews')
+
+# hand-checked responses and the (label, rule) they must get
+cases = [
+    ("Yes, the reviewer asks for a comparison with [1].", (1, "leading")),
+    ("No. The review only discusses the experiments, but yes, it is thorough.", (0, "leading")),
+    ("The review does not explicitly suggest any references.", (0, "negation")),
+    ("The reviewer suggests that the authors cite prior work on retrieval.", (1, "suggestion")),
+    ("The answer is yes, it points to related papers.", (1, "contains_yes")),
+    ("Yesterday's results caught the reviewer's eyes, nothing more.", (0, "default")),
+]
+
+
+# the former assign_tags.py: "yes" anywhere in the response, every CSV read and written back on every run
+def old_assign_tags(folder):
+    for file_path in csv_files(folder):
+        df = pd.read_csv(file_path)
+        if 'response' in df.columns:
+            df['binary_label'] = df['response'].apply(lambda x: 1 if 'yes' in str(x).lower() else 0)
+            df.to_csv(file_path, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-place 'yes' tagging vs. the compiled rules and the (file, id) label table.")
+    parser.add_argument("--folder", default=annotated_folder)
+    args = parser.parse_args()
+
+    for response, expected in cases:
+        label, _, rule = label_response(response)
+        if (label, rule) != expected:
+            print(f"case failed: {response!r} -> {(label, rule)}, expected {expected}")
+
+    with tempfile.TemporaryDirectory() as work:
+        folder = shutil.copytree(args.folder, os.path.join(work, "runs"))
+        files = csv_files(folder)
+        former = {f: pd.read_csv(f, usecols=lambda c: c in ("id", "binary_label")) for f in files}
+
+        start = time.perf_counter()
+        old_assign_tags(folder)
+        old_time = time.perf_counter() - start
+
+        store = LabelStore(os.path.join(work, "labels.sqlite"))
+        timings = []
+        for name in ["first run", "nothing changed", "rules changed"]:
+            if name == "rules changed":
+                response_labels.rules_version += 1
+            start = time.perf_counter()
+            labelled, unchanged, _ = update(files, store)
+            timings.append((name, labelled, time.perf_counter() - start))
+
+        changed = {}
+        for f, df in former.items():
+            if "binary_label" in df:
+                merged = df.drop_duplicates("id").astype({"id": str}).merge(store.labels(f), on="id")
+                for rule in merged.loc[merged["binary_label"] != merged["label"], "rule"]:
+                    changed[rule] = changed.get(rule, 0) + 1
+        store.close()
+
+    print(f"{len(files)} CSVs")
+    print(f"{'':>34} {'files labelled':>15} {'seconds':>8}")
+    print(f"{'in-place yes tagging':>34} {len(files):>15} {old_time:>8.3f}")
+    for name, labelled, seconds in timings:
+        print(f"{'label table, ' + name:>34} {labelled:>15} {seconds:>8.3f}")
+    print(f"labels that differ from the former binary_label, by deciding rule: {changed}")
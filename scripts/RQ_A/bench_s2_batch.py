@@ -0,0 +1,121 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import s2
+from rate_limiter import RateLimiter
+from paper_store import PaperStore
+
+# stub server settings
+host = '127.0.0.1'
+port = 8767
+throttle_every = 7  # every n-th request is answered with 429 and Retry-After
+n_papers = 1200
+
+counters = {"requests": 0, "throttled": 0, "batch": 0, "single": 0}
+counter_lock = threading.Lock()
+
+
+def fake_paper(paper_id):
+    return {"paperId": paper_id, "title": f"Paper {paper_id}", "authors": [], "abstract": None,
+            "fieldsOfStudy": ["Computer Science"]}
+
+def is_known(paper_id):
+    # ids ending in 0 do not exist, ids containing "bad" are malformed
+    return not paper_id.endswith("0")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Counts requests and mimics /paper/{id} and /paper/batch of the S2 Graph API, including 429s."""
+
+    def log_message(self, *args):
+        pass
+
+    def _throttle(self):
+        with counter_lock:
+            counters["requests"] += 1
+            throttle = counters["requests"] % throttle_every == 0
+            if throttle:
+                counters["throttled"] += 1
+        if throttle:
+            self.send_response(429)
+            self.send_header("Retry-After", "0.05")
+            self.end_headers()
+        return throttle
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self._throttle():
+            return
+        counters["single"] += 1
+        paper_id = urlparse(self.path).path.rsplit("/", 1)[-1]
+        if is_known(paper_id):
+            self._reply(200, fake_paper(paper_id))
+        else:
+            self._reply(404, {"error": "Paper not found"})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self._throttle():
+            return
+        counters["batch"] += 1
+        ids = body.get("ids", [])
+        if len(ids) > 500 or any(re.search("bad", pid) for pid in ids):
+            self._reply(400, {"error": "Invalid id or too many ids"})
+            return
+        self._reply(200, [fake_paper(pid) if is_known(pid) else None for pid in ids])
+
+
+def run_benchmark():
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    s2.S2_API_URL = f"http://{host}:{port}/graph/v1"
+
+    paper_ids = [f"p{i:05d}" for i in range(n_papers)] + ["bad-id"]
+
+    # per-id lookups on a sample, as process_csv did with progress_apply
+    sample = paper_ids[:100]
+    tmp_dir = tempfile.mkdtemp()
+    s2.store = PaperStore(os.path.join(tmp_dir, "single.sqlite"))
+    s2.s2_limiter = RateLimiter(rate=200, burst=10, max_rate=200)
+    counters.update(requests=0, throttled=0, batch=0, single=0)
+    start = time.perf_counter()
+    single = {pid: s2.get_paper_details(pid) for pid in sample}
+    single_time = time.perf_counter() - start
+    print(f"per-id: {len(sample)} papers, {counters['requests']} requests "
+          f"({counters['throttled']} throttled), {single_time:.2f} s")
+
+    s2.store = PaperStore(os.path.join(tmp_dir, "batch.sqlite"))
+    s2.s2_limiter = RateLimiter(rate=200, burst=10, max_rate=200)
+    counters.update(requests=0, throttled=0, batch=0, single=0)
+    start = time.perf_counter()
+    details = s2.get_paper_details_batch(paper_ids)
+    batch_time = time.perf_counter() - start
+    found = sum(d is not None for d in details.values())
+    print(f"batch:  {len(paper_ids)} papers, {counters['requests']} requests "
+          f"({counters['throttled']} throttled), {batch_time:.2f} s, {found} found")
+
+    # the batch path has to agree with the per-id lookups
+    assert all(details[pid] == single[pid] for pid in sample), "batch and per-id results differ"
+    assert details["bad-id"] is None
+
+    # a second venue citing the same papers is answered from the local store
+    counters.update(requests=0, throttled=0, batch=0, single=0)
+    again = s2.get_paper_details_batch(paper_ids)
+    print(f"warm store: {counters['requests']} requests, {s2.store.stats()}")
+    assert all(again[pid]["title"] == details[pid]["title"] for pid in paper_ids if details[pid])
+    server.shutdown()
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import re
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from extract_suggested_years import extract_directory, save
+
+words = "the reviewer suggests comparing with prior work on retrieval and see also the related benchmark".split()
+
+
+def write_responses(folder, n_files, n_rows, rng):
+    """Response CSVs like the llama70b outputs: review columns plus a response citing a few papers in all three styles."""
+    for k in range(n_files):
+        responses = []
+        for _ in range(n_rows):
+            parts = list(rng.choice(words, 40))
+            for _ in range(rng.integers(0, 6)):
+                style = rng.integers(0, 3)
+                year = int(rng.integers(1995, 2025))
+                parts.append(f"(Smith et al., {year})" if style == 0 else f"[Lee '{year % 100:02d}]" if style == 1
+                             else f"arXiv:{year % 100:02d}{rng.integers(1, 13):02d}.{rng.integers(0, 99999):05d}")
+            responses.append(" ".join(parts))
+        pd.DataFrame({"id": [f"v{k}r{i}" for i in range(n_rows)], "summary": "summary " * 80,
+                      "weaknesses": "weaknesses " * 80, "response": responses}).to_csv(
+            os.path.join(folder, f"venue{k}_llama70b_all.csv"), index=False)
+
+# the former process_csv_files: extract_years per row through .apply and an extracted_ copy of every file
+def old_process_csv_files(directory):
+    pattern = re.compile(r"(?<=\b)(19[0-9]{2}|20(0[0-9]|1[0-9]|2[0-4]))\b|(?:'(\d{2}))|(?:abs\/|arxiv\.org\/pdf\/|arXiv:|arXiv )(\d{2})(\d{2})")
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".csv") and not filename.startswith("extracted_"):
+            filepath = os.path.join(directory, filename)
+            df = pd.read_csv(filepath)
+
+            def extract_years(text):
+                matches = [
+                    match[0] if match[0] and len(match[0]) == 4 else
+                    f"20{match[3]}" if match[3] else
+                    (f"{'19' if int(match[2]) > 24 else '20'}{match[2]}" if match[2] else None)
+                    for match in pattern.findall(text)
+                ]
+                return ", ".join(filter(None, matches)) if matches else ""
+
+            df["suggested_years"] = df["response"].astype(str).apply(extract_years)
+            df.to_csv(os.path.join(directory, f"extracted_{filename}"), index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Row-wise extraction + extracted_ copies vs. the pooled long table.")
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work:
+        folder = os.path.join(work, "responses")
+        os.makedirs(folder)
+        write_responses(folder, args.files, args.rows, np.random.default_rng(0))
+        input_mb = sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder)) / 1024 / 1024
+
+        start = time.perf_counter()
+        table = extract_directory(folder, args.workers)
+        save(table, os.path.join(work, "suggested_years.parquet"))
+        new_time = time.perf_counter() - start
+        new_mb = os.path.getsize(os.path.join(work, "suggested_years.parquet")) / 1024 / 1024
+
+        start = time.perf_counter()
+        old_process_csv_files(folder)
+        old_time = time.perf_counter() - start
+        copies = [f for f in os.listdir(folder) if f.startswith("extracted_")]
+        old_mb = sum(os.path.getsize(os.path.join(folder, f)) for f in copies) / 1024 / 1024
+
+        old_years = []
+        for f in sorted(copies):
+            for years in pd.read_csv(os.path.join(folder, f), usecols=["suggested_years"])["suggested_years"].dropna():
+                old_years.extend(int(y) for y in str(years).split(", "))
+
+    print(f"{args.files} files x {args.rows} responses ({input_mb:.0f} MB), {len(table)} years")
+    print(f"{'':>32} {'seconds':>8} {'output MB':>10}")
+    print(f"{'.apply per row + extracted_ CSVs':>32} {old_time:>8.2f} {old_mb:>10.1f}")
+    print(f"{'extract_directory + Parquet':>32} {new_time:>8.2f} {new_mb:>10.2f}")
+    print("same years in the same order:", old_years == table["year"].tolist())
+    print(table.groupby("source_kind", observed=False).size().to_dict())
@@ -0,0 +1,99 @@
+import argparse
+import glob
+import os
+import random
+import time
+import pandas as pd
+from paper_store import PaperStore, normalize_title
+from title_index import TitleIndex, min_score, trigrams
+
+# annotated suggestions: paper_info holds the manually corrected title of each suggested paper
+annotated_files = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "processed_data",
+                                                "annotated_data_for_suggested_papers", "*_extra_annoatated_pur.csv")))
+
+
+def load_titles(files):
+    titles = []
+    for file_path in files:
+        titles.extend(pd.read_csv(file_path)["paper_info"].dropna().tolist())
+    # keep one spelling per title and skip acronyms like 'DualRL' that are not titles
+    unique = {normalize_title(t): t.strip() for t in titles if len(normalize_title(t).split()) >= 4}
+    return list(unique.values())
+
+def add_noise(title, rng):
+    """Damage a title the way LLM extraction does: case, punctuation, typos, a dropped or extra word."""
+    words = title.lower().replace(":", "").replace("-", " ").split()
+    if len(words) > 6 and rng.random() < 0.3:
+        words.pop(rng.randrange(len(words)))
+    if rng.random() < 0.2:
+        words.insert(0, rng.choice(["paper", "the paper", "titled"]))
+    text = list(" ".join(words))
+    for _ in range(max(1, len(text) // 40)):
+        i = rng.randrange(len(text))
+        text[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(text)
+
+def distractor_titles(titles, n, rng):
+    """Plausible but wrong titles built from the vocabulary of the real ones, to grow the index."""
+    vocab = [w for t in titles for w in t.split()]
+    return [" ".join(rng.choice(vocab) for _ in range(rng.randint(5, 12))) for _ in range(n)]
+
+def linear_scan(titles_grams, query):
+    # what a plain difflib-style pass would do: score every title
+    query_grams = trigrams(query)
+    best, best_score = None, 0.0
+    for entry, grams in enumerate(titles_grams):
+        score = 2 * len(query_grams & grams) / (len(query_grams) + len(grams))
+        if score > best_score:
+            best, best_score = entry, score
+    return best if best_score >= min_score else None
+
+
+def run_benchmark(n_distractors, held_out_share, seed, store_path=None):
+    rng = random.Random(seed)
+    titles = load_titles(annotated_files)
+    rng.shuffle(titles)
+    n_held_out = int(len(titles) * held_out_share)
+    held_out, indexed = titles[:n_held_out], titles[n_held_out:]
+
+    start = time.perf_counter()
+    index = TitleIndex()
+    index.add_titles((title, f"P{i}") for i, title in enumerate(indexed))
+    index.add_titles((title, "distractor") for title in distractor_titles(titles, n_distractors, rng))
+    if store_path:
+        index.add_store(PaperStore(store_path))
+    expected = {normalize_title(t): f"P{i}" for i, t in enumerate(indexed)}
+    print(f"{len(titles)} annotated titles from {len(annotated_files)} files, index holds {len(index)} titles "
+          f"(built in {time.perf_counter() - start:.1f} s)")
+
+    queries = [(add_noise(t, rng), expected[normalize_title(t)]) for t in indexed]
+    queries += [(add_noise(t, rng), None) for t in held_out]
+
+    start = time.perf_counter()
+    answers = [index.resolve(q) for q, _ in queries]
+    elapsed = time.perf_counter() - start
+
+    resolved = [(a, e) for a, (_, e) in zip(answers, queries) if a is not None]
+    correct = sum(a == e for a, e in resolved)
+    known = [a for a, (_, e) in zip(answers, queries) if e is not None]
+    print(f"index:  {len(queries) / elapsed:,.0f} queries/s ({elapsed / len(queries) * 1e6:.0f} us/query)")
+    print(f"resolved offline: {len(resolved)} / {len(queries)}, precision {correct / max(len(resolved), 1):.3f}, "
+          f"recall on indexed titles {sum(a is not None for a in known) / max(len(known), 1):.3f}, "
+          f"{len(queries) - len(resolved)} go to the network")
+    print(f"held-out titles wrongly resolved: {sum(a is not None for a, (_, e) in zip(answers, queries) if e is None)} / {len(held_out)}")
+
+    sample = queries[:200]
+    start = time.perf_counter()
+    for query, _ in sample:
+        linear_scan(index.grams, query)
+    scan = (time.perf_counter() - start) / len(sample)
+    print(f"linear scan: {1 / scan:,.0f} queries/s ({scan * 1e6:.0f} us/query)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput and precision of offline title resolution.")
+    parser.add_argument("--distractors", type=int, default=50000, help="synthetic titles added to the index")
+    parser.add_argument("--held-out", type=float, default=0.2, help="share of titles left out of the index")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--store", help="also index the titles of this paper store")
+    args = parser.parse_args()
+    run_benchmark(args.distractors, args.held_out, args.seed, args.store)
@@ -1,13 +1,18 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+import os
+import sys
 
-# citation years from peer reviews
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import load
+from extract_suggested_years import output_path as suggested_years_path
+
+# citation years from peer reviews: the response files' rows of the long table of extract_suggested_years.py
 files = [
-    'extracted_EMNLP2023_llama70b_all.csv', 
-    'extracted_ICLR2023_llama70b_all.csv', 
-    'extracted_NeurIPS2023_llama70b_all.csv', 
-    'extracted_NeurIPS2024_llama70b_all.csv'
+    'EMNLP2023_llama70b_all.csv', 
+    'ICLR2023_llama70b_all.csv', 
+    'NeurIPS2023_llama70b_all.csv', 
+    'NeurIPS2024_llama70b_all.csv'
 ]
 
 venues = ["EMNLP2023", "ICLR2023", "NeurIPS2023", "NeurIPS2024"]
@@ -18,13 +23,12 @@ citation_ages = {}
 
 file_to_venue = dict(zip(files, venues))
 
+suggested_years = load(suggested_years_path, columns=['file', 'year'], filters=[('file', 'in', files)])
 for file in files:
     venue = file_to_venue[file]
-    venue_data = pd.read_csv(file)
-    suggested_years = venue_data['suggested_years'].dropna().apply(lambda x: [int(i.strip()) for i in x.split(',')])
-    all_suggested_years = [year for sublist in suggested_years for year in sublist]
+    all_suggested_years = suggested_years.loc[suggested_years['file'] == file, 'year'].to_numpy(dtype=int)
     actual_years[venue] = all_suggested_years
-    citation_ages[venue] = [venue_years[venue] - year for year in all_suggested_years]
+    citation_ages[venue] = venue_years[venue] - all_suggested_years
 
 avg_actual_years = {venue: np.mean(years) for venue, years in actual_years.items()}
 median_actual_years = {venue: np.median(years) for venue, years in actual_years.items()}
@@ -44,19 +48,19 @@ avg_citing_years, med_citing_years = [], []
 avg_citing_ages, med_citing_ages = [], []
 
 for file in file_names:
-    df = pd.read_csv(file)
+    df = load(file, columns=['extracted_years', 'average_year'])
     venue_year = int(''.join(filter(str.isdigit, file)))
     venue_name = file.split('_')[0]
     venue_name_year.append(venue_name)
     
-    last_column = df.iloc[:, -1]
-    avg_citing_years.append(last_column.mean())
-    med_citing_years.append(last_column.median())
-
-    df['extracted_years'] = df['extracted_years'].apply(lambda x: list(map(int, x.split(','))))
-    df['citation_age'] = df['extracted_years'].apply(lambda years: [venue_year - year for year in years])
-    df['citation_age_average'] = df['citation_age'].apply(lambda x: sum(x) / len(x) if len(x) > 0 else 0)
-    df['citation_age_median'] = df['citation_age'].apply(lambda x: pd.Series(x).median())
+    avg_citing_years.append(df['average_year'].mean())
+    med_citing_years.append(df['average_year'].median())
+
+    # extracted_years holds one array of years per paper
+    df = df[df['extracted_years'].notna()]
+    df['citation_age'] = df['extracted_years'].apply(lambda years: venue_year - years.astype(int))
+    df['citation_age_average'] = df['citation_age'].apply(lambda x: x.mean() if len(x) > 0 else 0)
+    df['citation_age_median'] = df['citation_age'].apply(lambda x: np.median(x) if len(x) > 0 else np.nan)
     avg_citing_ages.append(df['citation_age_average'].mean())
     med_citing_ages.append(df['citation_age_median'].mean())
 
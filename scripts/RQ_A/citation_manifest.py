@@ -0,0 +1,102 @@
+import argparse
+import os
+import sqlite3
+import time
+from pdf_text import file_hash
+
+# default manifest location; one manifest holds every venue so aggregates across venues need no rescan
+manifest_path = 'citation_years_manifest.sqlite'
+# bump when the year extraction changes, so papers processed by an older version count as changed
+result_version = 2
+
+
+class CitationManifest:
+    """Per-PDF citation-year results keyed by (venue, filename), with the size, mtime and hash they were computed from.
+
+    Each row also stores the sum and count of the paper's years, so venue and overall averages are
+    computed in SQL without touching the PDFs or the years again."""
+
+    def __init__(self, path=manifest_path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS papers (
+                venue TEXT,
+                filename TEXT,
+                size INTEGER,
+                mtime REAL,
+                sha256 TEXT,
+                version INTEGER,
+                years TEXT,
+                year_sum INTEGER,
+                year_count INTEGER,
+                processed REAL,
+                PRIMARY KEY (venue, filename)
+            )""")
+        self.conn.commit()
+
+    def changed_files(self, venue, pdf_paths):
+        """PDFs that are new, changed or were processed by an older version; also forgets PDFs that were removed.
+
+        Size and mtime decide first; a file whose mtime moved but whose content hash is unchanged is only re-stamped."""
+        known = {row[0]: row[1:] for row in self.conn.execute(
+            "SELECT filename, size, mtime, sha256, version FROM papers WHERE venue = ?", (venue,))}
+        changed = []
+        present = set()
+        for pdf_path in pdf_paths:
+            filename = os.path.basename(pdf_path)
+            present.add(filename)
+            stat = os.stat(pdf_path)
+            entry = known.get(filename)
+            if entry and entry[3] == result_version and entry[0] == stat.st_size and entry[1] == stat.st_mtime:
+                continue
+            key = file_hash(pdf_path)
+            if entry and entry[3] == result_version and entry[2] == key:
+                self.conn.execute("UPDATE papers SET size = ?, mtime = ? WHERE venue = ? AND filename = ?",
+                                  (stat.st_size, stat.st_mtime, venue, filename))
+                continue
+            changed.append((pdf_path, stat.st_size, stat.st_mtime, key))
+        removed = [(venue, filename) for filename in known if filename not in present]
+        self.conn.executemany("DELETE FROM papers WHERE venue = ? AND filename = ?", removed)
+        self.conn.commit()
+        return changed, len(removed)
+
+    def put(self, venue, pdf_path, size, mtime, key, years):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO papers (venue, filename, size, mtime, sha256, version, years, year_sum, year_count, processed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (venue, os.path.basename(pdf_path), size, mtime, key, result_version,
+             ', '.join(map(str, years)), sum(years), len(years), time.time()))
+        self.conn.commit()
+
+    def results(self, venue):
+        """Rows of the results CSV for a venue: papers with at least one year, ordered by filename."""
+        return [{'filename': filename, 'extracted_years': years, 'average_year': round(year_sum / year_count, 2)}
+                for filename, years, year_sum, year_count in self.conn.execute(
+                    "SELECT filename, years, year_sum, year_count FROM papers "
+                    "WHERE venue = ? AND year_count > 0 ORDER BY filename", (venue,))]
+
+    def aggregates(self):
+        """{venue: (papers, citations, average year)} plus an overall entry under None, from the stored sums."""
+        rows = self.conn.execute(
+            "SELECT venue, COUNT(*), SUM(year_count), SUM(year_sum) FROM papers WHERE year_count > 0 GROUP BY venue"
+        ).fetchall()
+        aggregates = {venue: (papers, count, total / count) for venue, papers, count, total in rows}
+        papers = sum(r[1] for r in rows)
+        count = sum(r[2] for r in rows)
+        if count:
+            aggregates[None] = (papers, count, sum(r[3] for r in rows) / count)
+        return aggregates
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the per-venue aggregates stored in the citation-year manifest.")
+    parser.add_argument("--manifest", default=manifest_path, help="path to the SQLite manifest")
+    args = parser.parse_args()
+    for venue, (papers, count, average) in CitationManifest(args.manifest).aggregates().items():
+        print(f"{venue or 'overall'}: {papers} papers, {count} citations, average year {average:.2f}")
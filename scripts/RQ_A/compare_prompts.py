@@ -1,9 +1,9 @@
-import pandas as pd
-from sklearn.metrics import accuracy_score, recall_score, f1_score, precision_recall_curve, auc
+import argparse
 import matplotlib.pyplot as plt
-from sklearn.metrics import PrecisionRecallDisplay
 import numpy as np
-import seaborn as sns  
+import seaborn as sns
+from prompt_eval import evaluate_venues
+from response_labels import labels_path
 
 
 # annotated reviews grouped by venues (EMNLP, NeurIPS, ICLR)
@@ -28,51 +28,6 @@ files_groups = {
     ]
 }
 
-# load and align data
-def load_and_align(files):
-    dataframes = {}
-    for file in files:
-        df = pd.read_csv(file)
-        dataframes[file] = df
-    return dataframes
-
-# acc, recall, precision, f1
-def compute_metrics(reference_df, compare_df, file_name, group_name):
-    merged_df = reference_df.merge(compare_df, on="id", suffixes=("_ref", "_pred"))
-    
-    true_label_col = "citation_suggestions_ref" if "citation_suggestions_ref" in merged_df.columns else "citation_suggestions"
-    pred_label_col = "binary_label" if "binary_label" in merged_df.columns else "citation_suggestions_pred"
-    
-    if not true_label_col or not pred_label_col:
-        print(f"Skipping {file_name} due to missing columns.")
-        return None, None, None, None
-    
-    y_true = merged_df[true_label_col].astype(int)
-    y_pred_probs = merged_df[pred_label_col].astype(float)
-    y_pred = (y_pred_probs >= 0.5).astype(int)
-    
-    accuracy = accuracy_score(y_true, y_pred)
-    recall = recall_score(y_true, y_pred)
-    f1 = f1_score(y_true, y_pred)
-    
-    plot_precision_recall_curve(y_true, y_pred_probs, file_name, group_name)
-    
-    return accuracy, recall, f1, y_pred_probs
-
-# process each group
-def process_group(group_name, files):
-    dataframes = load_and_align(files)
-    reference_df = dataframes[files[0]]
-    
-    results = []
-    for file, df in dataframes.items():
-        if file != files[0]:
-            accuracy, recall, f1, _ = compute_metrics(reference_df, df, file, group_name)
-            results.append((file, accuracy, recall, f1))
-    
-    results_df = pd.DataFrame(results, columns=["File", "Accuracy", "Recall", "F1"])
-    return results_df
-
 # plots
 def plot_results(results_df, group_name):
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
@@ -81,7 +36,12 @@ def plot_results(results_df, group_name):
     
     for i, metric in enumerate(metrics):
         ax = axes[i]
-        bars = ax.bar(results_df["File"], results_df[metric], color=colors[i])
+        # bootstrap interval of every run, when evaluated with resamples
+        yerr = None
+        if f"{metric}_lower" in results_df:
+            yerr = np.clip([results_df[metric] - results_df[f"{metric}_lower"],
+                            results_df[f"{metric}_upper"] - results_df[metric]], 0, None)
+        bars = ax.bar(results_df["File"], results_df[metric], yerr=yerr, capsize=3, color=colors[i])
         
         ax.set_yticks(np.arange(0, 1.1, 0.1))
         ax.set_ylim(0, 1.1)
@@ -100,20 +60,11 @@ def plot_results(results_df, group_name):
     plt.tight_layout()
     plt.show()
 
-# store PR curves per venue
-pr_curve_data = {"EMNLP": [], "NeurIPS": [], "ICLR": []}
-
-def plot_precision_recall_curve(y_true, y_pred_probs, file_name, group_name):
-    precision, recall, _ = precision_recall_curve(y_true, y_pred_probs)
-    pr_auc = auc(recall, precision)
-    pr_curve_data[group_name].append((precision, recall, pr_auc, file_name))
-
-
-def plot_top_5_venue_pr_curves(group_name):
+def plot_top_5_venue_pr_curves(curves, group_name):
     plt.figure(figsize=(8, 6))
     
-    # sort PR curves by auc and select top 5
-    sorted_curves = sorted(pr_curve_data[group_name], key=lambda x: x[2], reverse=True)[:5]
+    # sort PR curves by auc and select top 5; curves is {run: (precision, recall, pr_auc)}
+    sorted_curves = sorted(((*curve, run) for run, curve in curves.items()), key=lambda x: x[2], reverse=True)[:5]
     
     # determine the highest auc value
     best_auc = sorted_curves[0][2]
@@ -123,7 +74,7 @@ def plot_top_5_venue_pr_curves(group_name):
     
     for i, (precision, recall, pr_auc, file_name) in enumerate(sorted_curves):
         color = 'red' if pr_auc == best_auc else color_palette[i]
-        legend_name = "_".join(file_name.split("_")[1:3])  # shorten legend names
+        legend_name = "_".join(file_name.split("_")[1:])  # shorten legend names (drop the venue)
         plt.plot(recall, precision, label=f'{legend_name} (AUC={pr_auc:.2f})', color=color, linewidth=2)
     
     plt.xlabel('Recall')
@@ -133,7 +84,23 @@ def plot_top_5_venue_pr_curves(group_name):
     plt.grid(True)
     plt.show()
 
-for group_name, files in files_groups.items():
-    results_df = process_group(group_name, files)
-    plot_results(results_df, group_name)
-    plot_top_5_venue_pr_curves(group_name)
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the model/prompt responses of every venue against the gold labels.")
+    parser.add_argument("--resamples", type=int, default=1000, help="bootstrap resamples for the intervals (0: none)")
+    parser.add_argument("--workers", type=int, default=None, help="venues evaluated in parallel (default: all cores)")
+    parser.add_argument("--labels", default=labels_path,
+                        help="label table written by assign_tags.py; files it does not hold use their binary_label column")
+    parser.add_argument("--add", nargs=2, action="append", default=[], metavar=("VENUE", "FILE"),
+                        help="one more prediction file of a venue, e.g. a scored sweep: --add ICLR ICLR_prompt_sweep.csv")
+    args = parser.parse_args()
+
+    for group_name, file in args.add:
+        files_groups[group_name].append(file)
+
+    # one process per venue; each loads its gold labels once and scores all runs as one matrix
+    evaluations = evaluate_venues(files_groups, args.resamples, workers=args.workers, labels=args.labels)
+    for group_name, (results_df, curves) in evaluations.items():
+        print(group_name)
+        print(results_df.round(3).to_string(index=False))
+        plot_results(results_df, group_name)
+        plot_top_5_venue_pr_curves(curves, group_name)
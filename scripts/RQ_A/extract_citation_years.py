@@ -1,108 +1,68 @@
-!pip install PyPDF2
+'''pip install PyPDF2'''
 
+import argparse
 import os
-import re
 import csv
-from tqdm import tqdm  # For progress bar
-from PyPDF2 import PdfReader
+import time
+from citation_manifest import CitationManifest
+from pdf_text import iter_pdf_pages, join_pages, pdf_files
+from reference_parser import reference_years
 
 # path to the submission PDFs
 pdf_directory = '/content/drive/MyDrive/Thesis/EMNL2023_submissions'
 output_csv_path = '/content/drive/MyDrive/Thesis/EMNL2023_citation_analysis_results.csv'
 
-# extract text from PDF using PdfReader
-def extract_text_from_pdf(pdf_path):
-    try:
-        reader = PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    except Exception as e:
-        print(f"Error reading {pdf_path}: {e}")
-        return ""
-
-# Function to process arXiv years
-def process_arxiv_years(years, text):
-    processed_years = []
-    for year in years:
-        match = re.search(rf"arXiv:\s?{year}", text)
-        if match:
-            new_year = int("20" + str(year)[:2])  # Modify arXiv years
-            processed_years.append(new_year)
-        else:
-            processed_years.append(year)
-    return processed_years
-    
-# Function to extract references and publication years
+# Function to extract publication years: one per reference. reference_parser scans the references section once and
+# classifies arXiv ids, DOIs and years in place, so "arXiv:1905.01234" is never read as 1905; a reference with
+# only an arXiv id gets the year of the id
 def extract_references_and_years(text):
-    # locate the References section
-    references_start = re.search(r"\bREFERENCES\b", text)
-    if not references_start:
-        return []  # No References section found
-
-    references_text = text[references_start.start():]
-
-    # extract years in the form of numbers like 2020, 2021b, etc.
-    year_matches = re.findall(r"(?:\s?\(?)(19[0-9]{2}|20([01][0-9]|2[0-5]))(?:\)?[a-zA-Z]*\.?|\s?[a-zA-Z]+\s?\d{4}[\.]?)", references_text)
-
-    # Extract only the numeric year part
-    years = [int(match[0]) for match in year_matches]
-
-    # Process arXiv years
-    years = process_arxiv_years(years, references_text)
-
-    return years
-
-
-# process all PDFs and analyze citation years
-def analyze_citation_years(pdf_directory, output_csv_path):
-    all_years = []
-    paper_averages = []
-    results = []  
-
-    # get the list of PDF files
-    pdf_files = [f for f in os.listdir(pdf_directory) if f.endswith('.pdf')]
-
-    # progress bar
-    with tqdm(total=len(pdf_files), unit="file") as pbar:
-        for filename in pdf_files:
-            pdf_path = os.path.join(pdf_directory, filename)
-
-            # extract text from PDF
-            text = extract_text_from_pdf(pdf_path)
-
-            # extract years from the references section
-            years = extract_references_and_years(text)
-
-            if years:
-                paper_average = sum(years) / len(years)
-                paper_averages.append((filename, paper_average))
-                print(f"{filename}, Average Year: {paper_average}, Years: {years}")
-                # qdd results to csv 
-                results.append({
-                    'filename': filename,
-                    'extracted_years': ', '.join(map(str, years)),
-                    'average_year': round(paper_average, 2)
-                })
-
-            all_years.extend(years)
-            pbar.update(1)
-
-    # calculate overall average year
-    if all_years:
-        overall_average = sum(all_years) / len(all_years)
-        print(f"\nProcessed {len(all_years)} citations across all papers.")
-        print(f"Overall average citation year: {overall_average:.2f}")
+    return reference_years(text)
+
+
+# process new or changed PDFs and analyze citation years; results of unchanged PDFs come from the manifest
+def analyze_citation_years(pdf_directory, output_csv_path, manifest=None, venue=None):
+    manifest = manifest or CitationManifest()
+    venue = venue or os.path.basename(os.path.normpath(pdf_directory))
+    changed, removed = manifest.changed_files(venue, pdf_files(pdf_directory))
+    print(f"{venue}: {len(changed)} new or changed PDFs, {removed} removed")
+
+    # page texts come from the shared PDF text cache; uncached PDFs are extracted in parallel (with progress bar)
+    stats = {pdf_path: (size, mtime, key) for pdf_path, size, mtime, key in changed}
+    failed = 0
+    for pdf_path, pages in iter_pdf_pages(list(stats)):
+        if pages is None:
+            # not stored, so changed_files returns the PDF again on the next run
+            failed += 1
+            continue
+        filename = os.path.basename(pdf_path)
+        text = join_pages(pages)
+
+        # extract years from the references section
+        years = extract_references_and_years(text)
+        manifest.put(venue, pdf_path, *stats[pdf_path], years)
+
+        if years:
+            print(f"{filename}, Average Year: {sum(years) / len(years)}, Years: {years}")
+
+    if failed:
+        print(f"{failed} PDFs could not be read and will be tried again on the next run")
+
+    # overall and per-venue averages from the per-paper sums and counts in the manifest
+    aggregates = manifest.aggregates()
+    if venue in aggregates:
+        papers, count, average = aggregates[venue]
+        print(f"\nProcessed {count} citations across {papers} papers of {venue}.")
+        print(f"Average citation year of {venue}: {average:.2f}")
     else:
         print("No citation years found.")
-
-    # print per-paper averages
-    print("\nPer-paper citation averages:")
-    for filename, avg in paper_averages:
-        print(f"{filename}: {avg:.2f}")
-
-    # save to CSV
+    for other, (papers, count, average) in aggregates.items():
+        if other is not None and other != venue:
+            print(f"Average citation year of {other}: {average:.2f} ({count} citations)")
+    if None in aggregates:
+        print(f"Overall average citation year: {aggregates[None][2]:.2f}")
+
+    # save to CSV; the whole venue is written from the manifest, so new results merge with the earlier ones
+    results = manifest.results(venue)
     with open(output_csv_path, mode='w', newline='') as file:
         fieldnames = ['filename', 'extracted_years', 'average_year']
         writer = csv.DictWriter(file, fieldnames=fieldnames)
@@ -111,10 +71,27 @@ def analyze_citation_years(pdf_directory, output_csv_path):
         for result in results:
             writer.writerow(result)
 
-# run the analysis and save the results to CSV
-analyze_citation_years(pdf_directory, output_csv_path)
-
-
-
-
-
+# watcher mode: poll the folder and update the results whenever PDFs are added, replaced or removed
+def watch_citation_years(pdf_directory, output_csv_path, interval=60, venue=None):
+    manifest = CitationManifest()
+    last_state = None
+    while True:
+        # an unchanged folder costs one stat per PDF
+        state = [(path, stat.st_size, stat.st_mtime) for path in pdf_files(pdf_directory) for stat in [os.stat(path)]]
+        if state != last_state:
+            analyze_citation_years(pdf_directory, output_csv_path, manifest, venue)
+            last_state = state
+        time.sleep(interval)
+
+# run the analysis and save the results to CSV (guarded, since the extraction workers import this module)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract citation years of new or changed submission PDFs.")
+    parser.add_argument("--pdf-directory", default=pdf_directory)
+    parser.add_argument("--output", default=output_csv_path)
+    parser.add_argument("--venue", default=None, help="label in the manifest (default: the PDF folder name)")
+    parser.add_argument("--watch", type=int, default=None, metavar="SECONDS", help="keep polling the folder")
+    args, _ = parser.parse_known_args()  # notebooks pass their own arguments
+    if args.watch:
+        watch_citation_years(args.pdf_directory, args.output, args.watch, args.venue)
+    else:
+        analyze_citation_years(args.pdf_directory, args.output, venue=args.venue)
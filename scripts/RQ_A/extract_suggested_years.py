@@ -1,38 +1,92 @@
+import argparse
 import os
-import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-def process_csv_files(directory):
-    # regex to capture:
-    # - Full years (1900-2025) exactly 4 digits
-    # - 'YY format (e.g., '22 → 2022)
-    # - arXiv-style two-digit years (e.g., 2205 → 2022)
-    pattern = re.compile(r"(?<=\b)(19[0-9]{2}|20(0[0-9]|1[0-9]|2[0-4]))\b|(?:'(\d{2}))|(?:abs\/|arxiv\.org\/pdf\/|arXiv:|arXiv )(\d{2})(\d{2})")
-
-    for filename in os.listdir(directory):
-        if filename.endswith(".csv"):
-            filepath = os.path.join(directory, filename)
-            df = pd.read_csv(filepath)
-            
-            if "response" in df.columns:
-                # regex transformation
-                def extract_years(text):
-                    matches = [
-                        match[0] if match[0] and len(match[0]) == 4 else  # Full year (e.g., 1999, 2020)
-                        f"20{match[3]}" if match[3] else  # arXiv-style (e.g., 2205 → 2022)
-                        (f"{'19' if int(match[2]) > 24 else '20'}{match[2]}" if match[2] else None)  # 'YY format (e.g., '22 → 2022)
-                        for match in pattern.findall(text)
-                    ]
-
-                    # Join valid years
-                    return ", ".join(filter(None, matches)) if matches else ""
-
-                df["suggested_years"] = df["response"].astype(str).apply(extract_years)
-
-                output_filepath = os.path.join(directory, f"extracted_{filename}")
-                df.to_csv(output_filepath, index=False)
-                print(f"Processed: {filename} -> {output_filepath}")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import row_group_size
+
+# default long table of all suggested years; citation_age_combined.py and violin_plot_combined.py read it
+output_path = 'suggested_years.parquet'
+
+# one scanner for all three patterns; the named groups tell which one matched:
+# - full years (1900-2024) exactly 4 digits
+# - 'YY format (e.g., '22 -> 2022, '98 -> 1998)
+# - arXiv-style two-digit years (e.g., arXiv:2205.01234 -> 2022)
+pattern = (r"(?<=\b)(?P<full>19[0-9]{2}|20(?:0[0-9]|1[0-9]|2[0-4]))\b|(?:'(?P<yy>\d{2}))"
+           r"|(?:abs\/|arxiv\.org\/pdf\/|arXiv:|arXiv )(?P<arxiv>\d{2})\d{2}")
+# 'YY above this are read as 19YY
+latest_yy = 24
+source_kinds = ["full", "'YY", "arXiv"]
+
+
+def extract_years(responses):
+    """Long DataFrame (row, year, source_kind) of every year in a Series of responses, in order of appearance.
+
+    row is the position of the response in the Series; a response can give several years or none."""
+    responses = pd.Series(responses, dtype=object).fillna("").astype(str).reset_index(drop=True)
+    matches = responses.str.extractall(pattern)
+    if matches.empty:
+        return pd.DataFrame({"row": np.array([], dtype=np.int64), "year": np.array([], dtype=np.int16),
+                             "source_kind": pd.Categorical([], categories=source_kinds)})
+    full, yy, arxiv = (matches[group].astype(float).to_numpy() for group in ["full", "yy", "arxiv"])
+    kind = np.select([~np.isnan(full), ~np.isnan(arxiv)], [0, 2], default=1)
+    year = np.select([kind == 0, kind == 2], [full, 2000 + arxiv], default=np.where(yy > latest_yy, 1900, 2000) + yy)
+    return pd.DataFrame({"row": matches.index.get_level_values(0).to_numpy(), "year": year.astype(np.int16),
+                         "source_kind": pd.Categorical.from_codes(kind, categories=source_kinds)})
+
+def extract_file(path):
+    """(file, id, year, source_kind) rows of one response file; None without a 'response' column.
+
+    Only the id and response columns are read; without an id column the row number stands in for it."""
+    columns = pd.read_csv(path, nrows=0).columns
+    if "response" not in columns:
+        return None
+    df = pd.read_csv(path, usecols=[c for c in ["id", "response"] if c in columns], engine="pyarrow")
+    years = extract_years(df["response"])
+    ids = df["id"].astype(str).to_numpy() if "id" in df.columns else np.arange(len(df)).astype(str)
+    years.insert(0, "id", ids[years.pop("row").to_numpy()])
+    years.insert(0, "file", os.path.basename(path))
+    return years
+
+def extract_directory(directory, workers=None):
+    """Long table of the years in every response CSV of a directory, extracted across `workers` processes
+    (default: all cores). Files without a 'response' column are reported and skipped."""
+    files = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".csv"))
+    tables = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, years in zip(files, pool.map(extract_file, files)):
+            if years is None:
+                print(f"Skipping {os.path.basename(path)}: No 'response' column found.")
             else:
-                print(f"Skipping {filename}: No 'response' column found.")
+                tables.append(years)
+    if not tables:
+        return pd.DataFrame(columns=["file", "id", "year", "source_kind"])
+    table = pd.concat(tables, ignore_index=True)
+    table["source_kind"] = pd.Categorical(table["source_kind"], categories=source_kinds)
+    return table
+
+def save(table, path=output_path):
+    """Write the long table as Parquet, sorted by file so a filter on one file only reads its row groups."""
+    arrow = pa.Table.from_pandas(table.astype({"file": "category"}), preserve_index=False)
+    pq.write_table(arrow, path, compression="zstd", row_group_size=row_group_size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract the suggested years of every response CSV in a folder into one long table.")
+    parser.add_argument("directory", help="folder of the model response CSVs")
+    parser.add_argument("--output", default=output_path, help="Parquet file with the columns file, id, year, source_kind")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
 
-process_csv_files(r"C:\Users\zoehu\OneDrive - stud.uni-goettingen.de\Thesis\review data\model response")
+    start = time.perf_counter()
+    table = extract_directory(args.directory, args.workers)
+    save(table, args.output)
+    print(f"{len(table)} years from {table['file'].nunique()} files -> {args.output} "
+          f"({time.perf_counter() - start:.2f} s)")
+    print(table.groupby("source_kind", observed=False).size().to_string())
@@ -1,8 +1,13 @@
+import os
+import sys
 import pandas as pd
-import ast
 import seaborn as sns
 import matplotlib.pyplot as plt
 from collections import Counter
+from paper_store import PaperStore
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import column_names, load
 
 # cited papers
 files = {
@@ -24,23 +29,24 @@ files = {
 }
 '''
 
-def extract_fields_of_study(paper_details):
-    try:
-        details = ast.literal_eval(paper_details)
-        return details.get("fieldsOfStudy", []) if details else []
-    except (SyntaxError, ValueError):
-        return []
+# fields of study come from the details_fieldsOfStudy column the data layer parses out of paper_details once;
+# rows without details are filled from the local paper store filled by s2.py
+store = PaperStore()
+
+def count_fields_of_study(file_path):
+    df = load(file_path, columns=[c for c in ["details_fieldsOfStudy", "paper_id"] if c in column_names(file_path)])
+    fields = df["details_fieldsOfStudy"]
+    if "paper_id" in df.columns:
+        fields = store.fill_missing(fields, df["paper_id"], "fieldsOfStudy")
+    return Counter(fields.explode().dropna().value_counts().to_dict())
 
-# First pass: gather all fields to find top 3
+# First pass: gather all fields to find top 3; the counts are kept for the second plot
 global_field_counter = Counter()
 
 dataset_field_data = {}
 
 for label, file_path in files.items():
-    df = pd.read_csv(file_path)
-    df["fieldsOfStudyList"] = df["paper_details"].apply(extract_fields_of_study)
-    all_fields = [field for fields in df["fieldsOfStudyList"] if fields is not None for field in fields]
-    field_counts = Counter(all_fields)
+    field_counts = count_fields_of_study(file_path)
     
     global_field_counter.update(field_counts)
     dataset_field_data[label] = field_counts
@@ -90,12 +96,7 @@ plt.show()
 # second plot: cs vs non cs percentage
 results = []
 
-for label, file_path in files.items():
-    df = pd.read_csv(file_path)
-    df["fieldsOfStudyList"] = df["paper_details"].apply(extract_fields_of_study)
-    all_fields = [field for fields in df["fieldsOfStudyList"] if fields is not None for field in fields]
-    field_counts = Counter(all_fields)
-    
+for label, field_counts in dataset_field_data.items():
     cs_count = field_counts.get("Computer Science", 0)
     non_cs_count = sum(count for field, count in field_counts.items() if field != "Computer Science")
     total = cs_count + non_cs_count
@@ -1,5 +1,8 @@
 import csv
-import requests
+from lm_client import ChatClient
+from response_cache import ResponseCache
+from token_budget import get_tokenizer, fit_context, longest_first
+from job_journal import JobJournal
 
 input_csv_path = 'shuffled_NeurIPSwithoutLabels.csv'
 output_csv_path = 'NeurIPS_gemma2b_A.csv'
@@ -18,67 +21,107 @@ Prompt D “Does this peer review suggest the authors of the paper to refer to s
 Prompt E “Does this peer review suggest the authors of the paper to refer to specific literature that are not already discussed in the original paper? Note that sometimes the reviewers mention some literature in their reviews but those could be already included in the original paper."
 '''
 
-# send prompt and reviews to LM Studio and get a response
-def send_to_lm_studio(context, question):
-    payload = {
-        "model": "gemma-2b-it", 
-        "messages": [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": f"Context: {context}\nQuestion: {question}"}
-        ]
-    }
-    headers = {
-        "Content-Type": "application/json"
-    }
-    response = requests.post(lm_studio_api_url, json=payload, headers=headers)
-    if response.status_code == 200:
-        return response.json()['choices'][0]['message']['content']
-    else:
-        print(f"Error: {response.status_code}, {response.text}")
-        return None
+# number of reviews sent to LM Studio at the same time
+concurrency = 8
+
+# maximum number of review tokens per request; longer reviews are truncated ("truncate")
+# or sent in several chunks whose answers are joined ("split"). None disables the limit
+context_budget = 3000
+budget_mode = "truncate"
+tokenizer = get_tokenizer()  # e.g. get_tokenizer("meta-llama/Llama-3.1-8B-Instruct") for exact counts
+
+client = ChatClient(lm_studio_api_url, model="gemma-2b-it", concurrency=concurrency, cache=ResponseCache())
 
 def process_reviews(input_csv_path, output_csv_path):
-    output_data = []
+    # finished ids are journaled next to the output so a crashed run resumes instead of starting over
+    journal = JobJournal(output_csv_path + ".journal")
+    journal.seed_from_csv(output_csv_path, 'response')
+
+    rows = []
+    jobs = []
+    job_rows = []  # index of the review each job belongs to
+    token_counts = []
     with open(input_csv_path, mode='r', encoding='utf-8') as input_file:
         reader = csv.DictReader(input_file) 
         fieldnames = reader.fieldnames + ['response']  # Add a new column for the response
 
-        with open(output_csv_path, mode='w', encoding='utf-8', newline='') as output_file:
-            writer = csv.DictWriter(output_file, fieldnames=fieldnames)  
-            writer.writeheader()
+        for row in reader:
+            entry_id = row.get("id", "").strip()  # ensure the "id" field is correctly retrieved
 
-            for row in reader:
-                entry_id = row.get("id", "").strip()  # ensure the "id" field is correctly retrieved
+            if not entry_id:
+                print("Warning: Missing ID for a row. Skipping.")
+                continue
 
-                if not entry_id:
-                    print("Warning: Missing ID for a row. Skipping.")
-                    continue
+            # all relevant columns for context
+            context_columns = [
+                "summary",
+                "strengths",
+                "weaknesses",
+                "questions",
+                "limitations",
+                "flag_for_ethics_review",
+                "rating"
+            ]
 
-                # all relevant columns for context
-                context_columns = [
-                    "summary",
-                    "strengths",
-                    "weaknesses",
-                    "questions",
-                    "limitations",
-                    "flag_for_ethics_review",
-                    "rating"
-                ]
-                context = "\n".join([f"{col}: {row.get(col, '').strip()}" for col in context_columns if row.get(col)])
+            rows.append(row)
+            if journal.is_done(entry_id):
+                continue  # answered in an earlier run
 
-                print(f"Processing entry ID: {entry_id}")
+            contexts = fit_context(row, context_columns, context_budget, tokenizer, mode=budget_mode)
+            for context, n_tokens in contexts:
+                jobs.append((context, question))
+                job_rows.append(len(rows) - 1)
+                token_counts.append(n_tokens)
 
-                # send to LM Studio
-                response = send_to_lm_studio(context, question)
+    print(f"{len(rows) - len(set(job_rows))} reviews already answered in an earlier run")
+    print(f"Sending {len(set(job_rows))} reviews ({len(jobs)} requests, {sum(token_counts)} tokens) to LM Studio ({concurrency} at a time)")
 
-                # add the response to the review
-                row['response'] = response if response else "Failed to get response"
+    with open(output_csv_path, mode='w', encoding='utf-8', newline='') as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=fieldnames)  
+        writer.writeheader()
+
+        # responses arrive concurrently but are written in the order of the input rows
+        chunk_responses = []
+        next_row = 0
+
+        def write_rows(upto):
+            nonlocal next_row
+            while next_row < upto:
+                row = rows[next_row]
+                row['response'] = journal.response(row["id"].strip()) or "Failed to get response"
                 writer.writerow(row)
+                next_row += 1
+
+        def write_response(index, response):
+            chunk_responses.append(response)
+            if index + 1 < len(jobs) and job_rows[index + 1] == job_rows[index]:
+                return  # wait for the remaining chunks of this review
+            response = client.join_chunks(chunk_responses)
+            chunk_responses.clear()
+
+            row = rows[job_rows[index]]
+            entry_id = row["id"].strip()
+
+            # journal the response, then write every row up to and including this review
+            if response:
+                journal.record(entry_id, response)
+            else:
+                journal.record_failure(entry_id)
+            write_rows(job_rows[index] + 1)
+
+            if response:
+                print(f"Response for ID {entry_id}: {response}\n")
+            else:
+                print(f"Failed to get response for ID {entry_id}\n")
+
+        # requests of similar length are sent together, longest first
+        client.complete_in_order(jobs, write_response, submit_order=longest_first(token_counts))
+        write_rows(len(rows))
+
+    journal.close()
+    print(f"{len(journal.retry_queue())} reviews failed and will be retried on the next run")
 
-                if response:
-                    print(f"Response for ID {entry_id}: {response}\n")
-                else:
-                    print(f"Failed to get response for ID {entry_id}\n")
+    print(f"Response cache: {client.cache.stats()}")
 
 if __name__ == "__main__":
     try:
@@ -1,8 +1,8 @@
 import csv
 import requests
-import time
-import json
-import os
+from response_cache import ResponseCache
+from job_journal import JobJournal
+from rate_limiter import RateLimiter, send_with_retries
 
 input_csv_path = 'ICLR2017_suggest_to_cite.csv'
 output_csv_path = 'extracted_ICLR2017_v5.csv'
@@ -20,14 +20,11 @@ If titles do not directly exist, extract author and year information, but only d
 Do not give me extra text including punctuation and numbering.
 """
 
-def load_processed_ids(output_csv_path):
-    """Loads already processed IDs from the output CSV to avoid redundant API calls."""
-    processed_ids = set()
-    if os.path.exists(output_csv_path):
-        with open(output_csv_path, mode='r', encoding='utf-8') as output_file:
-            reader = csv.DictReader(output_file)
-            processed_ids = {row['id'].strip() for row in reader if row.get('id')}
-    return processed_ids
+# responses already returned for the same model, prompt and review are reused instead of re-sent
+cache = ResponseCache()
+
+# the chat API is shared with other users; start at one request every 2 seconds and adapt to 429s
+chat_limiter = RateLimiter(rate=0.5, max_rate=2.0)
 
 def send_to_lm_studio(context, question, max_retries=10, backoff_factor=2):
     payload = {
@@ -42,97 +39,110 @@ def send_to_lm_studio(context, question, max_retries=10, backoff_factor=2):
         "Content-Type": "application/json",
         "Authorization": f"Bearer {authorization_token}"
     }
+
+    cached = cache.get(payload)
+    if cached is not None:
+        return cached
     
-    for attempt in range(max_retries):
-        response = requests.post(lm_studio_api_url, json=payload, headers=headers)
-        
-        if response.status_code == 200:
-            return response.json().get('choices', [{}])[0].get('message', {}).get('content', '')
-        elif response.status_code in [500, 501, 502, 503, 504]:  # Handle server errors
-            print(f"Retry {attempt + 1}/{max_retries} due to {response.status_code} error.")
-            time.sleep(backoff_factor * (attempt + 1))  # Exponential backoff
-        else:
-            print(f"Error: {response.status_code}, {response.text}")
-            break
-    
+    response = send_with_retries(
+        lambda: requests.post(lm_studio_api_url, json=payload, headers=headers),
+        chat_limiter, max_retries=max_retries, base_delay=backoff_factor
+    )
+    if response is None:
+        return None
+    if response.status_code == 200:
+        content = response.json().get('choices', [{}])[0].get('message', {}).get('content', '')
+        cache.put(payload, content)
+        return content
+    print(f"Error: {response.status_code}, {response.text}")
     return None
 
-def process_reviews(input_csv_path, output_csv_path, sleep_time=1):
-    processed_ids = load_processed_ids(output_csv_path)
+def build_context(row):
+    context_columns = ["review"]
+    return "\n".join([f"{col}: {row.get(col, '').strip()}" for col in context_columns if row.get(col)])
+
+def process_reviews(input_csv_path, journal):
     count = 0
     
     with open(input_csv_path, mode='r', encoding='utf-8') as input_file:
         reader = csv.DictReader(input_file)
-        fieldnames = reader.fieldnames + ['paper_info']  # Add a new column for the response
-        file_exists = os.path.exists(output_csv_path)
         
-        with open(output_csv_path, mode='a', encoding='utf-8', newline='') as output_file:
-            writer = csv.DictWriter(output_file, fieldnames=fieldnames)
+        for row in reader:
+            entry_id = row.get("id", "").strip()
+            if not entry_id:
+                print("Warning: Missing ID for a row. Skipping.")
+                continue
+            
+            if journal.is_done(entry_id):
+                print(f"Skipping already processed ID: {entry_id}")
+                continue
             
-            if not file_exists:
-                writer.writeheader()
+            # Extract context
+            context = build_context(row)
             
-            for row in reader:
-                entry_id = row.get("id", "").strip()
-                if not entry_id:
-                    print("Warning: Missing ID for a row. Skipping.")
-                    continue
-                
-                if entry_id in processed_ids:
-                    print(f"Skipping already processed ID: {entry_id}")
-                    continue
-                
-                # Extract context
-                context_columns = ["review"]
-                context = "\n".join([f"{col}: {row.get(col, '').strip()}" for col in context_columns if row.get(col)])
-                
-                print(f"Processing entry ID: {entry_id} ({count + 1})")
-                
-                # Send request to LM Studio
-                response = send_to_lm_studio(context, question)
-                row['paper_info'] = response if response else "Failed to get response"
-                writer.writerow(row)
-                
-                if response:
-                    print(f"Response for ID {entry_id}: {response}\n")
-                else:
-                    print(f"Failed to get response for ID {entry_id}\n")
-                
-                count += 1
-                time.sleep(sleep_time)  # Sleep to avoid hitting rate limits
+            print(f"Processing entry ID: {entry_id} ({count + 1})")
+            
+            # Send request to LM Studio; failures go to the journal's retry queue
+            response = send_to_lm_studio(context, question)
+            if response:
+                journal.record(entry_id, response)
+                print(f"Response for ID {entry_id}: {response}\n")
+            else:
+                journal.record_failure(entry_id)
+                print(f"Failed to get response for ID {entry_id}\n")
+            
+            count += 1
 
-def retry_failed_responses(output_csv_path, sleep_time=2):
-    """Reprocess rows where 'Failed to get response' was recorded."""
-    temp_output_path = output_csv_path + ".tmp"
+def retry_failed_responses(input_csv_path, journal):
+    """Reprocess only the ids in the journal's retry queue."""
+    retry_ids = set(journal.retry_queue())
+    if not retry_ids:
+        return
     
-    with open(output_csv_path, mode='r', encoding='utf-8') as input_file, \
-         open(temp_output_path, mode='w', encoding='utf-8', newline='') as output_file:
+    with open(input_csv_path, mode='r', encoding='utf-8') as input_file:
+        for row in csv.DictReader(input_file):
+            entry_id = row.get("id", "").strip()
+            if entry_id not in retry_ids:
+                continue
+            
+            print(f"Retrying failed response for ID: {entry_id}")
+            response = send_to_lm_studio(build_context(row), question)
+            if response:
+                journal.record(entry_id, response)
+            else:
+                journal.record_failure(entry_id)
+
+def write_output(input_csv_path, output_csv_path, journal):
+    """Write the input rows together with their journaled responses in one pass."""
+    with open(input_csv_path, mode='r', encoding='utf-8') as input_file, \
+         open(output_csv_path, mode='w', encoding='utf-8', newline='') as output_file:
         
         reader = csv.DictReader(input_file)
-        fieldnames = reader.fieldnames
+        fieldnames = reader.fieldnames + ['paper_info']  # Add a new column for the response
         writer = csv.DictWriter(output_file, fieldnames=fieldnames)
         writer.writeheader()
         
         for row in reader:
-            if row.get("paper_info", "").strip() == "Failed to get response":
-                entry_id = row.get("id", "").strip()
-                context_columns = ["review"]
-                context = "\n".join([f"{col}: {row.get(col, '').strip()}" for col in context_columns if row.get(col)])
-                
-                print(f"Retrying failed response for ID: {entry_id}")
-                response = send_to_lm_studio(context, question)
-                row['paper_info'] = response if response else "Failed to get response"
-                time.sleep(sleep_time)
-            
+            entry_id = row.get("id", "").strip()
+            if not entry_id:
+                continue
+            row['paper_info'] = journal.response(entry_id) or "Failed to get response"
             writer.writerow(row)
-    
-    os.replace(temp_output_path, output_csv_path)  # Replace old file with updated one
 
 if __name__ == "__main__":
+    # finished ids are journaled next to the output so an interrupted run resumes where it stopped
+    journal = JobJournal(output_csv_path + ".journal")
+    journal.seed_from_csv(output_csv_path, 'paper_info')
     try:
-        process_reviews(input_csv_path, output_csv_path, sleep_time=2)
+        process_reviews(input_csv_path, journal)
         print("Initial processing complete. Retrying failed responses...")
-        retry_failed_responses(output_csv_path, sleep_time=2)
+        retry_failed_responses(input_csv_path, journal)
         print("Retrying failed responses complete.")
+        write_output(input_csv_path, output_csv_path, journal)
+        print(f"{len(journal.retry_queue())} IDs still failed; they are retried on the next run.")
+        print(f"Response cache: {cache.stats()}")
+        print(f"Rate limiter: {chat_limiter.stats()}")
     except Exception as e:
         print(f"An error occurred: {e}")
+    finally:
+        journal.close()
@@ -1,5 +1,9 @@
 import csv
-import requests
+from lm_client import ChatClient
+from response_cache import ResponseCache
+from token_budget import get_tokenizer, fit_context, longest_first
+from job_journal import JobJournal
+from rate_limiter import RateLimiter
 
 input_csv_path = 'shuffled_ICLRwithoutLabels.csv'
 output_csv_path = 'test.csv'
@@ -16,66 +20,122 @@ question = """Does this peer review explicitly say the paper is missing relevant
 
 
 
-def send_to_lm_studio(context, question):
-    payload = {
-        "model": "meta-llama/Llama-3.3-70B-Instruct", 
-        "messages": [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": f"Context: {context}\nQuestion: {question}"}
-        ],
-        "stream": False,
-        "max_tokens": 500
-    }
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {authorization_token}"
-    }
-    response = requests.post(lm_studio_api_url, json=payload, headers=headers)
-    if response.status_code == 200:
-        return response.json()['choices'][0]['message']['content']
-    else:
-        print(f"Error: {response.status_code}, {response.text}")
-        return None
+# True: ask for a single token with logprobs and write P(yes) to a 'score' column instead of the full answer
+# (the prompt should ask for yes or no at the very beginning)
+score_yes_no = False
 
-def process_reviews(input_csv_path, output_csv_path):
-    output_data = []
-    with open(input_csv_path, mode='r', encoding='utf-8') as input_file:
-        reader = csv.DictReader(input_file) 
-        fieldnames = reader.fieldnames + ['response']  # add a new column for the response
-
-        with open(output_csv_path, mode='w', encoding='utf-8', newline='') as output_file:
-            writer = csv.DictWriter(output_file, fieldnames=fieldnames)  
-            writer.writeheader()
-
-            for row in reader:
-                entry_id = row.get("id", "").strip()  # ensure the "id" field is correctly retrieved
+# number of reviews sent to the server at the same time
+concurrency = 16
 
-                if not entry_id:
-                    print("Warning: Missing ID for a row. Skipping.")
-                    continue
+# maximum number of review tokens per request; longer reviews are truncated ("truncate")
+# or sent in several chunks whose answers are joined ("split"). None disables the limit
+context_budget = 3000
+budget_mode = "truncate"
+tokenizer = get_tokenizer()  # e.g. get_tokenizer("meta-llama/Llama-3.1-8B-Instruct") for exact counts
 
-                # IMPORTNAT: all relevant columns for context; adjust according to venues
-                context_columns = [
-                    "summary_of_the_paper",
-                    "strength_and_weaknesses",
-                    "clarity,_quality,_novelty_and_reproducibility",
-                    "summary_of_the_review"
-                ]
-                context = "\n".join([f"{col}: {row.get(col, '').strip()}" for col in context_columns if row.get(col)])
+client = ChatClient(
+    lm_studio_api_url,
+    model="meta-llama/Llama-3.3-70B-Instruct",
+    authorization_token=authorization_token,
+    concurrency=concurrency,
+    cache=ResponseCache(),
+    # adjust to the quota of the server; the rate adapts downwards on 429s and honours Retry-After
+    rate_limiter=RateLimiter(rate=5.0, burst=concurrency, max_rate=10.0),
+    extra_params={"stream": False, "max_tokens": 500},
+    score_yes_no=score_yes_no
+)
 
-                print(f"Processing entry ID: {entry_id}")
+# column the answers go to
+output_column = 'score' if score_yes_no else 'response'
 
-                # send to LM Studio
-                response = send_to_lm_studio(context, question)
-
-                # add the response to the review
-                row['response'] = response if response else "Failed to get response"
+def process_reviews(input_csv_path, output_csv_path):
+    # finished ids are journaled next to the output so a crashed run resumes instead of starting over
+    journal = JobJournal(output_csv_path + ".journal")
+    journal.seed_from_csv(output_csv_path, output_column)
+
+    rows = []
+    jobs = []
+    job_rows = []  # index of the review each job belongs to
+    token_counts = []
+    with open(input_csv_path, mode='r', encoding='utf-8') as input_file:
+        reader = csv.DictReader(input_file) 
+        fieldnames = reader.fieldnames + [output_column]  # add a new column for the response
+
+        for row in reader:
+            entry_id = row.get("id", "").strip()  # ensure the "id" field is correctly retrieved
+
+            if not entry_id:
+                print("Warning: Missing ID for a row. Skipping.")
+                continue
+
+            # IMPORTNAT: all relevant columns for context; adjust according to venues
+            context_columns = [
+                "summary_of_the_paper",
+                "strength_and_weaknesses",
+                "clarity,_quality,_novelty_and_reproducibility",
+                "summary_of_the_review"
+            ]
+
+            rows.append(row)
+            if journal.is_done(entry_id):
+                continue  # answered in an earlier run
+
+            contexts = fit_context(row, context_columns, context_budget, tokenizer, mode=budget_mode)
+            for context, n_tokens in contexts:
+                jobs.append((context, question))
+                job_rows.append(len(rows) - 1)
+                token_counts.append(n_tokens)
+
+    print(f"{len(rows) - len(set(job_rows))} reviews already answered in an earlier run")
+    print(f"Sending {len(set(job_rows))} reviews ({len(jobs)} requests, {sum(token_counts)} tokens) to the server ({concurrency} at a time)")
+
+    with open(output_csv_path, mode='w', encoding='utf-8', newline='') as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=fieldnames)  
+        writer.writeheader()
+
+        # responses arrive concurrently but are written in the order of the input rows
+        chunk_responses = []
+        next_row = 0
+
+        def write_rows(upto):
+            nonlocal next_row
+            while next_row < upto:
+                row = rows[next_row]
+                row[output_column] = journal.response(row["id"].strip()) or ("" if score_yes_no else "Failed to get response")
                 writer.writerow(row)
-
-                if response:
-                    print(f"Response for ID {entry_id}: {response}\n")
-                else:
-                    print(f"Failed to get response for ID {entry_id}\n")
+                next_row += 1
+
+        def write_response(index, response):
+            chunk_responses.append(response)
+            if index + 1 < len(jobs) and job_rows[index + 1] == job_rows[index]:
+                return  # wait for the remaining chunks of this review
+            response = client.join_chunks(chunk_responses)
+            chunk_responses.clear()
+
+            row = rows[job_rows[index]]
+            entry_id = row["id"].strip()
+
+            # journal the response, then write every row up to and including this review
+            if response:
+                journal.record(entry_id, response)
+            else:
+                journal.record_failure(entry_id)
+            write_rows(job_rows[index] + 1)
+
+            if response:
+                print(f"Response for ID {entry_id}: {response}\n")
+            else:
+                print(f"Failed to get response for ID {entry_id}\n")
+
+        # requests of similar length are sent together, longest first
+        client.complete_in_order(jobs, write_response, submit_order=longest_first(token_counts))
+        write_rows(len(rows))
+
+    journal.close()
+    print(f"{len(journal.retry_queue())} reviews failed and will be retried on the next run")
+
+    print(f"Response cache: {client.cache.stats()}")
+    print(f"Rate limiter: {client.rate_limiter.stats()}")
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,93 @@
+import csv
+import json
+import os
+
+
+class JobJournal:
+    """Append-only record of finished LLM jobs so an interrupted run can resume where it stopped.
+
+    Every line is one JSON record {"id", "status", "response"}; the last record of an id wins.
+    Ids whose last record is "failed" form the retry queue."""
+
+    def __init__(self, path, fsync_every=50):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.done = {}       # id -> response
+        self.failed = {}     # id -> None, insertion ordered retry queue
+        self.unsynced = 0
+        if os.path.exists(path):
+            self._load()
+        self.file = open(path, mode='a', encoding='utf-8')
+
+    def _load(self):
+        with open(self.path, mode='r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line after a crash
+                self._apply(record["id"], record["status"], record.get("response"))
+
+    def _apply(self, entry_id, status, response):
+        if status == "done":
+            self.done[entry_id] = response
+            self.failed.pop(entry_id, None)
+        else:
+            self.failed[entry_id] = None
+
+    def _append(self, entry_id, status, response=None):
+        self._apply(entry_id, status, response)
+        self.file.write(json.dumps({"id": entry_id, "status": status, "response": response}, ensure_ascii=False) + "\n")
+        self.unsynced += 1
+        if self.unsynced >= self.fsync_every:
+            self.sync()
+
+    def is_done(self, entry_id):
+        return entry_id in self.done
+
+    def response(self, entry_id):
+        return self.done.get(entry_id)
+
+    def record(self, entry_id, response):
+        self._append(entry_id, "done", response)
+
+    def record_failure(self, entry_id):
+        self._append(entry_id, "failed")
+
+    def retry_queue(self):
+        """Ids whose latest attempt failed, in the order they failed."""
+        return list(self.failed)
+
+    def seed_from_csv(self, csv_path, response_column, failed_value="Failed to get response"):
+        """Import an output CSV written before the journal existed."""
+        if self.done or self.failed or not os.path.exists(csv_path):
+            return 0
+        count = 0
+        with open(csv_path, mode='r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                entry_id = (row.get("id") or "").strip()
+                if not entry_id:
+                    continue
+                response = row.get(response_column)
+                if response and response != failed_value:
+                    self.record(entry_id, response)
+                else:
+                    self.record_failure(entry_id)
+                count += 1
+        self.sync()
+        return count
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
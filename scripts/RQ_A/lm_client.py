@@ -0,0 +1,153 @@
+'''pip install aiohttp'''
+
+import asyncio
+import math
+import aiohttp
+from rate_limiter import backoff_delay, parse_retry_after, retry_statuses
+
+# answer tokens the scoring mode looks for among the top logprobs of the first token ("Yes", " yes", "YES," ...)
+yes_tokens = {"yes"}
+no_tokens = {"no"}
+# alternatives returned per token in scoring mode; enough for both answers to show up in any casing
+top_logprobs = 20
+
+
+def yes_probability(choice):
+    """P(yes) of a chat-completions choice: the probability mass of the yes tokens among the top logprobs of the
+    first token, renormalised over the yes and no tokens. None if neither shows up.
+
+    Servers that return no logprobs still give 1.0 or 0.0 from a leading yes or no in the text."""
+    candidates = ((choice.get("logprobs") or {}).get("content") or [{}])[0].get("top_logprobs") or []
+    yes = no = 0.0
+    for candidate in candidates:
+        token = candidate.get("token", "").strip(" \t\n.,:!*\"'").lower()
+        if token in yes_tokens:
+            yes += math.exp(candidate["logprob"])
+        elif token in no_tokens:
+            no += math.exp(candidate["logprob"])
+    if yes + no == 0:
+        words = (choice.get("message", {}).get("content") or "").lower().split()
+        first = words[0].strip(".,:!*\"'") if words else ""
+        return 1.0 if first in yes_tokens else 0.0 if first in no_tokens else None
+    return yes / (yes + no)
+
+
+class ChatClient:
+    """Asynchronous client for OpenAI-compatible chat-completions APIs (LM Studio, GWDG, ...).
+
+    With score_yes_no the server is asked for a single token with its top logprobs, and every response is the
+    P(yes) of that token as a string (e.g. "0.973412") instead of a generated answer."""
+
+    def __init__(self, api_url, model, authorization_token=None, concurrency=8,
+                 system_prompt="You are a helpful assistant.", extra_params=None, timeout=600, cache=None,
+                 rate_limiter=None, max_retries=3, score_yes_no=False):
+        self.api_url = api_url
+        self.model = model
+        self.concurrency = concurrency
+        self.system_prompt = system_prompt
+        self.extra_params = extra_params or {}
+        self.timeout = timeout
+        self.cache = cache  # optional ResponseCache, checked before every request
+        self.rate_limiter = rate_limiter  # optional RateLimiter shared with other clients of the same server
+        self.max_retries = max_retries
+        self.score_yes_no = score_yes_no
+        self.headers = {"Content-Type": "application/json"}
+        if authorization_token:
+            self.headers["Authorization"] = f"Bearer {authorization_token}"
+
+    def build_payload(self, context, question, model=None):
+        payload = {
+            "model": model or self.model,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": f"Context: {context}\nQuestion: {question}"}
+            ]
+        }
+        payload.update(self.extra_params)
+        if self.score_yes_no:
+            # part of the payload, so cached scores never mix with cached answers
+            payload.update({"max_tokens": 1, "temperature": 0, "logprobs": True, "top_logprobs": top_logprobs})
+        return payload
+
+    def extract(self, data):
+        """The response of a successful request: the generated text, or in scoring mode P(yes) as a string."""
+        choice = data['choices'][0]
+        if not self.score_yes_no:
+            return choice['message']['content']
+        probability = yes_probability(choice)
+        # neither yes nor no: _post retries the request and never caches it
+        return None if probability is None else f"{probability:.6f}"
+
+    def join_chunks(self, responses):
+        """One response for a review sent in several chunks: the answers joined, or in scoring mode the highest
+        P(yes), since the review suggests literature if any part of it does. None if a chunk failed."""
+        if None in responses:
+            return None
+        if self.score_yes_no:
+            return f"{max(float(r) for r in responses):.6f}"
+        return "\n\n".join(responses)
+
+    async def _post(self, session, semaphore, context, question, model=None):
+        payload = self.build_payload(context, question, model)
+        if self.cache is not None:
+            cached = self.cache.get(payload)
+            if cached is not None:
+                return cached
+        async with semaphore:
+            for attempt in range(self.max_retries):
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire_async()
+                try:
+                    async with session.post(self.api_url, json=payload, headers=self.headers) as response:
+                        if response.status == 200:
+                            content = self.extract(await response.json(content_type=None))
+                            if content is not None:
+                                if self.cache is not None:
+                                    self.cache.put(payload, content)
+                                if self.rate_limiter is not None:
+                                    self.rate_limiter.on_success()
+                                return content
+                            # e.g. neither yes nor no in scoring mode: not cached, tried again
+                            print("Error: 200 without a usable answer")
+                        else:
+                            print(f"Error: {response.status}, {await response.text()}")
+                            if response.status not in retry_statuses:
+                                return None
+                            if response.status == 429 and self.rate_limiter is not None:
+                                self.rate_limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    print(f"Request failed: {e}")
+                if attempt + 1 < self.max_retries:
+                    await asyncio.sleep(backoff_delay(attempt))
+        return None
+
+    async def _complete_in_order(self, jobs, on_result, submit_order=None):
+        # one pooled connection per in-flight request; keep-alive is reused across reviews
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            # the semaphore is first come, first served, so creation order is the order requests go out
+            tasks = [None] * len(jobs)
+            for index in (submit_order if submit_order is not None else range(len(jobs))):
+                tasks[index] = asyncio.create_task(self._post(session, semaphore, *jobs[index]))
+            # awaiting in index order keeps the output rows in input order
+            # while later requests are still running in the background
+            for index, task in enumerate(tasks):
+                on_result(index, await task)
+
+    def complete_in_order(self, jobs, on_result, submit_order=None):
+        """Send (context, question[, model]) jobs concurrently and call on_result(index, response) in input order.
+
+        submit_order optionally lists the job indices in the order they should be sent, e.g. longest first."""
+        asyncio.run(self._complete_in_order(jobs, on_result, submit_order))
+
+    def complete_all(self, jobs, submit_order=None):
+        """Send (context, question[, model]) jobs concurrently and return the responses in input order."""
+        responses = [None] * len(jobs)
+
+        def collect(index, response):
+            responses[index] = response
+
+        self.complete_in_order(jobs, collect, submit_order)
+        return responses
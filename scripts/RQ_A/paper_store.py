@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import parse_details_value
+
+# default store location; shared by all venues so every paper is looked up on S2 only once
+store_path = 'paper_metadata.sqlite'
+
+
+def normalize_title(title):
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    if not isinstance(title, str):
+        return ""
+    title = unicodedata.normalize("NFKD", title)
+    title = "".join(ch for ch in title if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+
+def normalize_arxiv_id(arxiv_id):
+    """'ARXIV:2203.17274v2', 'arxiv.org/abs/2203.17274.pdf' and '2203.17274' all map to '2203.17274'."""
+    if not isinstance(arxiv_id, str) or not arxiv_id.strip():
+        return None
+    arxiv_id = arxiv_id.strip().split("/abs/")[-1].split("/pdf/")[-1]
+    arxiv_id = re.sub(r"(?i)^arxiv:", "", arxiv_id).replace(".pdf", "")
+    return re.sub(r"v\d+$", "", arxiv_id)
+
+
+class PaperStore:
+    """Local Semantic Scholar metadata, keyed by paperId and indexed by normalised title and arXiv id.
+
+    `queries` remembers which paperId a free-text title search resolved to (or that it found nothing),
+    so the same suggestion string is never searched twice; `not_found` holds ids S2 answered with null."""
+
+    def __init__(self, path=store_path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS papers (
+                paper_id TEXT PRIMARY KEY,
+                title TEXT,
+                norm_title TEXT,
+                arxiv_id TEXT,
+                authors TEXT,
+                abstract TEXT,
+                year INTEGER,
+                fields_of_study TEXT,
+                fetched REAL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_norm_title ON papers (norm_title)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_arxiv_id ON papers (arxiv_id)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS not_found (
+                paper_id TEXT PRIMARY KEY,
+                checked REAL
+            )""")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS queries (
+                query TEXT PRIMARY KEY,
+                paper_id TEXT,
+                created REAL
+            )""")
+        self.conn.commit()
+
+    @staticmethod
+    def _row_to_details(row):
+        paper_id, title, arxiv_id, authors, abstract, year, fields = row
+        return {
+            "paperId": paper_id,
+            "title": title,
+            "authors": json.loads(authors) if authors else [],
+            "abstract": abstract,
+            "year": year,
+            "fieldsOfStudy": json.loads(fields) if fields else None,
+            "externalIds": {"ArXiv": arxiv_id} if arxiv_id else {}
+        }
+
+    def _select(self, where, value):
+        row = self.conn.execute(
+            "SELECT paper_id, title, arxiv_id, authors, abstract, year, fields_of_study FROM papers "
+            f"WHERE {where} = ? LIMIT 1", (value,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._row_to_details(row)
+
+    def get(self, paper_id):
+        """Details for an S2 paperId (or an 'ARXIV:<id>' id as produced by s2.get_paper_id)."""
+        if not isinstance(paper_id, str) or not paper_id:
+            return None
+        if paper_id.upper().startswith("ARXIV:"):
+            return self.find_by_arxiv(paper_id)
+        return self._select("paper_id", paper_id)
+
+    def find_by_title(self, title):
+        norm = normalize_title(title)
+        return self._select("norm_title", norm) if norm else None
+
+    def find_by_arxiv(self, arxiv_id):
+        arxiv_id = normalize_arxiv_id(arxiv_id)
+        return self._select("arxiv_id", arxiv_id) if arxiv_id else None
+
+    def is_not_found(self, paper_id):
+        return self.conn.execute("SELECT 1 FROM not_found WHERE paper_id = ?", (paper_id,)).fetchone() is not None
+
+    def mark_not_found(self, paper_ids):
+        now = time.time()
+        self.conn.executemany("INSERT OR REPLACE INTO not_found (paper_id, checked) VALUES (?, ?)",
+                              [(pid, now) for pid in paper_ids])
+        self.conn.commit()
+
+    def put(self, details, commit=True):
+        if not details or not details.get("paperId"):
+            return
+        external_ids = details.get("externalIds") or {}
+        authors = [{"authorId": a.get("authorId"), "name": a.get("name")} for a in details.get("authors") or []]
+        fields = details.get("fieldsOfStudy")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO papers (paper_id, title, norm_title, arxiv_id, authors, abstract, year, "
+            "fields_of_study, fetched) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (details["paperId"], details.get("title"), normalize_title(details.get("title")),
+             normalize_arxiv_id(external_ids.get("ArXiv")), json.dumps(authors, ensure_ascii=False),
+             details.get("abstract"), details.get("year"),
+             json.dumps(fields) if fields is not None else None, time.time())
+        )
+        if commit:
+            self.conn.commit()
+
+    def put_many(self, details_list):
+        for details in details_list:
+            self.put(details, commit=False)
+        self.conn.commit()
+
+    def lookup_query(self, query):
+        """(True, paper_id or None) if this search string was resolved before, else (False, None)."""
+        row = self.conn.execute("SELECT paper_id FROM queries WHERE query = ?", (normalize_title(query),)).fetchone()
+        return (True, row[0]) if row else (False, None)
+
+    def remember_query(self, query, paper_id):
+        norm = normalize_title(query)
+        if not norm:
+            return
+        self.conn.execute("INSERT OR REPLACE INTO queries (query, paper_id, created) VALUES (?, ?, ?)",
+                          (norm, paper_id, time.time()))
+        self.conn.commit()
+
+    def import_csv(self, csv_path, id_column="paper_id", details_column="paper_details"):
+        """Load the paper_details of an existing s2.py output CSV into the store."""
+        df = pd.read_csv(csv_path, usecols=lambda c: c in (id_column, details_column, "paper_info"))
+        count = 0
+        for row in df.itertuples(index=False):
+            row = row._asdict()
+            details = parse_details_value(row.get(details_column))
+            if details and details.get("paperId"):
+                self.put(details, commit=False)
+                count += 1
+            if isinstance(row.get("paper_info"), str) and isinstance(row.get(id_column), str):
+                self.conn.execute("INSERT OR IGNORE INTO queries (query, paper_id, created) VALUES (?, ?, ?)",
+                                  (normalize_title(row["paper_info"]), row[id_column], time.time()))
+        self.conn.commit()
+        return count
+
+    def fill_missing(self, values, paper_ids, field):
+        """A details column (e.g. details_title) with its empty rows filled from the store by paper id."""
+        values = pd.Series(values, dtype=object)
+        paper_ids = pd.Series(list(paper_ids), index=values.index)
+        for row in values.index[values.isna() & paper_ids.notna()]:
+            details = self.get(paper_ids[row])
+            if details:
+                values[row] = details.get(field)
+        return values
+
+    def stats(self):
+        papers = self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+        queries = self.conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+        not_found = self.conn.execute("SELECT COUNT(*) FROM not_found").fetchone()[0]
+        return {"papers": papers, "queries": queries, "not_found": not_found, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the local paper metadata store or import s2.py output CSVs.")
+    parser.add_argument("command", choices=["stats", "import"])
+    parser.add_argument("files", nargs="*", help="s2.py output CSVs with paper_id and paper_details columns")
+    parser.add_argument("--store", default=store_path, help="path to the SQLite store")
+    args = parser.parse_args()
+
+    store = PaperStore(args.store)
+    if args.command == "import":
+        if not args.files:
+            parser.error("'import' needs at least one CSV file")
+        for csv_path in args.files:
+            print(f"Imported {store.import_csv(csv_path)} papers from {csv_path}")
+    print(store.stats())
+    store.close()
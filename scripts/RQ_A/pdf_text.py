@@ -0,0 +1,131 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+from PyPDF2 import PdfReader
+
+# default cache location; shared by every script that reads the submission PDFs
+cache_path = 'pdf_text_cache.sqlite'
+
+
+def file_hash(pdf_path):
+    """SHA-256 of the file content, read in 1 MiB chunks (hashlib.file_digest needs Python 3.11)."""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def extract_pages(pdf_path):
+    """Text of every page, extract_text called once per page; (pages, None) or (None, error message)."""
+    try:
+        reader = PdfReader(pdf_path)
+        return [page.extract_text() or "" for page in reader.pages], None
+    except Exception as e:
+        return None, f"Error reading {pdf_path}: {e}"
+
+def join_pages(pages, skip_empty=False):
+    """Full text as the extraction scripts built it: one newline after every page, or only between non-empty ones."""
+    if pages is None:
+        return ""
+    if skip_empty:
+        return "\n".join(page for page in pages if page)
+    return "".join(page + "\n" for page in pages)
+
+
+class TextCache:
+    """Page texts of PDFs, zlib-compressed in SQLite and keyed by the SHA-256 of the file content.
+
+    A renamed or copied PDF is not extracted again; a PDF that was replaced gets a new key."""
+
+    def __init__(self, path=cache_path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS texts (
+                sha256 TEXT PRIMARY KEY,
+                pages INTEGER,
+                text BLOB,
+                size INTEGER,
+                created REAL
+            )""")
+        self.conn.commit()
+
+    def get(self, key):
+        row = self.conn.execute("SELECT text FROM texts WHERE sha256 = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def put(self, key, pages):
+        if pages is None:
+            return  # never cache failures
+        data = json.dumps(pages, ensure_ascii=False).encode('utf-8')
+        self.conn.execute("INSERT OR REPLACE INTO texts (sha256, pages, text, size, created) VALUES (?, ?, ?, ?, ?)",
+                          (key, len(pages), zlib.compress(data, 6), len(data), time.time()))
+        self.conn.commit()
+
+    def stats(self):
+        count, pages, size, stored = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(pages), 0), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(text)), 0) FROM texts"
+        ).fetchone()
+        return {"files": count, "pages": pages, "text_mb": round(size / 1024 / 1024, 1),
+                "stored_mb": round(stored / 1024 / 1024, 1), "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        self.conn.close()
+
+
+def iter_pdf_pages(pdf_paths, workers=None, cache=None, progress=True):
+    """Yield (path, pages) for every PDF in input order; pages is None if the PDF could not be read.
+
+    Cached texts are returned directly, the rest is extracted across `workers` processes (default: all cores)
+    and written to the cache. Pass cache=False to always extract."""
+    if cache is None:
+        cache = TextCache()
+    pdf_paths = list(pdf_paths)
+    keys = [file_hash(path) for path in pdf_paths] if cache else [None] * len(pdf_paths)
+    cached = [cache.get(key) for key in keys] if cache else [None] * len(pdf_paths)
+    todo = [path for path, pages in zip(pdf_paths, cached) if pages is None]
+
+    bar = tqdm(total=len(pdf_paths), initial=len(pdf_paths) - len(todo), unit="file", disable=not progress)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map keeps the input order; chunks of a few files keep the workers busy without long tails
+        extracted = pool.map(extract_pages, todo, chunksize=max(1, len(todo) // (8 * (workers or os.cpu_count()))))
+        for path, key, pages in zip(pdf_paths, keys, cached):
+            if pages is None:
+                pages, error = next(extracted)
+                if error:
+                    print(error)
+                elif cache:
+                    cache.put(key, pages)
+                bar.update(1)
+            yield path, pages
+    bar.close()
+
+def pdf_files(pdf_directory):
+    return sorted(os.path.join(pdf_directory, f) for f in os.listdir(pdf_directory) if f.endswith('.pdf'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract the text of a folder of PDFs into the shared text cache.")
+    parser.add_argument("pdf_directory")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--cache", default=cache_path, help="path to the SQLite text cache")
+    args = parser.parse_args()
+
+    cache = TextCache(args.cache)
+    for _ in iter_pdf_pages(pdf_files(args.pdf_directory), args.workers, cache):
+        pass
+    print(f"PDF text cache: {cache.stats()}")
@@ -0,0 +1,206 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from bootstrap import chunk_size, seed
+from response_labels import LabelStore
+
+# a review counts as "suggests citations" once its score reaches this value
+threshold = 0.5
+metrics = ["Accuracy", "Precision", "Recall", "F1", "PR_AUC"]
+
+
+def run_name(file):
+    """Column name of a prediction file: the file name without folder and extension."""
+    return os.path.splitext(os.path.basename(file))[0]
+
+def label_column(file):
+    """score where the file has it (P(yes) from the scoring mode of lm_client.py), else binary_label (the tags the
+    former assign_tags.py wrote into the CSVs), else citation_suggestions."""
+    columns = pd.read_csv(file, nrows=0).columns
+    for column in ["score", "binary_label"]:
+        if column in columns:
+            return column
+    return "citation_suggestions"
+
+def load_gold(file):
+    """Manual annotations of a venue: 0/1 labels indexed by review id."""
+    gold = pd.read_csv(file, usecols=["id", "citation_suggestions"]).drop_duplicates("id")
+    return gold.set_index("id")["citation_suggestions"].astype(int)
+
+def load_run(file, ids, store=None):
+    """Scores of one prediction file aligned to the gold ids; NaN where the file has no row for a review.
+
+    With a LabelStore that holds labels of the file's current content, their scores (P(yes) of the deciding
+    rule) are used; otherwise, e.g. for a file regenerated since assign_tags.py last ran, only the id and label
+    columns of the file are read. A review listed twice keeps its first score."""
+    stored = store.labels(file) if store is not None else None
+    if stored is not None and len(stored):
+        scores, column = stored, "score"
+    else:
+        column = label_column(file)
+        scores = pd.read_csv(file, usecols=["id", column]).drop_duplicates("id")
+    scores = scores.astype({"id": str}).set_index("id")[column].astype(float)
+    return scores.reindex(ids.astype(str)).set_axis(ids)
+
+
+def load_sweep(file, ids):
+    """{run: scores} of a scored long-format sweep (prompt_sweep.py --score: id, model, prompt, score), one run
+    per (model, prompt), named after the file, the model (without its organisation) and the prompt."""
+    sweep = pd.read_csv(file, usecols=["id", "model", "prompt", "score"]).drop_duplicates(["id", "model", "prompt"])
+    sweep["run"] = (run_name(file) + "_" + sweep["model"].astype(str).str.split("/").str[-1] + "_"
+                    + sweep["prompt"].astype(str))
+    wide = sweep.astype({"id": str}).pivot(index="id", columns="run", values="score").astype(float)
+    return {run: wide[run].reindex(ids.astype(str)).set_axis(ids) for run in wide.columns}
+
+def load_runs(file, ids, store=None):
+    """{run: scores} of one prediction file: a single run, or every (model, prompt) of a sweep."""
+    columns = pd.read_csv(file, nrows=0).columns
+    if {"model", "prompt", "score"} <= set(columns):
+        return load_sweep(file, ids)
+    return {run_name(file): load_run(file, ids, store)}
+
+
+def prediction_matrix(gold, files, store=None):
+    """(n_reviews x n_runs) score matrix of all prediction files, one column per run."""
+    runs = {}
+    for file in files:
+        runs.update(load_runs(file, gold.index, store))
+    return pd.DataFrame(runs, index=gold.index)
+
+def add_run(matrix, file, store=None):
+    """Add the runs of one more prediction file to a matrix; nothing else is read again."""
+    for run, scores in load_runs(file, matrix.index, store).items():
+        matrix[run] = scores
+    return matrix
+
+
+def confusion_counts(labels, scores, weights):
+    """Weighted tp, fp, fn, tn of every run: (resamples x runs) arrays for (resamples x reviews) weights.
+
+    Reviews without a score in a run count for nothing in that run."""
+    scored = ~np.isnan(scores)
+    predicted = scored & (np.nan_to_num(scores) >= threshold)
+    positive = labels.astype(bool)[:, None]
+    cells = [predicted & positive, predicted & ~positive, scored & ~predicted & positive, scored & ~predicted & ~positive]
+    return [weights @ cell.astype(float) for cell in cells]
+
+def ratio(numerator, denominator):
+    # 0 where the denominator is 0, as sklearn does by default
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+def count_metrics(labels, scores, weights):
+    """Accuracy, precision, recall and F1 of every run for every row of weights, as sklearn computes them."""
+    tp, fp, fn, tn = confusion_counts(labels, scores, weights)
+    return {"Accuracy": ratio(tp + tn, tp + fp + fn + tn), "Precision": ratio(tp, tp + fp),
+            "Recall": ratio(tp, tp + fn), "F1": ratio(2 * tp, 2 * tp + fp + fn)}
+
+def pr_curves(labels, scores, weights):
+    """Weighted precision and recall at every distinct score of one run, highest score first.
+
+    Same points as sklearn.metrics.precision_recall_curve (in reverse), for every row of weights at once;
+    a threshold that no review of a resample reaches gets the (recall 0, precision 1) start point."""
+    order = np.argsort(-scores, kind="stable")
+    scores, labels, weights = scores[order], labels[order], weights[:, order]
+    # last review of every group of equal scores
+    ends = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    tps = np.cumsum(weights * labels, axis=1)[:, ends]
+    fps = np.cumsum(weights * (1 - labels), axis=1)[:, ends]
+    predicted = tps + fps
+    precision = np.divide(tps, predicted, out=np.ones_like(tps), where=predicted > 0)
+    positives = tps[:, -1:]
+    recall = np.divide(tps, positives, out=np.full_like(tps, np.nan), where=positives > 0)
+    return precision, recall
+
+def pr_auc(precision, recall):
+    """Trapezoidal area under the curves from pr_curves, starting at (recall 0, precision 1) like sklearn's auc."""
+    precision = np.c_[np.ones(len(precision)), precision]
+    recall = np.c_[np.zeros(len(recall)), recall]
+    return (np.diff(recall, axis=1) * (precision[:, 1:] + precision[:, :-1]) / 2).sum(axis=1)
+
+def run_pr_auc(labels, scores, weights):
+    """(resamples x runs) PR-AUC; every run is sorted once and all resamples go through one cumsum."""
+    auc = np.full((len(weights), scores.shape[1]), np.nan)
+    for j in range(scores.shape[1]):
+        scored = ~np.isnan(scores[:, j])
+        if scored.any():
+            auc[:, j] = pr_auc(*pr_curves(labels[scored].astype(float), scores[scored, j], weights[:, scored]))
+    return auc
+
+def all_metrics(labels, scores, weights):
+    values = count_metrics(labels, scores, weights)
+    values["PR_AUC"] = run_pr_auc(labels, scores, weights)
+    return values
+
+
+def resample_weights(n_reviews, size, rng):
+    """(size x n_reviews) counts of how often each review is drawn, for size resamples of the reviews."""
+    draws = rng.integers(0, n_reviews, size=(size, n_reviews)) + n_reviews * np.arange(size)[:, None]
+    return np.bincount(draws.ravel(), minlength=size * n_reviews).reshape(size, n_reviews).astype(float)
+
+def bootstrap_metrics(labels, scores, n_bootstrap=1000, ci=95, random_seed=seed):
+    """{metric: (lower, upper)} percentile intervals of every run over paired resamples of the reviews.
+
+    All runs share the same resamples, so their intervals are comparable, and adding a run leaves the
+    intervals of the others unchanged. Resamples are drawn in chunks of at most chunk_size counts."""
+    rng = np.random.default_rng(random_seed)
+    step = max(1, chunk_size // max(len(labels), 1))
+    samples = {metric: [] for metric in metrics}
+    for start in range(0, n_bootstrap, step):
+        weights = resample_weights(len(labels), min(step, n_bootstrap - start), rng)
+        for metric, values in all_metrics(labels, scores, weights).items():
+            samples[metric].append(values)
+    bounds = {}
+    for metric, values in samples.items():
+        values = np.concatenate(values)
+        bounds[metric] = (np.nanpercentile(values, (100 - ci) / 2, axis=0),
+                          np.nanpercentile(values, 100 - (100 - ci) / 2, axis=0))
+    return bounds
+
+
+def evaluate(gold, matrix, n_bootstrap=1000, ci=95, random_seed=seed):
+    """Metrics of every run of a score matrix, with bootstrap intervals and the PR curves.
+
+    Returns (results, curves): one row per run with n (reviews scored) and every metric with _lower/_upper
+    columns, and {run: (precision, recall, pr_auc)} in the order of sklearn's precision_recall_curve."""
+    labels = gold.reindex(matrix.index).to_numpy()
+    scores = matrix.to_numpy(dtype=float)
+    values = all_metrics(labels, scores, np.ones((1, len(labels))))
+    results = pd.DataFrame({"File": matrix.columns, "n": (~np.isnan(scores)).sum(axis=0)})
+    bounds = bootstrap_metrics(labels, scores, n_bootstrap, ci, random_seed) if n_bootstrap else {}
+    for metric in metrics:
+        results[metric] = values[metric][0]
+        if n_bootstrap:
+            results[f"{metric}_lower"], results[f"{metric}_upper"] = bounds[metric]
+
+    curves = {}
+    for j, run in enumerate(matrix.columns):
+        scored = ~np.isnan(scores[:, j])
+        if scored.any():
+            precision, recall = pr_curves(labels[scored].astype(float), scores[scored, j], np.ones((1, scored.sum())))
+            curves[run] = (np.r_[precision[0][::-1], 1.0], np.r_[recall[0][::-1], 0.0], values["PR_AUC"][0, j])
+    return results, curves
+
+def evaluate_files(gold_file, files, n_bootstrap=1000, ci=95, random_seed=seed, labels=None):
+    """Load the gold labels once, align all prediction files and evaluate them.
+
+    labels: path of a response_labels.py label table to take the scores from, where it holds a file's current content."""
+    gold = load_gold(gold_file)
+    store = LabelStore(labels) if labels and os.path.exists(labels) else None
+    matrix = prediction_matrix(gold, files, store)
+    if store is not None:
+        store.close()
+    return evaluate(gold, matrix, n_bootstrap, ci, random_seed)
+
+def evaluate_venues(files_groups, n_bootstrap=1000, ci=95, random_seed=seed, workers=None, labels=None):
+    """{venue: (results, curves)}, one venue per worker process (default: all cores).
+
+    files_groups: {venue: [gold file, prediction files...]}, as in compare_prompts.py."""
+    venues = list(files_groups)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(evaluate_files, files_groups[venue][0], files_groups[venue][1:], n_bootstrap, ci,
+                            random_seed, labels) for venue in venues]
+        return {venue: job.result() for venue, job in zip(venues, jobs)}
@@ -0,0 +1,143 @@
+import argparse
+import csv
+import os
+import re
+from lm_client import ChatClient
+from response_cache import ResponseCache
+from token_budget import get_tokenizer, fit_context, longest_first
+from rate_limiter import RateLimiter
+
+input_csv_path = 'shuffled_NeurIPSwithoutLabels.csv'
+output_csv_path = 'NeurIPS_prompt_sweep.csv'
+# the prompt variants kept with the processed data of the repository
+prompts_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'processed_data',
+                            'prompts_for_models.txt')
+
+# LM API URL
+lm_studio_api_url = 'http://localhost:1234/v1/chat/completions'
+
+# models to compare; all jobs of one model are sent before the next so the server loads each model once
+models = ["meta-llama-3.1-8b-instruct", "meta-llama/Llama-3.3-70B-Instruct"]
+
+# review columns of both OpenReview API versions; columns missing from the input are skipped
+context_columns = [
+    "summary",
+    "strengths",
+    "weaknesses",
+    "questions",
+    "limitations",
+    "flag_for_ethics_review",
+    "rating",
+    "summary_of_the_paper",
+    "strength_and_weaknesses",
+    "clarity,_quality,_novelty_and_reproducibility",
+    "summary_of_the_review"
+]
+
+def load_prompts(prompts_path):
+    """Parse prompts_for_models.txt into {"A": "...", "B": "...", ...}."""
+    with open(prompts_path, mode='r', encoding='utf-8') as f:
+        text = f.read()
+    prompts = {}
+    # a prompt is either quoted on the same line (Prompt A "...") or a triple-quoted block below it
+    pattern = re.compile(r'^Prompt (\w+)\s*(?:"""(.*?)"""|[“"](.*?)["”]\s*$)', re.MULTILINE | re.DOTALL)
+    for match in pattern.finditer(text):
+        prompts[match.group(1)] = (match.group(2) or match.group(3)).strip()
+    return prompts
+
+def run_sweep(input_csv_path, output_csv_path, prompts, models, client,
+              context_budget=None, budget_mode="truncate", tokenizer=None):
+    tokenizer = tokenizer or get_tokenizer()
+    # read the reviews once for all prompts and models
+    reviews = []
+    with open(input_csv_path, mode='r', encoding='utf-8') as input_file:
+        for row in csv.DictReader(input_file):
+            entry_id = row.get("id", "").strip()
+            if not entry_id:
+                print("Warning: Missing ID for a row. Skipping.")
+                continue
+            reviews.append((entry_id, fit_context(row, context_columns, context_budget, tokenizer, mode=budget_mode)))
+
+    # one job per (model, prompt, review), grouped by model
+    keys = []
+    jobs = []
+    token_counts = []
+    for model in models:
+        for prompt_name, question in prompts.items():
+            for entry_id, contexts in reviews:
+                for context, n_tokens in contexts:
+                    keys.append((entry_id, model, prompt_name))
+                    jobs.append((context, question, model))
+                    token_counts.append(n_tokens)
+
+    print(f"{len(reviews)} reviews x {len(prompts)} prompts x {len(models)} models = {len(jobs)} requests "
+          f"({client.concurrency} at a time)")
+
+    # in scoring mode the column holds P(yes), and a failed request is left empty rather than given a text
+    column, failed = ("score", "") if client.score_yes_no else ("response", "Failed to get response")
+    with open(output_csv_path, mode='w', encoding='utf-8', newline='') as output_file:
+        writer = csv.writer(output_file)
+        writer.writerow(["id", "model", "prompt", column])
+
+        chunk_responses = []
+
+        def write_response(index, response):
+            chunk_responses.append(response)
+            if index + 1 < len(jobs) and keys[index + 1] == keys[index]:
+                return  # wait for the remaining chunks of this review
+            response = client.join_chunks(chunk_responses)
+            chunk_responses.clear()
+
+            entry_id, model, prompt_name = keys[index]
+            writer.writerow([entry_id, model, prompt_name, response if response else failed])
+            if (index + 1) % 100 == 0 or index + 1 == len(jobs):
+                print(f"{index + 1}/{len(jobs)} responses written")
+
+        # longest first within each model; the model groups themselves stay in order
+        submit_order = []
+        for model in models:
+            group = [i for i in range(len(jobs)) if jobs[i][2] == model]
+            submit_order.extend(group[i] for i in longest_first([token_counts[j] for j in group]))
+        client.complete_in_order(jobs, write_response, submit_order=submit_order)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send every review to every prompt variant and model in one run.")
+    parser.add_argument("--input", default=input_csv_path)
+    parser.add_argument("--output", default=output_csv_path, help="long-format CSV with id, model, prompt, response")
+    parser.add_argument("--score", action="store_true",
+                        help="ask for one token with logprobs and write P(yes) to a 'score' column instead of the response")
+    parser.add_argument("--prompts", default=prompts_path)
+    parser.add_argument("--only", nargs="+", help="prompt letters to run, e.g. --only A C G")
+    parser.add_argument("--models", nargs="+", default=models)
+    parser.add_argument("--api-url", default=lm_studio_api_url)
+    parser.add_argument("--token", default=None, help="bearer token for remote servers")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-tokens", type=int, default=500)
+    parser.add_argument("--qps", type=float, default=None, help="requests per second allowed by the server")
+    parser.add_argument("--budget", type=int, default=None, help="maximum review tokens per request")
+    parser.add_argument("--budget-mode", choices=["truncate", "split"], default="truncate")
+    parser.add_argument("--tokenizer", default=None, help="'tiktoken:cl100k_base' or a Hugging Face model name")
+    args = parser.parse_args()
+
+    prompts = load_prompts(args.prompts)
+    if args.only:
+        unknown = [name for name in args.only if name not in prompts]
+        if unknown:
+            parser.error(f"unknown prompt(s) {', '.join(unknown)} in {args.prompts}; available: {', '.join(prompts)}")
+        prompts = {name: prompts[name] for name in args.only}
+
+    client = ChatClient(
+        args.api_url,
+        model=args.models[0],
+        authorization_token=args.token,
+        concurrency=args.concurrency,
+        cache=ResponseCache(),
+        extra_params={"stream": False, "max_tokens": args.max_tokens},
+        rate_limiter=RateLimiter(rate=args.qps, burst=args.concurrency) if args.qps else None,
+        score_yes_no=args.score
+    )
+    run_sweep(args.input, args.output, prompts, args.models, client,
+              args.budget, args.budget_mode, get_tokenizer(args.tokenizer))
+    print(f"Response cache: {client.cache.stats()}")
+    if client.rate_limiter is not None:
+        print(f"Rate limiter: {client.rate_limiter.stats()}")
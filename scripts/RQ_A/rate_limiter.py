@@ -0,0 +1,124 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# status codes worth retrying: rate limit and transient server errors
+retry_statuses = (429, 500, 502, 503, 504)
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date); None if absent."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket whose rate adapts with AIMD: +increase per success, *decrease per 429.
+
+    Like TCP, the rate is cut at most once per cooldown so a burst of 429s from requests that
+    were already in flight counts as one congestion signal. One limiter is shared by every
+    client talking to the same provider; acquire() blocks (acquire_async() awaits) until the
+    next request may be sent."""
+
+    def __init__(self, rate, burst=1, max_rate=None, min_rate=0.05, increase=0.05, decrease=0.5, cooldown=2.0):
+        self.rate = rate
+        self.max_rate = max_rate or rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.last_decrease = float("-inf")
+        self.burst = burst
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        # metrics
+        self.started = None
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _reserve(self):
+        # take one token (possibly going into debt) and return how long the caller has to wait for it
+        with self.lock:
+            now = time.monotonic()
+            if self.started is None:
+                self.started = now
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate, self.blocked_until - now, 0.0)
+            self.requests += 1
+            self.total_wait += wait
+            return wait
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after=None):
+        """Halve the rate after a 429 and honour the server's Retry-After for everyone sharing the limiter."""
+        with self.lock:
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self.last_decrease >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.last_decrease = now
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        return {
+            "requests": self.requests,
+            "achieved_qps": round(self.requests / elapsed, 3) if elapsed else 0.0,
+            "throttle_rate": round(self.throttled / self.requests, 3) if self.requests else 0.0,
+            "total_wait_s": round(self.total_wait, 1),
+            "current_rate": round(self.rate, 3)
+        }
+
+
+def send_with_retries(send, limiter, max_retries=10, base_delay=1.0):
+    """Call send() (a requests call returning a Response) under the limiter, retrying 429 and 5xx.
+
+    Returns the first non-retryable response, or None once max_retries is exhausted."""
+    for attempt in range(max_retries):
+        limiter.acquire()
+        response = send()
+        if response.status_code not in retry_statuses:
+            if response.status_code == 200:
+                limiter.on_success()
+            return response
+
+        if response.status_code == 429:
+            limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+        wait = backoff_delay(attempt, base_delay)
+        print(f"Retry {attempt + 1}/{max_retries} after {response.status_code}; waiting {wait:.2f} seconds...")
+        time.sleep(wait)
+    print("Max retries reached. Skipping request.")
+    return None
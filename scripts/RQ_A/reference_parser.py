@@ -0,0 +1,166 @@
+import argparse
+import csv
+import os
+import re
+from pdf_text import iter_pdf_pages, join_pages, pdf_files
+
+# start of the references section: a heading line of its own, else the upper-case word anywhere
+# (PDF text often runs the heading into the first reference), else "References" at the start of a line
+section_patterns = [
+    re.compile(r"^[ \t]*(?:\d+\.?[ \t]*)?(?:REFERENCES|References|BIBLIOGRAPHY|Bibliography)[ \t]*$", re.M),
+    re.compile(r"\bREFERENCES\b"),
+    re.compile(r"^[ \t]*References\b", re.M)
+]
+# end of the references section: an appendix or acknowledgments heading at the start of a line,
+# optionally numbered ("A Appendix", "7. Acknowledgements"); mentions inside a reference do not count
+cutoff_pattern = re.compile(
+    r"^[ \t]*(?:[A-Z0-9](?:\.\d+)*\.?[ \t]+)?(?:APPENDI(?:X|CES)|Appendi(?:x|ces)|ACKNOWLEDGE?MENTS?|Acknowledge?ments?)\b",
+    re.M)
+
+# a reference ends on a line ending in its year ("2019.", "2021b."), a page range ("pages 12–20."), a DOI or a URL;
+# numbered styles start with "[12]"
+boundary_pattern = re.compile(r".*(\d{4}[a-z]?\.|\d+\s?[–-]\s?\d+\.|\b10\.\d{4,9}/\S+|https?://\S+)$")
+numbered_pattern = re.compile(r"^\[\d+\]")
+url_pattern = re.compile(r"^https?://\S+$")
+
+# one scan over the section classifies every arXiv id, DOI and year in place; arXiv ids and DOIs are tried first,
+# so the digits inside them ("arXiv:1905.01234", "10.18653/v1/N19-1423") are never read as years;
+# the leading lookahead lets the scan skip every position that cannot start a token
+token_pattern = re.compile(
+    r"(?=[\dAa])(?:(?P<arxiv>(?i:arXiv:\s?|arxiv\.org/(?:abs|pdf)/)\d{4}\.\d{4,5})(?:v\d+)?"
+    r"|(?P<doi>\b10\.\d{4,9}/[^\s\"<>]+?)(?=[.,;]?(?:\s|$))"
+    r"|(?P<year>(?<![\d./:-])(?:19\d|20[0-2])\d)[a-z]?(?![\d/]))")
+year_pattern = re.compile(r"(?:19\d|20[0-2])\d[a-z]?")
+# sentence-like pieces of a reference; initials ("J. Smith") do not end a piece
+piece_pattern = re.compile(r"(?<!\b[A-Z])(?<!\bvs)\.\s+")
+quoted_title_pattern = re.compile(r"[“\"]([^”\"]{10,})[,.]?[”\"]")
+
+
+def references_section(text):
+    """Text of the references section, cut at the first appendix or acknowledgments heading after it."""
+    for pattern in section_patterns:
+        start = pattern.search(text)
+        if start:
+            break
+    else:
+        return ""
+    section = text[start.end():]
+    stop = cutoff_pattern.search(section)
+    return (section[:stop.start()] if stop else section).strip()
+
+def reference_spans(section):
+    """(start, end) offsets of the references in a references section."""
+    spans = []
+    start = None
+    position = 0
+    for line in section.split("\n"):
+        line_start, line_end = position, position + len(line)
+        position = line_end + 1
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if url_pattern.match(stripped) and start is None and spans:
+            # a URL on its own line belongs to the reference that just ended (e.g. on a page number)
+            spans[-1] = (spans[-1][0], line_end)
+            continue
+        if numbered_pattern.match(stripped) and start is not None:
+            spans.append((start, line_start))
+            start = None
+        if start is None:
+            start = line_start
+        if boundary_pattern.match(stripped):
+            spans.append((start, line_end))
+            start = None
+    if start is not None:
+        spans.append((start, len(section)))
+    return spans
+
+def split_references(section):
+    """Reference strings of a references section, whitespace-normalised."""
+    return [" ".join(section[start:end].split()) for start, end in reference_spans(section)]
+
+def reference_year(years, arxiv_id):
+    """Publication year from the year tokens of one reference, as (year, closes a piece) pairs.
+
+    The first year closing a piece ("2019." or "(2019)") wins, else the last one; an arXiv-only reference
+    gets the year of its id."""
+    for year, closing in years:
+        if closing:
+            return year
+    if years:
+        return years[-1][0]
+    if arxiv_id:
+        return 2000 + int(arxiv_id[:2])
+    return None
+
+def candidate_title(reference):
+    """Best guess at the title: a quoted span, else the first piece after the authors that is not just a year."""
+    quoted = quoted_title_pattern.search(reference)
+    if quoted:
+        return quoted.group(1).strip().rstrip(",.")
+    pieces = [p.strip() for p in piece_pattern.split(numbered_pattern.sub("", reference))]
+    for piece in pieces[1:]:
+        if len(piece.split()) >= 3 and not year_pattern.fullmatch(piece.rstrip(".")):
+            return piece.rstrip(".")
+    return None
+
+def parse_references(text, titles=True):
+    """Structured records (Reference, year, arxiv_id, doi, title) for every reference in a paper's text.
+
+    The section is scanned once for arXiv ids, DOIs and years, and every token is attributed to the reference
+    whose span it falls in. titles=False skips the candidate titles when only the years are needed."""
+    section = references_section(text)
+    tokens = token_pattern.finditer(section)
+    token = next(tokens, None)
+    records = []
+    for start, end in reference_spans(section):
+        years, arxiv_id, doi = [], None, None
+        while token is not None and token.start() < end:
+            if token.start() >= start:
+                kind = token.lastgroup
+                if kind == "year":
+                    years.append((int(token.group("year")), section[token.end():token.end() + 1] in (".", ")")))
+                elif kind == "arxiv" and arxiv_id is None:
+                    arxiv_id = token.group("arxiv")[-10:].lstrip(":/ \n")
+                elif kind == "doi" and doi is None:
+                    doi = token.group("doi")
+            token = next(tokens, None)
+        reference = " ".join(section[start:end].split())
+        records.append({
+            "Reference": reference,
+            "year": reference_year(years, arxiv_id),
+            "arxiv_id": arxiv_id,
+            "doi": doi,
+            "title": candidate_title(reference) if titles else None
+        })
+    return records
+
+def reference_years(text):
+    """One publication year per reference that has one, in order."""
+    return [record["year"] for record in parse_references(text, titles=False) if record["year"] is not None]
+
+
+# columns of the reference table; "PDF File" and "Reference" keep the layout of the older reference lists
+table_columns = ["PDF File", "Reference", "year", "arxiv_id", "doi", "title"]
+
+def write_reference_table(pdf_paths, output_csv, workers=None):
+    """Parse every PDF once and write all references into one CSV; returns the number of references."""
+    count = 0
+    with open(output_csv, mode="w", newline="", encoding="utf-8-sig", errors="replace") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=table_columns)
+        writer.writeheader()
+        for pdf_path, pages in iter_pdf_pages(pdf_paths, workers=workers):
+            pdf_file = os.path.basename(pdf_path)
+            for record in parse_references(join_pages(pages, skip_empty=True)):
+                writer.writerow({"PDF File": pdf_file, **record})
+                count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse the references of a folder of submission PDFs into one table.")
+    parser.add_argument("pdf_directory")
+    parser.add_argument("output_csv", help="e.g. ICLR2023_references.csv")
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes (default: all cores)")
+    args = parser.parse_args()
+    print(f"{write_reference_table(pdf_files(args.pdf_directory), args.output_csv, args.workers)} references written")
@@ -0,0 +1,135 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+
+# default cache location; shared by all LM scripts run from the same folder
+cache_path = 'lm_response_cache.sqlite'
+
+
+class ResponseCache:
+    """On-disk cache of LLM responses keyed by a hash of the full request payload."""
+
+    def __init__(self, path=cache_path, max_size_mb=1024):
+        self.path = path
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                size INTEGER,
+                created REAL,
+                last_used REAL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses (last_used)")
+        self.conn.commit()
+        self.size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(payload):
+        # the payload holds model name, system prompt, question, context and sampling parameters
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, payload):
+        key = self.make_key(payload)
+        row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return row[0]
+
+    def put(self, payload, response):
+        if response is None:
+            return  # never cache failures
+        self._insert(self.make_key(payload), payload.get("model"), response)
+        self.evict()
+
+    def _insert(self, key, model, response, created=None, last_used=None):
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, response, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, response, size, created or now, last_used or now)
+        )
+        self.conn.commit()
+        self.size += size - (old[0] if old else 0)
+
+    def evict(self):
+        """Drop least recently used responses until the cache fits into max_size_mb."""
+        if self.size <= self.max_size:
+            return
+        rows = self.conn.execute("SELECT key, size FROM responses ORDER BY last_used ASC").fetchall()
+        for key, size in rows:
+            if self.size <= self.max_size:
+                break
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.size -= size
+        self.conn.commit()
+
+    def stats(self):
+        """Entries and size of the cache; hits and misses count the lookups of this instance only (not stored)."""
+        count = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "entries": count,
+            "size_mb": round(self.size / 1024 / 1024, 2),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def export_jsonl(self, output_path):
+        count = 0
+        with open(output_path, mode='w', encoding='utf-8') as f:
+            for key, model, response, created, last_used in self.conn.execute(
+                    "SELECT key, model, response, created, last_used FROM responses ORDER BY created"):
+                f.write(json.dumps({"key": key, "model": model, "response": response,
+                                    "created": created, "last_used": last_used}, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def import_jsonl(self, input_path):
+        count = 0
+        with open(input_path, mode='r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self._insert(record["key"], record.get("model"), record["response"],
+                             record.get("created"), record.get("last_used"))
+                count += 1
+        self.evict()
+        return count
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect, export or import the LLM response cache.")
+    parser.add_argument("command", choices=["stats", "export", "import"])
+    parser.add_argument("file", nargs="?", help="JSONL file to export to / import from")
+    parser.add_argument("--cache", default=cache_path, help="path to the SQLite cache")
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.cache)
+    if args.command == "stats":
+        # a fresh instance has made no lookups, so its hit and miss counters would always read 0
+        print({key: value for key, value in cache.stats().items() if key not in ("hits", "misses")})
+    elif not args.file:
+        parser.error(f"'{args.command}' needs a JSONL file")
+    elif args.command == "export":
+        print(f"Exported {cache.export_jsonl(args.file)} responses to {args.file}")
+    else:
+        print(f"Imported {cache.import_jsonl(args.file)} responses from {args.file}")
+    cache.close()
@@ -0,0 +1,210 @@
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import time
+import pandas as pd
+from pdf_text import file_hash
+
+# default label table location; shared by assign_tags.py and compare_prompts.py run from the same folder
+labels_path = 'response_labels.sqlite'
+# bump when the rules change, so every file is labelled again on the next run
+rules_version = 2
+# bump when the tables change; a label table of another layout is dropped and filled again
+store_version = 2
+# reviews and responses can be longer than the csv module's default field limit
+csv.field_size_limit(sys.maxsize)
+
+# a verdict at the very start of the answer: "Yes, ...", "No.", "**No**", "Answer: Yes"
+leading_verdict = re.compile(r"^\W*(?:answer\W*)?(yes|no)\b", re.IGNORECASE)
+# the first sentence says the review does not suggest literature: "doesn't (explicitly) suggest", "no clear indication"
+negation = re.compile(r"\b(?:does|do|did)(?:\s+not|n't)\s+(?:\w+\s+){0,2}"
+                      r"(?:suggest|recommend|ask|request|indicate|mention|state|seem|appear)"
+                      r"|\bno\s+(?:\w+\s+)?(?:suggestion|indication|recommendation|mention)s?\b"
+                      r"|\bnot\s+(?:explicitly\s+)?(?:suggest|recommend)", re.IGNORECASE)
+# the first sentence says the review points the authors to literature
+suggestion = re.compile(r"\b(?:suggest|recommend|advise|encourage)\w*\b.{0,120}?"
+                        r"\b(?:refer|cit(?:e|ing)|literature|references?|related work|prior work)", re.IGNORECASE)
+# hedges that make a verdict less certain
+hedge = re.compile(r"\b(?:may|might|could|possibly|perhaps|seems?|appears?|not explicitly|implicitly|indirectly|somewhat|"
+                   r"tangential(?:ly)?)\b", re.IGNORECASE)
+# the first sentence ends at ., ! or ? followed by whitespace
+sentence_end = re.compile(r"(?<=[.!?])\s")
+# the former rule, kept as the last resort, but as a word: "eyes" or "yesterday" are no answer
+contains_yes = re.compile(r"\byes\b", re.IGNORECASE)
+
+# confidence of each rule in its label; a hedge lowers it, but never to 0.5 or below, so score >= 0.5 <=> label 1
+confidence = {"leading": 1.0, "negation": 0.8, "suggestion": 0.8, "contains_yes": 0.65, "default": 0.65}
+hedge_penalty = 0.1
+
+
+def label_response(response):
+    """(label, score, rule) of one response; score is the P(yes) implied by the deciding rule's confidence.
+
+    Rules in order: a leading yes/no; a negation, then a suggestion of literature in the first sentence;
+    "yes" anywhere (the former rule); otherwise 0."""
+    text = response or ""
+    first = sentence_end.split(text, 1)[0]
+    verdict = leading_verdict.match(text)
+    if verdict:
+        rule, label = "leading", int(verdict.group(1).lower() == "yes")
+    elif negation.search(first):
+        rule, label = "negation", 0
+    elif suggestion.search(first):
+        rule, label = "suggestion", 1
+    elif contains_yes.search(text):
+        rule, label = "contains_yes", 1
+    else:
+        rule, label = "default", 0
+    certainty = confidence[rule] - (hedge_penalty if hedge.search(first) else 0)
+    return label, round(certainty if label else 1 - certainty, 3), rule
+
+def label_file(path):
+    """Labels of a response file as a DataFrame of id, label, score and rule; None without a response column.
+
+    The file is streamed row by row and only its id and response fields are looked at. An id listed twice
+    keeps its first response."""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if "response" not in header or "id" not in header:
+            return None
+        id_index, response_index = header.index("id"), header.index("response")
+        rows = {}
+        for row in reader:
+            if len(row) > response_index and row[id_index] not in rows:
+                rows[row[id_index]] = label_response(row[response_index])
+    return pd.DataFrame([(key, *values) for key, values in rows.items()], columns=["id", "label", "score", "rule"])
+
+class LabelStore:
+    """Labels of response files keyed by (content hash, id), with the path, size and mtime of every file seen.
+
+    A file's labels are looked up through the SHA-256 of its current content, so a regenerated file never gets
+    the labels of its former content, two files of the same name in different folders keep their own labels,
+    and a folder of runs that was moved or copied is not labelled again. The response CSVs are never written."""
+
+    def __init__(self, path=labels_path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != store_version:
+            # tables of an older layout only hold labels, which are cheap to compute again
+            for table in ("files", "contents", "labels"):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(f"PRAGMA user_version = {store_version}")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime REAL,
+                sha256 TEXT
+            )""")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS contents (
+                sha256 TEXT PRIMARY KEY,
+                version INTEGER,
+                rows INTEGER,
+                processed REAL
+            )""")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS labels (
+                sha256 TEXT,
+                id TEXT,
+                label INTEGER,
+                score REAL,
+                rule TEXT,
+                PRIMARY KEY (sha256, id)
+            )""")
+        self.conn.commit()
+
+    def content_key(self, path, stamp=False):
+        """SHA-256 of a file's current content; taken from the files table while its size and mtime are unchanged.
+
+        stamp=True records the size, mtime and hash of a file that was hashed again."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self.conn.execute("SELECT size, mtime, sha256 FROM files WHERE path = ?", (path,)).fetchone()
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime:
+            return entry[2]
+        key = file_hash(path)
+        if stamp:
+            self.conn.execute("INSERT OR REPLACE INTO files (path, size, mtime, sha256) VALUES (?, ?, ?, ?)",
+                              (path, stat.st_size, stat.st_mtime, key))
+        return key
+
+    def labelled(self, key):
+        """Whether a content was labelled by the current rules."""
+        row = self.conn.execute("SELECT version FROM contents WHERE sha256 = ?", (key,)).fetchone()
+        return row is not None and row[0] == rules_version
+
+    def changed_files(self, paths):
+        """(path, sha256) of the files whose content is new or was labelled by older rules.
+
+        Size and mtime decide first; a file whose mtime moved but whose content was labelled already is only re-stamped."""
+        changed = []
+        for path in paths:
+            key = self.content_key(path, stamp=True)
+            if not self.labelled(key):
+                changed.append((path, key))
+        self.conn.commit()
+        return changed
+
+    def put(self, key, labels):
+        """Replace the labels of one content; labels=None records a file without responses."""
+        rows = [] if labels is None else list(zip([key] * len(labels), labels["id"], labels["label"].tolist(),
+                                                  labels["score"].tolist(), labels["rule"]))
+        self.conn.execute("DELETE FROM labels WHERE sha256 = ?", (key,))
+        self.conn.executemany("INSERT INTO labels (sha256, id, label, score, rule) VALUES (?, ?, ?, ?, ?)", rows)
+        self.conn.execute("INSERT OR REPLACE INTO contents (sha256, version, rows, processed) VALUES (?, ?, ?, ?)",
+                          (key, rules_version, len(rows), time.time()))
+        self.conn.commit()
+
+    def prune(self):
+        """Forget files that no longer exist and the labels of contents no file has any more."""
+        gone = [(path,) for (path,) in self.conn.execute("SELECT path FROM files") if not os.path.exists(path)]
+        self.conn.executemany("DELETE FROM files WHERE path = ?", gone)
+        for table in ("contents", "labels"):
+            self.conn.execute(f"DELETE FROM {table} WHERE sha256 NOT IN (SELECT sha256 FROM files)")
+        self.conn.commit()
+
+    def labels(self, file):
+        """DataFrame of id, label, score and rule for the current content of a file; empty if that content was
+        never labelled (or only by older rules), so a regenerated file is not scored with stale labels."""
+        key = self.content_key(file)
+        if not self.labelled(key):
+            return pd.DataFrame(columns=["id", "label", "score", "rule"])
+        return pd.read_sql_query("SELECT id, label, score, rule FROM labels WHERE sha256 = ?", self.conn, params=(key,))
+
+    def rule_counts(self):
+        """How often each rule decided a label, over all labelled contents."""
+        return dict(self.conn.execute("SELECT rule, COUNT(*) FROM labels GROUP BY rule ORDER BY COUNT(*) DESC"))
+
+    def close(self):
+        self.conn.close()
+
+
+def update(paths, store):
+    """Label the files that changed since the last run; returns (labelled, unchanged, without responses)."""
+    paths = list(paths)
+    changed = store.changed_files(paths)
+    without = 0
+    for path, key in changed:
+        labels = label_file(path)
+        without += labels is None
+        store.put(key, labels)
+    store.prune()
+    return len(changed) - without, len(paths) - len(changed), without
+
+def csv_files(folder):
+    return sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.csv'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the labels stored for a response file.")
+    parser.add_argument("file")
+    parser.add_argument("--labels", default=labels_path, help="path to the SQLite label table")
+    args = parser.parse_args()
+    print(LabelStore(args.labels).labels(args.file).to_string(index=False))
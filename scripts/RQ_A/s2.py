@@ -1,62 +1,135 @@
+import json
 import pandas as pd
 import requests
-import time
-import random
 from tqdm import tqdm
+from rate_limiter import RateLimiter, send_with_retries
+from paper_store import PaperStore
+from title_index import TitleIndex
 
 # Replace with your Semantic Scholar API Key
 S2_API_KEY = "yourAPIkey"
 
 HEADERS = {"Authorization": f"Bearer {S2_API_KEY}"}
 
+S2_API_URL = "https://api.semanticscholar.org/graph/v1"
+DETAIL_FIELDS = "title,authors,abstract,year,fieldsOfStudy,externalIds"
+BATCH_SIZE = 500  # maximum number of ids accepted by POST /paper/batch
+
+# S2 allows about 1 request per second with an API key; all lookups share this limiter
+s2_limiter = RateLimiter(rate=1.0, max_rate=1.0)
+
+# papers already seen in any venue are answered locally instead of from the API
+store = PaperStore()
+
+# approximate title matches against the store; built on first use
+title_index = None
+
+def get_title_index():
+    global title_index
+    if title_index is None:
+        title_index = TitleIndex.from_store(store)
+        print(f"Title index: {len(title_index)} titles")
+    return title_index
+
 def request_with_retries(url, params=None, max_retries=10, backoff_factor=1):
-    """Perform a GET request with retries and an API key."""
-    retries = 0
-    while retries < max_retries:
-        response = requests.get(url, params=params, headers=HEADERS)
-        if response.status_code == 200:
-            return response
-        elif response.status_code == 429:  # Rate limit
-            wait_time = backoff_factor * (1 ** retries) + random.uniform(0, 1)
-            print(f"Rate limited. Retrying in {wait_time:.2f} seconds...")
-            time.sleep(wait_time)
-            retries += 1
-        else:
-            print(f"Request failed ({response.status_code}): {response.text}")
-            return None
-    print("Max retries reached. Skipping request.")
-    return None
+    """Perform a rate-limited GET request with retries and an API key."""
+    response = send_with_retries(
+        lambda: requests.get(url, params=params, headers=HEADERS),
+        s2_limiter, max_retries=max_retries, base_delay=backoff_factor
+    )
+    if response is not None and response.status_code != 200:
+        print(f"Request failed ({response.status_code}): {response.text}")
+        return None
+    return response
+
+def post_with_retries(url, json_body, params=None, max_retries=10, backoff_factor=1):
+    """Perform a rate-limited POST request with retries; returns the last response (or None)."""
+    return send_with_retries(
+        lambda: requests.post(url, params=params, json=json_body, headers=HEADERS),
+        s2_limiter, max_retries=max_retries, base_delay=backoff_factor
+    )
 
 def get_paper_id(title_or_url):
     """Get the Semantic Scholar paper ID from a title or arXiv URL."""
     if isinstance(title_or_url, str) and "arxiv.org" in title_or_url:
         arxiv_id = title_or_url.split("/")[-1].replace(".pdf", "")  
-        return f"ARXIV:{arxiv_id}"
+        known = store.find_by_arxiv(arxiv_id)
+        return known["paperId"] if known else f"ARXIV:{arxiv_id}"
     
-    search_url = "https://api.semanticscholar.org/graph/v1/paper/search/match"
-    params = {"query": title_or_url, "limit": 1}
-    response = request_with_retries(search_url, params=params)
+    seen, paper_id = store.lookup_query(title_or_url)
+    if seen:
+        return paper_id
+    known = store.find_by_title(title_or_url)
+    if known:
+        return known["paperId"]
+    # noisy LLM-extracted titles are matched on character trigrams; only low-confidence ones reach the API
+    paper_id = get_title_index().resolve(title_or_url)
+    if paper_id:
+        store.remember_query(title_or_url, paper_id)
+        return paper_id
     
-    if response:
-        data = response.json()
-        if "data" in data and len(data["data"]) > 0:
-            return data["data"][0]["paperId"]
+    search_url = f"{S2_API_URL}/paper/search/match"
+    params = {"query": title_or_url, "limit": 1, "fields": DETAIL_FIELDS}
+    response = request_with_retries(search_url, params=params)
+    if response is None:
+        return None  # request failed; not remembered so that it is retried next run
     
-    return None  # No match found
+    data = response.json()
+    paper_id = None
+    if "data" in data and len(data["data"]) > 0:
+        paper_id = data["data"][0]["paperId"]
+        store.put(data["data"][0])
+        get_title_index().add(data["data"][0].get("title"), paper_id)
+    store.remember_query(title_or_url, paper_id)
+    return paper_id
 
 def get_paper_details(paper_id):
     """Fetch paper details from Semantic Scholar."""
     if not paper_id:
         return None
+    known = store.get(paper_id)
+    if known:
+        return known
     
-    url = f"https://api.semanticscholar.org/graph/v1/paper/{paper_id}"
-    fields = "title,authors,abstract,fieldsOfStudy"
-    response = request_with_retries(url, params={"fields": fields})
+    url = f"{S2_API_URL}/paper/{paper_id}"
+    response = request_with_retries(url, params={"fields": DETAIL_FIELDS})
     
     if response:
-        return response.json()
+        details = response.json()
+        store.put(details)
+        return details
     return None
 
+def fetch_details_chunk(paper_ids):
+    """Fetch one chunk through POST /paper/batch; returns {paper_id: details or None}."""
+    response = post_with_retries(f"{S2_API_URL}/paper/batch", {"ids": paper_ids}, params={"fields": DETAIL_FIELDS})
+    if response is not None and response.status_code == 200:
+        # the batch endpoint answers in input order with null for unknown ids
+        details = dict(zip(paper_ids, response.json()))
+        store.mark_not_found([pid for pid, d in details.items() if d is None])
+        return details
+    if response is not None and response.status_code == 400 and len(paper_ids) > 1:
+        # one malformed id rejects the whole chunk; bisect to keep the valid ones
+        middle = len(paper_ids) // 2
+        return {**fetch_details_chunk(paper_ids[:middle]), **fetch_details_chunk(paper_ids[middle:])}
+    if response is not None:
+        print(f"Batch request failed ({response.status_code}): {response.text[:200]}")
+    # left as None so that a re-run of process_csv picks these ids up again
+    return {paper_id: None for paper_id in paper_ids}
+
+def get_paper_details_batch(paper_ids, batch_size=BATCH_SIZE):
+    """Fetch paper details for many ids; only ids missing from the local store go to the API, 500 per request."""
+    unique_ids = list(dict.fromkeys(pid for pid in paper_ids if pid))
+    details = {pid: store.get(pid) for pid in unique_ids}
+    missing = [pid for pid, d in details.items() if d is None and not store.is_not_found(pid)]
+    print(f"{len(unique_ids) - len(missing)} / {len(unique_ids)} papers already known to the local store")
+    chunks = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+    for chunk in tqdm(chunks, desc="Fetching details", unit="batch"):
+        fetched = fetch_details_chunk(chunk)
+        store.put_many(d for d in fetched.values() if d)
+        details.update(fetched)
+    return details
+
 def process_csv(input_csv, output_csv):
     """Step 1: Retrieve paper IDs and save them first."""
     df = pd.read_csv(input_csv)
@@ -70,21 +143,28 @@ def process_csv(input_csv, output_csv):
         if pd.isna(row["paper_id"]):
             paper_id = get_paper_id(row["paper_info"])
             df.at[index, "paper_id"] = paper_id if paper_id else None
-            time.sleep(1)  # Avoid rate limits
 
     # Save after retrieving paper IDs
     df.to_csv(output_csv, index=False)
     print("Paper IDs saved. Now fetching details...")
 
-    """Step 2: Retrieve paper details separately"""
+    """Step 2: Retrieve paper details separately, in batches; rows that already have details are kept"""
     if "paper_details" not in df.columns:
         df["paper_details"] = None
     
-    tqdm.pandas(desc="Fetching details")
-    df["paper_details"] = df["paper_id"].progress_apply(lambda pid: get_paper_details(pid) if pid else None)
+    missing = df["paper_details"].isna() & df["paper_id"].notna()
+    details = get_paper_details_batch(df.loc[missing, "paper_id"].tolist())
+    df["paper_details"] = df["paper_details"].astype(object)
+    # stored as JSON so that later loads can parse the column in one vectorised pass
+    df.loc[missing, "paper_details"] = df.loc[missing, "paper_id"].map(
+        lambda paper_id: json.dumps(details[paper_id]) if details.get(paper_id) else None)
+    print(f"Fetched details for {sum(d is not None for d in details.values())} / {len(details)} papers")
 
     df.to_csv(output_csv, index=False)
     print("Processing complete. Output saved.")
+    print(f"S2 rate limiter: {s2_limiter.stats()}")
+    print(f"Paper store: {store.stats()}")
 
 # Example usage:
-process_csv("EMNLP2023_suggested_citation_400.csv", "EMNLP2023_suggested_citation_400_output_ab.csv")
+if __name__ == "__main__":
+    process_csv("EMNLP2023_suggested_citation_400.csv", "EMNLP2023_suggested_citation_400_output_ab.csv")
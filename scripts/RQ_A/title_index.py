@@ -0,0 +1,114 @@
+import zlib
+import numpy as np
+from paper_store import normalize_title
+
+# a match below this Dice score on character trigrams is not trusted and goes to the S2 API instead
+min_score = 0.8
+
+# MinHash signature of 64 values cut into 16 bands of 4: titles with Jaccard >= 0.6 share a band with p > 0.9
+num_perm = 64
+bands = 16
+
+
+def trigrams(text):
+    """Character trigrams of the normalised text, padded so that short words still produce some."""
+    text = normalize_title(text)
+    if not text:
+        return set()
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TitleIndex:
+    """Approximate title lookups on character trigrams.
+
+    Titles go into a MinHash/LSH table, so a query only looks at the few titles that share one of its
+    band hashes. Every candidate is verified with the exact Dice score."""
+
+    def __init__(self, seed=1):
+        rng = np.random.default_rng(seed)
+        # (a * x + b) mod 2**32 with odd a; x is the CRC32 of a trigram, so the product fits in uint64
+        self.a = rng.integers(1, 2 ** 32, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self.rows = num_perm // bands
+        self.entries = []    # (title, paper_id)
+        self.grams = []      # trigram set per entry
+        self.buckets = {}    # (band, band hash) -> entry numbers
+
+    def signature(self, grams):
+        hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        return ((np.outer(hashes, self.a) + self.b) & np.uint64(0xFFFFFFFF)).min(axis=0)
+
+    def band_keys(self, grams):
+        signature = self.signature(grams)
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(bands)]
+
+    def add(self, title, paper_id=None):
+        grams = trigrams(title)
+        if not grams:
+            return
+        entry = len(self.entries)
+        self.entries.append((title, paper_id))
+        self.grams.append(grams)
+        for key in self.band_keys(grams):
+            self.buckets.setdefault(key, []).append(entry)
+
+    def add_titles(self, items, chunk_size=2000):
+        """Index many (title, paper_id) pairs; signatures are computed for a whole chunk at once."""
+        items = list(items)
+        for start in range(0, len(items), chunk_size):
+            chunk = [(title, paper_id, trigrams(title)) for title, paper_id in items[start:start + chunk_size]]
+            chunk = [item for item in chunk if item[2]]
+            if not chunk:
+                continue
+            hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for _, _, grams in chunk for g in grams),
+                                 dtype=np.uint64)
+            offsets = np.cumsum([0] + [len(grams) for _, _, grams in chunk[:-1]])
+            hashed = (hashes[:, None] * self.a + self.b) & np.uint64(0xFFFFFFFF)
+            signatures = np.minimum.reduceat(hashed, offsets, axis=0)
+            for (title, paper_id, grams), signature in zip(chunk, signatures):
+                entry = len(self.entries)
+                self.entries.append((title, paper_id))
+                self.grams.append(grams)
+                for band in range(bands):
+                    key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                    self.buckets.setdefault(key, []).append(entry)
+
+    def add_store(self, store):
+        """Index every title in the local paper store."""
+        self.add_titles(store.conn.execute("SELECT title, paper_id FROM papers WHERE title IS NOT NULL"))
+
+    @classmethod
+    def from_store(cls, store):
+        index = cls()
+        index.add_store(store)
+        return index
+
+    def _title_candidates(self, query_grams):
+        candidates = set()
+        for key in self.band_keys(query_grams):
+            candidates.update(self.buckets.get(key, ()))
+        return candidates
+
+    def search(self, query, k=3, threshold=min_score):
+        """Up to k (score, title, paper_id) tuples with score >= threshold, best first."""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        results = []
+        for entry in self._title_candidates(query_grams):
+            score = 2 * len(query_grams & self.grams[entry]) / (len(query_grams) + len(self.grams[entry]))
+            if score >= threshold:
+                results.append((score, *self.entries[entry]))
+        results.sort(key=lambda r: -r[0])
+        return results[:k]
+
+    def resolve(self, query, threshold=min_score):
+        """The paper id of the best confident title match, or None when the network has to decide."""
+        for score, title, paper_id in self.search(query, k=1, threshold=threshold):
+            return paper_id
+        return None
+
+    def __len__(self):
+        return len(self.entries)
+
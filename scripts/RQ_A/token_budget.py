@@ -0,0 +1,138 @@
+import argparse
+import csv
+import re
+import statistics
+
+# upper edges of the histogram bins (tokens per review)
+histogram_bins = [256, 512, 1024, 2048, 4096, 8192]
+
+
+class RegexTokenizer:
+    """Dependency-free approximation: one token per word or punctuation run (plus trailing whitespace)."""
+
+    pattern = re.compile(r"\w+\s*|[^\w\s]+\s*|\s+")
+
+    def encode(self, text):
+        return self.pattern.findall(text)
+
+    def decode(self, tokens):
+        return "".join(tokens).rstrip()
+
+
+class TiktokenTokenizer:
+    def __init__(self, encoding_name):
+        import tiktoken  # pip install tiktoken
+        self.encoding = tiktoken.get_encoding(encoding_name)
+
+    def encode(self, text):
+        return self.encoding.encode(text, disallowed_special=())
+
+    def decode(self, tokens):
+        return self.encoding.decode(tokens)
+
+
+class HFTokenizer:
+    def __init__(self, model_name):
+        from transformers import AutoTokenizer  # pip install transformers
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    def encode(self, text):
+        return self.tokenizer.encode(text, add_special_tokens=False)
+
+    def decode(self, tokens):
+        return self.tokenizer.decode(tokens)
+
+
+def get_tokenizer(name=None):
+    """None -> regex approximation, 'tiktoken:<encoding>' -> tiktoken, anything else -> Hugging Face tokenizer."""
+    if not name or name == "regex":
+        return RegexTokenizer()
+    if name.startswith("tiktoken:"):
+        return TiktokenTokenizer(name.split(":", 1)[1])
+    return HFTokenizer(name)
+
+def count_tokens(text, tokenizer):
+    return len(tokenizer.encode(text))
+
+def truncate_fields(fields, budget, tokenizer):
+    """Shorten the (column, text) fields so that the joined context fits into the budget.
+
+    Short fields are kept whole and the long ones share what is left equally, so a long
+    summary cannot push the weaknesses or questions out of the prompt."""
+    encoded = [tokenizer.encode(f"{col}: {text}") for col, text in fields]
+    budget = max(budget - (len(fields) - 1), 0)  # one newline between fields
+    if sum(len(tokens) for tokens in encoded) <= budget:
+        return "\n".join(f"{col}: {text}" for col, text in fields)
+
+    allowance = {}
+    remaining = budget
+    order = sorted(range(len(encoded)), key=lambda i: len(encoded[i]))
+    for position, i in enumerate(order):
+        share = remaining // (len(order) - position)
+        allowance[i] = min(len(encoded[i]), share)
+        remaining -= allowance[i]
+    return "\n".join(tokenizer.decode(tokens[:allowance[i]]) for i, tokens in enumerate(encoded) if allowance[i])
+
+def split_text(text, budget, tokenizer):
+    """Cut the text into consecutive chunks of at most budget tokens."""
+    tokens = tokenizer.encode(text)
+    if len(tokens) <= budget:
+        return [text]
+    return [tokenizer.decode(tokens[start:start + budget]) for start in range(0, len(tokens), budget)]
+
+def fit_context(row, context_columns, budget, tokenizer, mode="truncate"):
+    """Build the review context for one CSV row and return a list of (context, n_tokens) within the budget.
+
+    mode="truncate" always returns one context; mode="split" returns one context per chunk."""
+    fields = [(col, row.get(col, '').strip()) for col in context_columns if row.get(col)]
+    context = "\n".join(f"{col}: {text}" for col, text in fields)
+    if budget:
+        if mode == "split":
+            return [(chunk, count_tokens(chunk, tokenizer)) for chunk in split_text(context, budget, tokenizer)]
+        context = truncate_fields(fields, budget, tokenizer)
+    return [(context, count_tokens(context, tokenizer))]
+
+def longest_first(token_counts):
+    """Submission order that sends requests of similar size together, longest first."""
+    return sorted(range(len(token_counts)), key=lambda i: token_counts[i], reverse=True)
+
+def token_histogram(csv_path, context_columns, tokenizer):
+    counts = []
+    with open(csv_path, mode='r', encoding='utf-8') as input_file:
+        for row in csv.DictReader(input_file):
+            context = "\n".join([f"{col}: {row.get(col, '').strip()}" for col in context_columns if row.get(col)])
+            counts.append(count_tokens(context, tokenizer))
+    return counts
+
+def report_token_histograms(venue_files, context_columns, tokenizer, budget=None):
+    """Print the per-venue distribution of review lengths in tokens."""
+    edges = [0] + histogram_bins + [float("inf")]
+    for venue, csv_path in venue_files.items():
+        counts = token_histogram(csv_path, context_columns, tokenizer)
+        if not counts:
+            print(f"\n{venue}: no reviews in {csv_path}")
+            continue
+        print(f"\n{venue} ({len(counts)} reviews, {sum(counts)} tokens in total)")
+        for low, high in zip(edges[:-1], edges[1:]):
+            n = sum(low <= c < high for c in counts)
+            label = f"{low}-{high - 1}" if high != float("inf") else f">={low}"
+            print(f"  {label:>11}: {n:6d} {'#' * round(50 * n / len(counts))}")
+        counts.sort()
+        print(f"  mean {statistics.mean(counts):.0f}, median {statistics.median(counts):.0f}, "
+              f"p95 {counts[int(0.95 * (len(counts) - 1))]}, max {counts[-1]}")
+        if budget:
+            over = sum(c > budget for c in counts)
+            print(f"  {over} reviews ({100 * over / len(counts):.1f}%) exceed the budget of {budget} tokens")
+
+
+if __name__ == "__main__":
+    from prompt_sweep import context_columns
+
+    parser = argparse.ArgumentParser(description="Token histogram of review contexts per venue.")
+    parser.add_argument("files", nargs="+", help="VENUE=path.csv, e.g. ICLR=ICLR2023.csv")
+    parser.add_argument("--tokenizer", default=None, help="'tiktoken:cl100k_base' or a Hugging Face model name")
+    parser.add_argument("--budget", type=int, default=None)
+    args = parser.parse_args()
+
+    venue_files = dict(item.split("=", 1) for item in args.files)
+    report_token_histograms(venue_files, context_columns, get_tokenizer(args.tokenizer), args.budget)
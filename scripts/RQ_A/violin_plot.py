@@ -2,6 +2,11 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import load_years
 
 # files
 file_names = [
@@ -14,33 +19,18 @@ file_names = [
 # initialize a list to store the data for each file
 year_data = []
 
-# loop through each file
+# loop through each file; the years are read as one flat array from the Parquet copy of the CSV
 for file in file_names:
-    df = pd.read_csv(file)
-
-    # extract the "extracted_years" column 
-    extracted_years = df['extracted_years']
-
-    # list to hold the integer years
-    all_years = []
-
-    # loop through each entry in the "extracted_years" column
-    for years_string in extracted_years:
-        # split the string by commas and convert each value to an integer
-        years_list = map(int, years_string.split(', '))
-        # append the years to the all_years list
-        all_years.extend(years_list)
-    
-    # add the processed data to the list
-    year_data.append(all_years)
+    year_data.append(load_years(file, 'extracted_years'))
 
 # create a combined list of years with corresponding file labels
 combined_data = []
 labels = []
 
 for file, data in zip(file_names, year_data):
-    combined_data.extend(data)
+    combined_data.append(data)
     labels.extend([file.split('_')[0]] * len(data))
+combined_data = np.concatenate(combined_data)
 
 # create a DataFrame for plotting
 df = pd.DataFrame({'Year': combined_data, 'Dataset': labels})
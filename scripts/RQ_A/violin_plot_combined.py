@@ -1,13 +1,19 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import os
+import sys
 
-# suggested years
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import load, load_years
+from extract_suggested_years import output_path as suggested_years_path
+
+# suggested years: the response files' rows of the long table of extract_suggested_years.py
 suggested_files = [
-    'extracted_EMNLP2023_llama70b_all.csv', 
-    'extracted_ICLR2023_llama70b_all.csv', 
-    'extracted_NeurIPS2023_llama70b_all.csv', 
-    'extracted_NeurIPS2024_llama70b_all.csv'
+    'EMNLP2023_llama70b_all.csv', 
+    'ICLR2023_llama70b_all.csv', 
+    'NeurIPS2023_llama70b_all.csv', 
+    'NeurIPS2024_llama70b_all.csv'
 ]
 
 # citation years
@@ -22,21 +28,19 @@ citation_files = [
 def extract_years(file_list, year_column, label):
     data = []
     for file in file_list:
-        df = pd.read_csv(file)
-        extracted_years = df[year_column].dropna()  # Drop NaN values
-        all_years = []
-        for years_string in extracted_years:
-            years_list = map(int, years_string.split(', '))
-            all_years.extend(years_list)
-        venue = file.split('_')[1] if "extracted" in file else file.split('_')[0]  # Extract venue name
-        data.extend([(year, venue, label) for year in all_years])
+        all_years = load_years(file, year_column)  # empty cells are null lists and contribute nothing
+        venue = file.split('_')[0]  # Extract venue name
+        data.append(pd.DataFrame({'Year': all_years, 'Venue': venue, 'Type': label}))
     return data
 
-suggested_data = extract_years(suggested_files, 'suggested_years', 'Suggested Year')
+# one row per suggested year already; the venue is the first part of the response file name
+suggested = load(suggested_years_path, columns=['file', 'year'], filters=[('file', 'in', suggested_files)])
+suggested_data = [pd.DataFrame({'Year': suggested['year'].to_numpy(), 'Venue': suggested['file'].astype(str).str.split('_').str[0],
+                                'Type': 'Suggested Year'})]
 citation_data = extract_years(citation_files, 'extracted_years', 'Citation Year')
 
 # combine df
-df = pd.DataFrame(suggested_data + citation_data, columns=['Year', 'Venue', 'Type'])
+df = pd.concat(suggested_data + citation_data, ignore_index=True)
 palette = {'Suggested Year': 'steelblue', 'Citation Year': 'skyblue'}
 
 # combined violin plot
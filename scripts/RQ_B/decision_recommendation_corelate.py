@@ -1,11 +1,17 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.stats import ttest_ind, chi2_contingency
+from scipy.stats import ttest_ind
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import load
+from contingency import test_tables
 
 # load csv to df (choose df2 as needed)
-df1 = pd.read_csv("cleaned_ICLR2023_with_decision_dense.csv")  # first CSV with 'decision' column -- Accept/Reject csv
-df2 = pd.read_csv("ICLR2023_llama70b_rec_num.csv")  # second CSV with 'number of reviewers recommending' column
+df1 = load("cleaned_ICLR2023_with_decision_dense.csv", columns=['invitations', 'decision'])  # first CSV with 'decision' column -- Accept/Reject csv
+df2 = load("ICLR2023_llama70b_rec_num.csv", columns=['invitation', 'number of reviewers recommending'])  # second CSV with 'number of reviewers recommending' column
 # df2 = pd.read_csv("ICLR2023_llama70b_with_rec_num_binary.csv")  # second CSV with 'number of reviewers recommending' column -- binary version/whether or not the paper got recommended extra literature
 
 # merge the two df on the 'invitations' (ID) column
@@ -62,11 +68,13 @@ merged_df['is_accepted'] = merged_df['decision'].apply(lambda x: 1 if 'accept' i
 group_yes = merged_df[merged_df['number of reviewers recommending'] == 1]['is_accepted']
 group_no = merged_df[merged_df['number of reviewers recommending'] == 0]['is_accepted']
 
-# chi-square test for independence and statistic significance
+# chi-square test for independence and statistic significance; the permutation p-value (scripts/contingency.py)
+# does not rely on the asymptotic approximation, which is poor when some rows have few papers
 contingency = pd.crosstab(merged_df['number of reviewers recommending'], merged_df['is_accepted'])
-chi2, chi_p, dof, expected = chi2_contingency(contingency)
+test = test_tables({"ICLR2023": contingency}).iloc[0]
 print("=== Chi-square Test ===")
 print("Contingency Table:")
 print(contingency)
-print(f"\nChi-square statistic: {chi2:.4f}")
-print(f"P-value: {chi_p:.4f}")
+print(f"\nChi-square statistic: {test['chi2']:.4f}")
+print(f"P-value: {test['p']:.4f}")
+print(f"Permutation p-value: {test['p_permutation']:.4f}")
@@ -1,19 +1,16 @@
 import pandas as pd
-import ast
+import os
 import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import load
 
 # load csv that contains field of study info from S2
-df_suggestion = pd.read_csv("ICLR2023_suggestion_full_ab.csv")
-
-# extract 'title' from 'paper_details'
-def extract_title(detail):
-    try:
-        data = ast.literal_eval(detail)
-        return data.get("title", None)
-    except:
-        return None
+df_suggestion = load("ICLR2023_suggestion_full_ab.csv", columns=['details_title', 'invitation'])
 
-df_suggestion['title'] = df_suggestion['paper_details'].apply(extract_title)
+# the title is parsed out of paper_details once by the data layer
+df_suggestion['title'] = df_suggestion['details_title']
 
 def extract_submission_id(invitation):
     if pd.isna(invitation):
@@ -1,20 +1,19 @@
 import pandas as pd
 import ast
+import os
 import re
+import sys
 import plotly.graph_objects as go
 import random
 
-# load csv with field of study info from S2
-df_suggestion = pd.read_csv("NeurIPS2024_suggestion_full_ab.csv")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import load
 
-def extract_title(detail):
-    try:
-        data = ast.literal_eval(detail)
-        return data.get("title", None)
-    except:
-        return None
+# load csv with field of study info from S2
+df_suggestion = load("NeurIPS2024_suggestion_full_ab.csv", columns=['details_title', 'invitations'])
 
-df_suggestion['title'] = df_suggestion['paper_details'].apply(extract_title)
+# the title is parsed out of paper_details once by the data layer
+df_suggestion['title'] = df_suggestion['details_title']
 
 def extract_submission_id(invitations):
     try:
@@ -1,78 +1,34 @@
+import argparse
+import os
+import sys
 import pandas as pd
-import re
-import ast
 
-# load both lists of suggested papers and cited papers
-df1 = pd.read_csv('ICLR2023_suggestion_full_ab.csv')
-df2 = pd.read_csv('ICLR2023_citation_extracted_clean.csv')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'RQ_A'))
+from paper_store import PaperStore
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import load
 
-def extract_field(x, field):
-    if pd.isna(x):
-        return None
-    try:
-        return ast.literal_eval(x).get(field)
-    except (ValueError, SyntaxError):
-        return None
+from citation_matcher import extract_submission_ids, match_submissions
 
+# suggested papers ({venue}_suggestion_full_ab.csv) and cited papers ({venue}_citation_extracted_clean.csv) per venue;
+# venues whose files are missing are skipped
+venues = ["ICLR2023", "NeurIPS2023", "NeurIPS2024", "EMNLP2023"]
 
-# extract title directly if paper_details is already a dict
-df1['title'] = df1['paper_details'].apply(lambda x: extract_field(x, 'title'))
+# titles come from the details_title column the data layer parses out of paper_details once;
+# rows without details are filled from the local paper store filled by s2.py
+store = PaperStore()
 
-def extract_submission_id(inv_list):
-    match = re.search(r'Paper\d+', str(inv_list))
-    if match:
-        return match.group(0).replace('Paper', 'Submission')
-    return None
+def load_venue(venue):
+    df1 = load(f'{venue}_suggestion_full_ab.csv')
+    paper_ids = df1['paper_id'] if 'paper_id' in df1.columns else [None] * len(df1)
+    df1['title'] = store.fill_missing(df1['details_title'], paper_ids, 'title')
+    df1['submission_id'] = extract_submission_ids(df1)
 
-df1['submission_id'] = df1['invitation'].apply(extract_submission_id)
-
-''' # for API2
-# Extract Submission ID from invitations (e.g., "Submission1404")
-def extract_submission_id(inv_list):
-    match = re.search(r'Submission\d+', str(inv_list))
-    return match.group(0) if match else None
-
-df1['submission_id'] = df1['invitations'].apply(extract_submission_id)
-
-'''
-# normalize submission ID in df2 (e.g., "submission1404.pdf" -> "Submission1404")
-df2['submission_id'] = df2['PDF File'].str.extract(r'(submission\d+)', expand=False).str.capitalize()
-
-# merge the two df on submission_id
-merged_df = pd.merge(df1, df2, on='submission_id', how='inner')
-
-# normalize text (lowercase, strip whitespace)
-def normalize_text(text):
-    if isinstance(text, str):
-        return text.lower().strip()  # Convert to lowercase and strip spaces
-    return ""
-
-# extract 4-grams from a string
-def get_ngrams(text, n=4):
-    normalized_text = normalize_text(text)  # Normalize the text before processing
-    words = re.findall(r'\w+', normalized_text)  # Extract words
-    return set(tuple(words[i:i+n]) for i in range(len(words) - n + 1))
-
-
-
-# check for at least one shared 4-gram
-def has_4gram_match(title, reference):
-    title_ngrams = get_ngrams(title, n=4)
-    reference_ngrams = get_ngrams(reference, n=4)
-    return not title_ngrams.isdisjoint(reference_ngrams)
-
-# apply 4-gram matching
-merged_df['title_in_reference'] = merged_df.apply(
-    lambda row: has_4gram_match(row['title'], row['Reference']), axis=1
-)
-
-# Keep only one row per submission_id
-# filter rows where 'title_in_reference' is TRUE
-filtered_df = merged_df[merged_df['title_in_reference'] == True]
-
-# drop duplicates based on 'submission_id' column
-filtered_df = filtered_df.drop_duplicates(subset='submission_id')
+    # normalize submission ID in df2 (e.g., "submission1404.pdf" -> "Submission1404")
+    df2 = pd.read_csv(f'{venue}_citation_extracted_clean.csv')
+    df2['submission_id'] = df2['PDF File'].str.extract(r'(submission\d+)', expand=False).str.capitalize()
+    return df1, df2
 
 def compute_match_percentage(filtered_df, original_df):
     true_matches = filtered_df[filtered_df['title_in_reference'] == True]
@@ -84,12 +40,41 @@ def compute_match_percentage(filtered_df, original_df):
     print("Matched Titles:")
     for idx, row in true_matches.iterrows():
         print(f"- {row['submission_id']}: {row['title']}")
-
-
-compute_match_percentage(filtered_df, df1)
+    return true_count, total_ids, percentage
 
 
 # save to csv
 def save_to_csv(df, filename):
-    df.to_csv(filename, index=False) 
-
+    df.to_csv(filename, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="How many suggested papers end up cited, for every venue in one run.")
+    parser.add_argument("--n", type=int, default=4, help="words per n-gram")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="minimum similarity of title and reference (default: any shared n-gram)")
+    parser.add_argument("--similarity", choices=["jaccard", "containment"], default="jaccard")
+    parser.add_argument("--save", action="store_true", help="write {venue}_actual_cite_matches.csv")
+    args = parser.parse_args()
+
+    summary = []
+    for venue in venues:
+        if not (os.path.exists(f'{venue}_suggestion_full_ab.csv') and os.path.exists(f'{venue}_citation_extracted_clean.csv')):
+            print(f"{venue}: input files not found, skipped")
+            continue
+        df1, df2 = load_venue(venue)
+
+        # one n-gram index per submission over its references, probed with the suggested titles of that submission
+        matched_df = match_submissions(df1, df2, args.n, args.threshold, args.similarity)
+
+        # Keep only one row per submission_id
+        filtered_df = matched_df[matched_df['title_in_reference'] == True].drop_duplicates(subset='submission_id')
+
+        print(f"== {venue} ==")
+        summary.append((venue, *compute_match_percentage(filtered_df, df1)))
+        if args.save:
+            save_to_csv(matched_df, f'{venue}_actual_cite_matches.csv')
+
+    print("\nvenue, matched submissions, submissions, percentage")
+    for venue, true_count, total_ids, percentage in summary:
+        print(f"{venue}, {true_count}, {total_ids}, {percentage:.2f}%")
@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from bootstrap import bootstrap_table
+from score_engine import bucket_years, venues
+
+corpus_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'processed_data',
+                             'processed_data_for_citations_in_paper')
+categories = {"technical_novelty_and_significance": [1, 2, 3, 4], "empirical_novelty_and_significance": [1, 2, 3, 4],
+              "recommendation": [1, 3, 5, 6, 8, 10]}
+
+
+def review_table(venue, rng):
+    """Average citing year of every paper of a venue, with averaged synthetic scores of 3-5 reviewers."""
+    df = pd.read_csv(os.path.join(corpus_folder, f"{venue}_citation_analysis_results.csv"), usecols=["average_year"])
+    reviewers = rng.integers(3, 6, len(df))
+    for cat, scale in categories.items():
+        scores = rng.choice(scale, size=(len(df), 5)).astype(float)
+        scores[np.arange(5) >= reviewers[:, None]] = np.nan
+        scores[rng.random(scores.shape) < 0.02] = np.nan   # unparsable scores
+        df[f"avg_{cat}"] = np.nanmean(scores, axis=1)
+    df = df[df["average_year"].notna()].reset_index(drop=True)
+    df["rounded_year"] = bucket_years(df["average_year"].to_numpy(), venues[venue]["merged_year"])
+    return df
+
+
+# the previous per-script bootstrap, called for every year bucket and category
+def bootstrap_ci(data, n_bootstrap=1000, ci=95):
+    boot_means = [data.sample(frac=1, replace=True).mean() for _ in range(n_bootstrap)]
+    lower = np.percentile(boot_means, (100 - ci) / 2)
+    upper = np.percentile(boot_means, 100 - (100 - ci) / 2)
+    return np.mean(boot_means), lower, upper
+
+def old_table(df, columns, n_bootstrap):
+    results = []
+    for year in sorted(df["rounded_year"].unique()):
+        subset = df[df["rounded_year"] == year]
+        row = {"rounded_year": year}
+        for cat in columns:
+            mean, lower, upper = bootstrap_ci(subset[cat].dropna(), n_bootstrap)
+            row[f"{cat}_mean"] = mean
+            row[f"{cat}_lower"] = lower
+            row[f"{cat}_upper"] = upper
+        results.append(row)
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-bucket pandas bootstrap vs. the shared NumPy bootstrap.")
+    parser.add_argument("--venue", default="ICLR2023")
+    parser.add_argument("--resamples", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    df = review_table(args.venue, np.random.default_rng(0))
+    columns = [f"avg_{cat}" for cat in categories]
+    print(f"{args.venue}: {len(df)} papers, {df['rounded_year'].nunique()} year buckets, {len(columns)} score categories")
+
+    start = time.perf_counter()
+    old = old_table(df, columns, 1000)
+    old_time = time.perf_counter() - start
+    print(f"{'':>28} {'resamples':>10} {'seconds':>8}")
+    print(f"{'pandas loop':>28} {1000:>10} {old_time:>8.3f}")
+
+    for n_bootstrap in args.resamples:
+        for method in ["percentile", "bca"]:
+            start = time.perf_counter()
+            new = bootstrap_table(df, "rounded_year", columns, n_bootstrap, method=method)
+            print(f"{'bootstrap_table ' + method:>28} {n_bootstrap:>10} {time.perf_counter() - start:>8.3f}")
+
+    # same seed, same intervals; and the bounds agree with the old loop up to its own resampling noise
+    repeat = bootstrap_table(df, "rounded_year", columns, 1000)
+    print("reproducible:", repeat.equals(bootstrap_table(df, "rounded_year", columns, 1000)))
+    bounds = [c for c in old.columns if c.endswith(("_lower", "_upper"))]
+    print(f"largest bound difference to the pandas loop at 1000 resamples: {(repeat[bounds] - old[bounds]).abs().max().max():.3f}")
@@ -0,0 +1,79 @@
+import argparse
+import os
+import random
+import re
+import time
+import pandas as pd
+from citation_matcher import extract_submission_ids, match_submissions
+
+annotated_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'processed_data',
+                                'annotated_data_for_suggested_papers')
+words = "learning neural networks attention graph language model robust efficient training via deep".split()
+surnames = "Smith Chen Wang Garcia Kumar Müller Rossi Kim Nguyen Ivanov Dubois Tanaka".split()
+
+
+def load_suggestions(venue):
+    """Suggested titles (paper_info) of the annotated reviews of a venue, with their submission ids."""
+    df = pd.read_csv(os.path.join(annotated_folder, f"{venue}_extra_annoatated_pur.csv"))
+    df = df[df['paper_info'].notna()]
+    return pd.DataFrame({'submission_id': extract_submission_ids(df).values, 'title': df['paper_info'].str.strip().values})
+
+def synthetic_references(suggestions, n_references, cited_share, rng):
+    """Reference lists per submission: random references plus, for a share of the suggested titles, a cited copy."""
+    rows = []
+    for submission, titles in suggestions.groupby('submission_id')['title']:
+        for _ in range(n_references):
+            authors = ", ".join(f"{rng.choice('ABCDEFGHJKLMN')}. {rng.choice(surnames)}" for _ in range(rng.randint(1, 4)))
+            title = " ".join(rng.choice(words) for _ in range(rng.randint(4, 10))).capitalize()
+            rows.append((f"{submission.lower()}.pdf", f"{authors}. {title}. In Proceedings, {rng.randint(1990, 2024)}."))
+        for title in titles:
+            if rng.random() < cited_share:
+                rows.append((f"{submission.lower()}.pdf", f"{rng.choice(surnames)} et al. {title}. In ICML, 2022."))
+    references = pd.DataFrame(rows, columns=['PDF File', 'Reference'])
+    references['submission_id'] = references['PDF File'].str.extract(r'(submission\d+)', expand=False).str.capitalize()
+    return references
+
+
+# the previous matching in actual_cite.py: merge every title with every reference, then 4-grams per row
+def get_ngrams(text, n=4):
+    normalized_text = text.lower().strip() if isinstance(text, str) else ""
+    words = re.findall(r'\w+', normalized_text)
+    return set(tuple(words[i:i+n]) for i in range(len(words) - n + 1))
+
+def has_4gram_match(title, reference):
+    return not get_ngrams(title, n=4).isdisjoint(get_ngrams(reference, n=4))
+
+def old_match(suggestions, references):
+    merged_df = pd.merge(suggestions, references, on='submission_id', how='inner')
+    merged_df['title_in_reference'] = merged_df.apply(
+        lambda row: has_4gram_match(row['title'], row['Reference']), axis=1)
+    return merged_df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge + per-row 4-grams vs. the per-submission n-gram index.")
+    parser.add_argument("--venues", nargs="+", default=["ICLR2023", "NeurIPS2023", "NeurIPS2024"])
+    parser.add_argument("--references", type=int, default=60, help="synthetic references per submission")
+    parser.add_argument("--cited-share", type=float, default=0.3, help="share of suggested titles that are cited")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'venue':>12} {'titles':>7} {'references':>11} {'merge+apply s':>14} {'index s':>8} {'speed-up':>9} "
+          f"{'same submissions':>17} {'jaccard>=0.5':>13}")
+    for venue in args.venues:
+        suggestions = load_suggestions(venue)
+        references = synthetic_references(suggestions, args.references, args.cited_share, rng)
+
+        start = time.perf_counter()
+        old = old_match(suggestions, references)
+        old_time = time.perf_counter() - start
+        start = time.perf_counter()
+        new = match_submissions(suggestions, references)
+        new_time = time.perf_counter() - start
+
+        # the index with threshold=None keeps the "any shared 4-gram" rule, so the matched submissions must agree
+        old_ids = set(old.loc[old['title_in_reference'], 'submission_id'])
+        new_ids = set(new.loc[new['title_in_reference'], 'submission_id'])
+        strict = match_submissions(suggestions, references, threshold=0.5)['title_in_reference'].sum()
+        print(f"{venue:>12} {len(suggestions):>7} {len(references):>11} {old_time:>14.3f} {new_time:>8.3f} "
+              f"{old_time / new_time:>8.1f}x {str(old_ids == new_ids):>17} {strict:>13}")
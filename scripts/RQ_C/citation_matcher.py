@@ -0,0 +1,79 @@
+import re
+from collections import Counter, defaultdict
+
+word_pattern = re.compile(r'\w+')
+
+
+def ngram_hashes(text, n=4):
+    """Hashes of the word n-grams of a lower-cased, stripped text; empty for texts shorter than n words."""
+    if not isinstance(text, str):
+        return set()
+    words = word_pattern.findall(text.lower().strip())
+    return {hash(tuple(words[i:i + n])) for i in range(len(words) - n + 1)}
+
+
+class ReferenceIndex:
+    """Hashed word n-gram inverted index over the references of one submission.
+
+    Every reference is tokenised once; a suggested title is then matched by counting, through the posting
+    lists of its own n-grams, how many n-grams it shares with each reference."""
+
+    def __init__(self, references, n=4):
+        self.n = n
+        self.references = list(references)
+        self.sizes = []
+        self.postings = defaultdict(list)   # n-gram hash -> reference positions
+        for position, reference in enumerate(self.references):
+            grams = ngram_hashes(reference, n)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(position)
+
+    def scores(self, title, similarity="jaccard"):
+        """(position, shared n-grams, score) for every reference sharing at least one n-gram with the title.
+
+        similarity is "jaccard" (shared / union) or "containment" (shared / n-grams of the title)."""
+        grams = ngram_hashes(title, self.n)
+        shared = Counter(position for gram in grams for position in self.postings.get(gram, ()))
+        results = []
+        for position, count in shared.items():
+            if similarity == "containment":
+                score = count / len(grams)
+            else:
+                score = count / (len(grams) + self.sizes[position] - count)
+            results.append((position, count, score))
+        return results
+
+    def best_match(self, title, threshold=None, similarity="jaccard"):
+        """(reference, score) of the best-scoring reference, or (None, 0.0).
+
+        With threshold=None any shared n-gram is a match (the original has_4gram_match rule)."""
+        best = max(self.scores(title, similarity), key=lambda r: r[2], default=None)
+        if best is None or (threshold is not None and best[2] < threshold):
+            return None, 0.0
+        return self.references[best[0]], best[2]
+
+
+# "Paper1404" in API1 invitations and "Submission1404" in API2 invitations both become "Submission1404"
+def extract_submission_ids(df):
+    column = 'invitation' if 'invitation' in df.columns else 'invitations'
+    return 'Submission' + df[column].astype(str).str.extract(r'(?:Paper|Submission)(\d+)', expand=False)
+
+def match_submissions(suggestions, references, n=4, threshold=None, similarity="jaccard"):
+    """Best matching reference for every suggested title, with one index per submission.
+
+    suggestions: DataFrame with submission_id and title; references: DataFrame with submission_id and Reference.
+    Returns a copy of suggestions with matched_reference, match_score and title_in_reference columns."""
+    indexes = {submission: ReferenceIndex(group['Reference'], n)
+               for submission, group in references.groupby('submission_id')}
+    matched, scores = [], []
+    for submission, title in zip(suggestions['submission_id'], suggestions['title']):
+        index = indexes.get(submission)
+        reference, score = index.best_match(title, threshold, similarity) if index else (None, 0.0)
+        matched.append(reference)
+        scores.append(score)
+    result = suggestions.copy()
+    result['matched_reference'] = matched
+    result['match_score'] = scores
+    result['title_in_reference'] = result['matched_reference'].notna()
+    return result
@@ -0,0 +1,280 @@
+import argparse
+import os
+import re
+import sys
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_layer import column_names, load
+from bootstrap import intervals, seed
+from contingency import test_groups
+
+# one schema per venue:
+#   subsets        label -> processed CSV with average_year and reviewer{i}_{category} columns (missing files are skipped)
+#   categories     review score categories; a score is the leading number of e.g. "3: good"
+#   grouped        categories drawn side by side in the first chart, with their legend labels
+#   overall        category of the second chart; None for the mean of all categories (stored as category "score")
+#   merged_year    (from, to, label): consecutive average years with few papers that share one bucket
+#   highlight      buckets whose overall mean gets a dashed line, or "max" for the highest mean
+#   bins           score bins of the chi-square tests, overall_bins for the overall category; bins are closed on
+#                  the left, so they end one past the top of scale/overall_scale to keep top-scored papers
+venues = {
+    "ICLR2023": {
+        "subsets": {"accepted": "ICLR2023_accept_score.csv"},
+        "categories": ["technical_novelty_and_significance", "empirical_novelty_and_significance", "recommendation"],
+        "grouped": {"technical_novelty_and_significance": "Technical Novelty",
+                    "empirical_novelty_and_significance": "Empirical Novelty"},
+        "overall": "recommendation",
+        "overall_label": "Final Recommendation Scores",
+        "scale": (1, 4),
+        "overall_scale": (1, 10),
+        "merged_year": (2021, 2022, "2021"),
+        "highlight": ["2021", "until 2010"],
+        "trend": True,
+        "bins": [1, 2, 3, 4, 5],
+        "overall_bins": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
+    },
+    "NeurIPS2023": {
+        "subsets": {"accepted": "NeurIPS2023_accept_score.csv"},
+        "categories": ["contribution", "presentation", "soundness", "rating"],
+        "grouped": {"contribution": "contribution", "presentation": "presentation", "soundness": "soundness"},
+        "overall": "rating",
+        "overall_label": "Final Recommendation Scores",
+        "scale": (1, 4),
+        "overall_scale": (1, 10),
+        "merged_year": (2022, 2024, "2022"),
+        "highlight": ["2021", "until 2010"],
+        "trend": False,
+        "bins": [1, 2, 3, 4, 5],
+        "overall_bins": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
+    },
+    "NeurIPS2024": {
+        "subsets": {"accepted": "NeurIPS2024_accept_score.csv"},
+        "categories": ["contribution", "presentation", "soundness", "rating"],
+        "grouped": {"contribution": "contribution", "presentation": "presentation", "soundness": "soundness"},
+        "overall": "rating",
+        "overall_label": "Final Recommendation Scores",
+        "scale": (1, 4),
+        "overall_scale": (1, 10),
+        "merged_year": (2022, 2024, "2022"),
+        "highlight": ["2021", "until 2010"],
+        "trend": False,
+        "bins": [1, 2, 3, 4, 5],
+        "overall_bins": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
+    },
+    "EMNLP2023": {
+        "subsets": {"total": "EMNLP2023_scores.csv"},
+        "categories": ["soundness", "excitement", "reproducibility"],
+        "grouped": {"soundness": "soundness", "excitement": "excitement", "reproducibility": "reproducibility"},
+        "overall": None,
+        "overall_label": "Overall Reviewer Score",
+        "scale": (1, 4),
+        "overall_scale": (1, 4),
+        "merged_year": (2022, 2023, "2022"),
+        "highlight": "max",
+        "trend": False,
+        "bins": [1, 2, 3, 4, 5],
+        "overall_bins": [1, 2, 3, 4, 5],
+    },
+}
+colors = ["skyblue", "salmon", "gold"]
+
+score_column_pattern = re.compile(r"^reviewer(\d+)_(.+)$")
+score_pattern = r"^(\d+)"
+group_keys = ["venue", "subset", "category", "bucket"]
+
+
+def overall_category(venue):
+    return venues[venue]["overall"] or "score"
+
+def bucket_years(years, merged_year):
+    """Average citing years -> bucket labels: "until 2010", the merged bucket, else the year rounded up."""
+    start, stop, label = merged_year
+    rounded = np.ceil(years).astype(int).astype(str)
+    return np.select([years < 2010.5, (years >= start) & (years < stop)], ["until 2010", label], rounded)
+
+def bucket_order(buckets):
+    return sorted(buckets, key=lambda bucket: "0000" if bucket == "until 2010" else bucket)
+
+def long_scores(df, categories):
+    """Reviewer score columns -> one row per (paper, reviewer, category) with the parsed score."""
+    columns = [score_column_pattern.match(c) for c in df.columns]
+    columns = [m for m in columns if m and m.group(2) in categories]
+    raw = df[[m.group(0) for m in columns]].to_numpy(dtype=object).ravel(order="F")
+    # score cells repeat a handful of texts ("3: good", ...), so every distinct text is parsed once
+    codes, texts = pd.factorize(raw)
+    parsed = pd.Series(texts.astype(str)).str.extract(score_pattern)[0].astype(float).to_numpy()
+    return pd.DataFrame({
+        "paper": np.tile(np.arange(len(df)), len(columns)),
+        "reviewer": np.repeat([int(m.group(1)) for m in columns], len(df)),
+        "category": pd.Categorical(np.repeat([m.group(2) for m in columns], len(df)), categories=categories),
+        "score": np.where(codes >= 0, parsed[np.maximum(codes, 0)], np.nan),
+    })
+
+def load_subset(venue, subset):
+    """One row per (paper, category) of a venue subset: bucket of the paper and average score of its reviewers."""
+    schema = venues[venue]
+    path = schema["subsets"][subset]
+    df = load(path, columns=[c for c in column_names(path) if c == "average_year" or score_column_pattern.match(c)])
+    df = df[df["average_year"].notna()].reset_index(drop=True)
+    papers = long_scores(df, schema["categories"]).groupby(["paper", "category"], observed=True)["score"].mean().reset_index()
+    papers["category"] = papers["category"].astype(str)
+    if schema["overall"] is None:
+        # the overall score is the mean of the category averages of a paper
+        overall = papers.groupby("paper")["score"].mean().reset_index()
+        overall["category"] = "score"
+        papers = pd.concat([papers, overall], ignore_index=True)
+    papers["bucket"] = bucket_years(df["average_year"].to_numpy(), schema["merged_year"])[papers["paper"]]
+    papers.insert(0, "venue", venue)
+    papers.insert(1, "subset", subset)
+    return papers
+
+def load_study(venue_names=None):
+    """Paper scores of every venue and subset whose CSV is present, in one long table."""
+    tables = []
+    for venue in venue_names or venues:
+        for subset, path in venues[venue]["subsets"].items():
+            if not os.path.exists(path):
+                print(f"{venue} {subset}: {path} not found, skipped")
+                continue
+            tables.append(load_subset(venue, subset))
+    return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=["venue", "subset", "paper", "category", "score", "bucket"])
+
+
+def group_statistics(papers, n_bootstrap=10000, ci=95, method="percentile", random_seed=seed):
+    """Papers, scored papers and bootstrap mean/CI of every (venue, subset, category, bucket), from one groupby."""
+    groups = papers.groupby(group_keys, sort=True)["score"]
+    stats = groups.agg(papers="size", n="count").reset_index()
+    samples = [scores.dropna().to_numpy() for _, scores in groups]
+    stats["mean"], stats["lower"], stats["upper"] = intervals(samples, n_bootstrap, ci, method,
+                                                              np.random.default_rng(random_seed))
+    return stats
+
+def score_bins(papers):
+    """Chi-square bin of every paper score, e.g. "[2, 3)"; None outside the bins of its venue and category."""
+    labels = np.full(len(papers), None, dtype=object)
+    for venue in papers["venue"].unique():
+        schema = venues[venue]
+        in_venue = (papers["venue"] == venue).to_numpy()
+        is_overall = (papers["category"] == overall_category(venue)).to_numpy()
+        for bins, rows in ((schema["bins"], in_venue & ~is_overall), (schema["overall_bins"], in_venue & is_overall)):
+            # bins are closed on the left, like pd.cut(..., right=False)
+            codes = np.searchsorted(bins, papers["score"].to_numpy()[rows], side="right") - 1
+            names = np.array([f"[{low}, {high})" for low, high in zip(bins, bins[1:])] + [None], dtype=object)
+            labels[rows] = names[np.where((codes >= 0) & (codes < len(bins) - 1), codes, len(bins) - 1)]
+    return labels
+
+def chi_square_tests(papers, n_permutations=10000, correction="fdr_bh"):
+    """Bucket vs. binned score of every (venue, subset, category): chi-square, permutation p-value and the
+    permutation p-values corrected across all venues, subsets and categories (scripts/contingency.py)."""
+    binned = papers.assign(score_bin=score_bins(papers))
+    tests, _ = test_groups(binned, ["venue", "subset", "category"], "bucket", "score_bin", n_permutations, correction)
+    return tests
+
+
+def error_bars(rows):
+    # the mean of the resampled means can sit a rounding error outside the bounds of a one-paper bucket
+    return [np.clip(rows["mean"] - rows["lower"], 0, None), np.clip(rows["upper"] - rows["mean"], 0, None)]
+
+def finish(fig, output_dir, name, show):
+    fig.tight_layout()
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        fig.savefig(os.path.join(output_dir, name), dpi=150)
+    if show:
+        plt.show()
+    plt.close(fig)
+
+def plot_subset(stats, venue, subset, output_dir=None, show=False):
+    """The grouped category chart and the overall score chart of one venue subset."""
+    schema = venues[venue]
+    table = stats[(stats["venue"] == venue) & (stats["subset"] == subset)]
+    order = bucket_order(table["bucket"].unique())
+    x = np.arange(len(order))
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    width = 0.7 / len(schema["grouped"])
+    for i, (category, label) in enumerate(schema["grouped"].items()):
+        rows = table[table["category"] == category].set_index("bucket").reindex(order)
+        offset = (i - (len(schema["grouped"]) - 1) / 2) * width
+        ax.bar(x + offset, rows["mean"], width, yerr=error_bars(rows), capsize=5, label=label, color=colors[i % len(colors)])
+        if rows["mean"].notna().any():
+            # lowest and highest bar of every category, shifted up for the later ones
+            for kind, position in (("min", rows["mean"].argmin()), ("max", rows["mean"].argmax())):
+                value = rows["mean"].iloc[position]
+                ax.text(x[position] + offset, value + 0.05 + (0.05 if i else 0), f"{kind}: {value:.2f}",
+                        ha='center', fontsize=8, color='black')
+    counts = table.groupby("bucket")["papers"].max().reindex(order)
+    for i, count in enumerate(counts):
+        ax.text(i, schema["scale"][0] + 0.05, f'n={count}', ha='center', fontsize=8, rotation=90)
+    ax.set_xticks(x)
+    ax.set_xticklabels(order, rotation=0)
+    ax.set_title(f"Reviewer Scores For Different Average Citing Years ({venue}, {subset})")
+    ax.set_ylabel("Average Score")
+    ax.set_xlabel("Rounded Average Year")
+    ax.set_ylim(*schema["scale"])
+    ax.legend()
+    finish(fig, output_dir, f"{venue}_{subset}_scores.png", show)
+
+    rows = table[table["category"] == overall_category(venue)].set_index("bucket").reindex(order)
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.bar(x, rows["mean"], yerr=error_bars(rows), capsize=5, color="mediumseagreen")
+    if schema["highlight"] == "max":
+        max_mean = rows["mean"].max()
+        ax.axhline(max_mean, color="black", linestyle="--", linewidth=1)
+        ax.text(len(x) - 0.5, max_mean + 0.05, f"Highest Mean: {max_mean:.2f}", va='bottom', ha='right', fontsize=9)
+    else:
+        for bucket in schema["highlight"]:
+            if bucket in order:
+                mean_val = rows.loc[bucket, "mean"]
+                ax.axhline(y=mean_val, color="gray", linestyle="--", linewidth=1)
+                ax.text(x=order.index(bucket) + 0.25, y=mean_val + 0.1, s=f"{mean_val:.2f}", color="black", fontsize=8)
+    if schema["trend"]:
+        ax.plot(x, rows["mean"].to_numpy(), color="darkgreen", linestyle="--", marker="o")
+    for i, count in enumerate(rows["papers"]):
+        ax.text(i, schema["overall_scale"][0] + 0.05, f'n={count}', ha='center', fontsize=8, rotation=90)
+    ax.set_xticks(x)
+    ax.set_xticklabels(order, rotation=0)
+    ax.set_title(f"{schema['overall_label']} For Different Average Citing Years ({venue}, {subset})")
+    ax.set_ylabel("Average Score")
+    ax.set_xlabel("Rounded Average Year")
+    ax.set_ylim(*schema["overall_scale"])
+    finish(fig, output_dir, f"{venue}_{subset}_overall.png", show)
+
+
+def run(venue_names=None, n_bootstrap=10000, method="percentile", output_dir=None, show=False,
+        n_permutations=10000, correction="fdr_bh"):
+    """Load every venue and subset once, compute all group statistics and tests, draw every chart.
+
+    Returns the statistics and test tables."""
+    papers = load_study(venue_names)
+    stats = group_statistics(papers, n_bootstrap, method=method)
+    tests = chi_square_tests(papers, n_permutations, correction)
+    for venue, subset in stats[["venue", "subset"]].drop_duplicates().itertuples(index=False):
+        plot_subset(stats, venue, subset, output_dir, show)
+    for row in tests.itertuples(index=False):
+        print(f"Chi-square test for {row.venue} {row.subset} {row.category}:")
+        print(f"Chi2 statistic: {row.chi2:.3f}, p-value: {row.p:.4f}, degrees of freedom: {row.dof}")
+        print(f"Permutation p-value: {row.p_permutation:.4f}, {correction}-adjusted: {row.p_adjusted:.4f}")
+    return stats, tests
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Review scores by average citing year for every venue and subset.")
+    parser.add_argument("--venues", nargs="+", choices=list(venues), default=None, help="default: all venues")
+    parser.add_argument("--resamples", type=int, default=10000, help="bootstrap resamples")
+    parser.add_argument("--method", choices=["percentile", "bca"], default="percentile")
+    parser.add_argument("--permutations", type=int, default=10000, help="permutations per chi-square test (0: none)")
+    parser.add_argument("--correction", choices=["fdr_bh", "holm", "bonferroni"], default="fdr_bh",
+                        help="multiple-testing correction across all tests")
+    parser.add_argument("--output-dir", default="score_figures", help="where the charts are saved")
+    parser.add_argument("--show", action="store_true", help="also show every chart")
+    parser.add_argument("--stats", default=None, help="write the group statistics to this CSV")
+    args = parser.parse_args()
+
+    stats, tests = run(args.venues, args.resamples, args.method, args.output_dir, args.show,
+                       args.permutations, args.correction)
+    if args.stats:
+        stats.to_csv(args.stats, index=False)
@@ -1,23 +1,22 @@
+import argparse
 import os
-import pandas as pd
+import sys
+import time
 
-# path to the annotated data
-folder_path = r'C:\Users\zoehu\OneDrive - stud.uni-goettingen.de\Thesis\review-citation-bias\annotated_data'
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'RQ_A'))
+from response_labels import LabelStore, csv_files, labels_path, update
 
-# go through each file in the folder
-for file_name in os.listdir(folder_path):
-    if file_name.endswith('.csv'):  # Process only CSV files
-        file_path = os.path.join(folder_path, file_name)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Label the model responses of every CSV in a folder into the label table.")
+    parser.add_argument("folder", nargs="?", default=".", help="folder of the annotated data (default: current folder)")
+    parser.add_argument("--labels", default=labels_path, help="path to the SQLite label table")
+    args = parser.parse_args()
 
-        df = pd.read_csv(file_path)
-        
-        # check if the "response" column exists (only LM annotated versions have "response" column)
-        if 'response' in df.columns:
-            # add the "binary_label" column
-            df['binary_label'] = df['response'].apply(lambda x: 1 if 'yes' in str(x).lower() else 0)
-            
-            # Save the updated DataFrame back to the file
-            df.to_csv(file_path, index=False)
-            print(f"Updated file: {file_name}")
-        else:
-            print(f"'response' column not found in {file_name}")
+    # the CSVs are only read; labels go to the (file, id) table, and only files that changed are labelled again
+    start = time.perf_counter()
+    store = LabelStore(args.labels)
+    labelled, unchanged, without = update(csv_files(args.folder), store)
+    print(f"labelled {labelled} files, {unchanged} unchanged, {without} without a 'response' column "
+          f"in {time.perf_counter() - start:.2f} s")
+    print(f"deciding rules: {store.rule_counts()}")
+    store.close()
@@ -0,0 +1,92 @@
+import argparse
+import ast
+import json
+import os
+import random
+import tempfile
+import time
+import pandas as pd
+from data_layer import convert, load, load_years
+
+words = "learning neural networks attention graph language model robust efficient training via deep".split()
+fields = ["Computer Science", "Mathematics", "Medicine", "Physics", "Biology"]
+
+
+def write_csv(path, n_rows, seed=0, as_json=False):
+    """Synthetic processed CSV with a years column, paper_details (a Python repr, or JSON as s2.py now writes it)
+    and a few plain columns."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_rows):
+        years = [rng.randint(1990, 2023) for _ in range(rng.randint(5, 60))]
+        details = {"paperId": f"{i:040x}", "title": " ".join(rng.choice(words) for _ in range(8)),
+                   "abstract": " ".join(rng.choice(words) for _ in range(150)), "year": rng.randint(2000, 2023),
+                   "authors": [{"authorId": str(rng.randint(1, 10**8)), "name": f"Author {j}"} for j in range(4)],
+                   "fieldsOfStudy": rng.sample(fields, rng.randint(1, 2))}
+        rows.append({"filename": f"submission{i}.pdf", "extracted_years": ", ".join(map(str, years)),
+                     "average_year": sum(years) / len(years),
+                     "paper_details": json.dumps(details) if as_json else repr(details)})
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+def csv_years(path):
+    # what the violin plots did: read everything, split the strings, collect Python ints
+    df = pd.read_csv(path)
+    years = []
+    for years_string in df["extracted_years"].dropna():
+        years.extend(map(int, years_string.split(', ')))
+    return years
+
+def csv_fields(path):
+    # what field_of_study.py did: literal_eval every paper_details repr
+    df = pd.read_csv(path)
+    return [ast.literal_eval(d).get("fieldsOfStudy") for d in df["paper_details"]]
+
+def parquet_fields(path):
+    return [list(fields) for fields in load(path, columns=["details_fieldsOfStudy"])["details_fieldsOfStudy"]]
+
+def measure(function, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="read_csv + split/literal_eval vs. the typed Parquet data layer.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 10000, 40000], help="rows per file")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    print(f"{'rows':>7} {'csv MB':>7} {'parquet MB':>11} {'convert s':>10} {'json convert s':>15} {'csv years s':>12} {'pq years s':>11} "
+          f"{'csv details s':>14} {'pq details s':>13} {'csv frame MB':>13} {'pq frame MB':>12}")
+    for n_rows in args.sizes:
+        csv_path = os.path.join(tmp_dir, f"results{n_rows}.csv")
+        write_csv(csv_path, n_rows)
+        start = time.perf_counter()
+        parquet = convert(csv_path)
+        convert_time = time.perf_counter() - start
+        # the same file with JSON paper_details takes the vectorised fast path
+        json_path = os.path.join(tmp_dir, f"results{n_rows}_json.csv")
+        write_csv(json_path, n_rows, as_json=True)
+        start = time.perf_counter()
+        convert(json_path)
+        json_convert_time = time.perf_counter() - start
+        assert load(json_path, columns=["details_fieldsOfStudy"]).equals(load(csv_path, columns=["details_fieldsOfStudy"]))
+
+        csv_years_time, expected = measure(csv_years, csv_path)
+        pq_years_time, years = measure(load_years, csv_path, "extracted_years")
+        assert years.tolist() == expected, "years differ"
+        csv_details_time, expected = measure(csv_fields, csv_path, repeat=1)
+        pq_details_time, found = measure(parquet_fields, csv_path, repeat=1)
+        assert found == expected, "fields of study differ"
+
+        # in-memory size of the frames the scripts work on
+        csv_frame = pd.read_csv(csv_path)
+        csv_frame["extracted_years"] = csv_frame["extracted_years"].str.split(', ')
+        csv_mb = csv_frame.memory_usage(deep=True).sum() / 1024 / 1024
+        pq_mb = load(csv_path, columns=["filename", "extracted_years", "average_year"]).memory_usage(deep=True).sum() / 1024 / 1024
+        print(f"{n_rows:>7} {os.path.getsize(csv_path) / 1024 / 1024:>7.1f} {os.path.getsize(parquet) / 1024 / 1024:>11.1f} "
+              f"{convert_time:>10.2f} {json_convert_time:>15.2f} {csv_years_time:>12.3f} {pq_years_time:>11.3f} {csv_details_time:>14.2f} "
+              f"{pq_details_time:>13.2f} {csv_mb:>13.1f} {pq_mb:>12.1f}")
@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from merge_engine import MergeEngine, api1_decision_fields, write_json_array
+
+reviews_per_paper = 4
+
+
+def synthetic_notes(n_notes, seed=0):
+    """API1-style reviews, decisions and rebuttals for n_notes notes in total."""
+    rng = random.Random(seed)
+    n_papers = max(1, n_notes // (2 * reviews_per_paper + 1))
+    reviews, decisions, rebuttals = [], [], []
+    for paper in rng.sample(range(1, 10 * n_papers), n_papers):
+        forum = f"forum{paper}"
+        decisions.append({"id": f"d{paper}", "forum": forum,
+                          "invitation": f"ICLR.cc/2023/Conference/Paper{paper}/-/Decision",
+                          "content": {field: f"{field} of paper {paper}" for field in api1_decision_fields}})
+        for r in range(reviews_per_paper):
+            review_id = f"r{paper}_{r}"
+            reviews.append({"id": review_id, "forum": forum,
+                            "invitation": f"ICLR.cc/2023/Conference/Paper{paper}/-/Official_Review",
+                            "content": {"summary_of_the_paper": "text " * 50, "recommendation": "6"}})
+            rebuttals.append({"id": f"c{paper}_{r}", "forum": forum, "replyto": review_id,
+                              "invitation": f"ICLR.cc/2023/Conference/Paper{paper}/-/Official_Comment",
+                              "content": {"comment": "We thank the reviewer."}})
+    rng.shuffle(reviews)
+    rng.shuffle(decisions)
+    return reviews, decisions, rebuttals
+
+def nested_loop_merge(reviews, decisions):
+    # the previous merge_decisions: every review scans all decisions and re-splits their invitations
+    for review in reviews:
+        paper_id = review["invitation"].split("/")[3].replace("Paper", "")
+        found = False
+        for decision in decisions:
+            if paper_id == decision["invitation"].split("/")[3].replace("Paper", ""):
+                for field in api1_decision_fields:
+                    review["content"][field] = decision["content"].get(field, None)
+                found = True
+                break
+        if not found:
+            for field in api1_decision_fields:
+                review["content"][field] = None
+    return reviews
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nested-loop vs. hash-indexed review/decision merge.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 200000], help="notes per dump")
+    parser.add_argument("--nested-max", type=int, default=10000, help="largest size the nested loop is run on")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    print(f"{'notes':>8} {'reviews':>8} {'nested s':>9} {'engine s':>9} {'engine+rebuttals s':>19} {'streamed s':>11}")
+    for n_notes in args.sizes:
+        reviews, decisions, rebuttals = synthetic_notes(n_notes)
+
+        nested = "-"
+        if n_notes <= args.nested_max:
+            start = time.perf_counter()
+            expected = nested_loop_merge(json.loads(json.dumps(reviews)), decisions)
+            nested = f"{time.perf_counter() - start:.2f}"
+
+        start = time.perf_counter()
+        engine = MergeEngine(api=1)
+        engine.index_decisions(decisions)
+        merged = list(engine.merge(json.loads(json.dumps(reviews))))
+        engine_time = time.perf_counter() - start
+        if nested != "-":
+            assert merged == expected, "engine and nested loop disagree"
+
+        start = time.perf_counter()
+        engine = MergeEngine(api=1)
+        engine.index_decisions(decisions)
+        engine.index_rebuttals(rebuttals)
+        merged = list(engine.merge(json.loads(json.dumps(reviews))))
+        rebuttal_time = time.perf_counter() - start
+        assert all(r["content"]["rebuttals"] for r in merged)
+
+        # file to file, reviews streamed from disk
+        reviews_file = os.path.join(tmp_dir, "reviews.json")
+        decisions_file = os.path.join(tmp_dir, "decisions.json")
+        with open(reviews_file, 'w') as f:
+            json.dump(reviews, f)
+        with open(decisions_file, 'w') as f:
+            json.dump(decisions, f)
+        start = time.perf_counter()
+        engine = MergeEngine(api=1)
+        engine.index_decisions(decisions_file)
+        write_json_array(engine.merge(reviews_file), os.path.join(tmp_dir, "merged.json"))
+        streamed_time = time.perf_counter() - start
+
+        print(f"{n_notes:>8} {len(reviews):>8} {nested:>9} {engine_time:>9.2f} {rebuttal_time:>19.2f} {streamed_time:>11.2f}")
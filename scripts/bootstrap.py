@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+# default seed, so repeated runs of the venue scripts give the same intervals
+seed = 0
+# random numbers drawn at once for one sample; more resamples are drawn in chunks
+chunk_size = 4_000_000
+# draw multinomial counts instead of indices once a sample has this many values per distinct value
+# (one binomial per distinct value costs about as much as ten random indices)
+multinomial_ratio = 10
+
+
+def distinct_counts(samples):
+    """Distinct values and their frequencies of every sample, padded into two (samples x max distinct) arrays."""
+    uniques = [np.unique(np.asarray(s, dtype=float), return_counts=True) for s in samples]
+    width = max([len(u) for u, _ in uniques] + [1])
+    values = np.zeros((len(samples), width))
+    counts = np.zeros((len(samples), width), dtype=np.int64)
+    for k, (u, c) in enumerate(uniques):
+        values[k, :len(u)] = u
+        counts[k, :len(c)] = c
+    return values, counts
+
+def resampled_means(sample, n_bootstrap=1000, rng=None):
+    """n_bootstrap means of resamples (with replacement) of one sample; NaN for an empty sample.
+
+    Samples with few distinct values relative to their size (e.g. a year bucket of averaged review scores) are
+    drawn as multinomial counts of the distinct values, which has the same distribution as drawing n indices;
+    the others as an (n_bootstrap x n) index matrix. Either way in chunks of at most chunk_size numbers."""
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    sample = np.asarray(sample, dtype=float)
+    n = len(sample)
+    if n == 0:
+        return np.full(n_bootstrap, np.nan)
+    values, counts = np.unique(sample, return_counts=True)
+    use_counts = n > multinomial_ratio * len(values)
+    step = max(1, chunk_size // (len(values) if use_counts else n))
+    means = np.empty(n_bootstrap)
+    for start in range(0, n_bootstrap, step):
+        stop = min(start + step, n_bootstrap)
+        if use_counts:
+            means[start:stop] = rng.multinomial(n, counts / n, size=stop - start) @ values / n
+        else:
+            means[start:stop] = sample[rng.integers(0, n, size=(stop - start, n))].mean(axis=1)
+    return means
+
+def bootstrap_means(samples, n_bootstrap=1000, rng=None):
+    """(n_bootstrap x samples) matrix of resampled means, drawn one sample after another from the same generator."""
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    means = np.empty((n_bootstrap, len(samples)))
+    for k, sample in enumerate(samples):
+        means[:, k] = resampled_means(sample, n_bootstrap, rng)
+    return means
+
+def bca_levels(means, values, counts, ci):
+    """Lower and upper percentile levels (0-100) of the BCa interval of every sample."""
+    sizes = counts.sum(axis=1)
+    estimates = (values * counts).sum(axis=1) / np.maximum(sizes, 1)
+    # bias correction: share of resampled means below the sample mean
+    below = (means < estimates).mean(axis=0) + 0.5 * (means == estimates).mean(axis=0)
+    z0 = norm.ppf(np.clip(below, 1 / (len(means) + 1), len(means) / (len(means) + 1)))
+    # acceleration from the jackknife means; leaving out any copy of a distinct value gives the same mean
+    jackknife = (estimates[:, None] * sizes[:, None] - values) / np.maximum(sizes - 1, 1)[:, None]
+    deviation = ((jackknife * counts).sum(axis=1) / np.maximum(sizes, 1))[:, None] - jackknife
+    numerator = (counts * deviation ** 3).sum(axis=1)
+    denominator = 6 * (counts * deviation ** 2).sum(axis=1) ** 1.5
+    acceleration = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+    levels = []
+    for z in norm.ppf([(100 - ci) / 200, 1 - (100 - ci) / 200]):
+        levels.append(100 * norm.cdf(z0 + (z0 + z) / (1 - acceleration * (z0 + z))))
+    return levels
+
+def intervals(samples, n_bootstrap=1000, ci=95, method="percentile", rng=None):
+    """(means, lower, upper) arrays over the samples; method is "percentile" or "bca"."""
+    means = bootstrap_means(samples, n_bootstrap, rng)
+    if method == "percentile":
+        lower = np.percentile(means, (100 - ci) / 2, axis=0)
+        upper = np.percentile(means, 100 - (100 - ci) / 2, axis=0)
+    elif method == "bca":
+        values, counts = distinct_counts(samples)
+        lower_levels, upper_levels = bca_levels(means, values, counts, ci)
+        lower = np.array([np.percentile(means[:, k], lower_levels[k]) if counts[k].sum() else np.nan
+                          for k in range(len(samples))])
+        upper = np.array([np.percentile(means[:, k], upper_levels[k]) if counts[k].sum() else np.nan
+                          for k in range(len(samples))])
+    else:
+        raise ValueError(f"unknown method: {method}")
+    return means.mean(axis=0), lower, upper
+
+
+def bootstrap_ci(data, n_bootstrap=1000, ci=95, method="percentile", rng=None):
+    """Mean of the resampled means and the CI bounds of one sample, as the former per-script bootstrap_ci."""
+    mean, lower, upper = intervals([np.asarray(data, dtype=float)], n_bootstrap, ci, method, rng)
+    return mean[0], lower[0], upper[0]
+
+def bootstrap_table(df, group_column, value_columns, n_bootstrap=1000, ci=95, method="percentile", random_seed=seed):
+    """One row per group (sorted) with {column}_mean, _lower and _upper for every value column.
+
+    Missing values are dropped per column; every group and column is resampled in the same call."""
+    groups, samples = [], []
+    for group, subset in df.groupby(group_column, sort=True):
+        groups.append(group)
+        samples.extend(subset[column].dropna().to_numpy(dtype=float) for column in value_columns)
+    mean, lower, upper = intervals(samples, n_bootstrap, ci, method, np.random.default_rng(random_seed))
+    table = pd.DataFrame({group_column: groups})
+    for j, column in enumerate(value_columns):
+        table[f"{column}_mean"] = mean[j::len(value_columns)]
+        table[f"{column}_lower"] = lower[j::len(value_columns)]
+        table[f"{column}_upper"] = upper[j::len(value_columns)]
+    return table
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency
+
+# default seed of the permutation tests, so reruns give the same p-values
+seed = 0
+# cells of permuted tables held in memory at once; more permutations are drawn in chunks
+chunk_size = 4_000_000
+
+
+def contingency_tables(df, group_columns, row_column, column_column):
+    """{group key: crosstab of row_column vs. column_column} for every group, counted in one grouped pass.
+
+    Rows with a missing row or column value are left out, as in pd.crosstab; only observed values get a row or column."""
+    keys = list(group_columns)
+    counts = df.dropna(subset=[row_column, column_column]).groupby(keys + [row_column, column_column],
+                                                                   observed=True, sort=True).size()
+    tables = {}
+    for key, group in counts.groupby(level=list(range(len(keys))), sort=True):
+        tables[key] = group.droplevel(list(range(len(keys)))).unstack(fill_value=0)
+    return tables
+
+def pearson_statistics(tables, expected, yates=False):
+    """Pearson chi-square statistic of every table in a (..., rows, columns) stack.
+
+    yates=True applies the continuity correction chi2_contingency uses on tables with one degree of freedom:
+    every |observed - expected| shrinks by 0.5, but not below 0."""
+    deviation = np.abs(tables - expected)
+    if yates:
+        deviation = np.maximum(deviation - 0.5, 0)
+    return (deviation ** 2 / expected).sum(axis=(-2, -1))
+
+def permuted_tables(counts, size, rng):
+    """(size x rows x columns) stack of tables with the margins of counts, as from shuffling the column labels.
+
+    A shuffle of the labels makes the table multivariate hypergeometric, so every cell is drawn for all
+    permutations at once: row by row, each column takes its share of the row from the labels still left."""
+    n_rows, n_columns = counts.shape
+    stack = np.zeros((size, n_rows, n_columns), dtype=np.int64)
+    left = np.tile(counts.sum(axis=0), (size, 1))           # labels of every column not placed yet
+    for i, row_total in enumerate(counts.sum(axis=1)[:-1]):
+        need = np.full(size, row_total)
+        later = left.sum(axis=1)
+        for j in range(n_columns - 1):
+            later -= left[:, j]
+            stack[:, i, j] = rng.hypergeometric(left[:, j], later, need)
+            need -= stack[:, i, j]
+        stack[:, i, -1] = need
+        left -= stack[:, i]
+    stack[:, -1] = left
+    return stack
+
+def permutation_p_value(table, n_permutations=10000, rng=None, yates=True):
+    """Permutation p-value of the Pearson chi-square statistic of a contingency table.
+
+    Both margins stay fixed under a permutation, so every permuted table shares the expected counts of the
+    observed one; p = (1 + #{permuted statistic >= observed}) / (1 + n_permutations). On 2x2 tables the
+    statistic carries the Yates correction unless yates=False, as the chi2 of chi2_contingency does."""
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    counts = np.asarray(table, dtype=np.int64)
+    expected = counts.sum(axis=1, keepdims=True) * counts.sum(axis=0, keepdims=True) / counts.sum()
+    yates = yates and counts.shape == (2, 2)
+    observed = pearson_statistics(counts, expected, yates)
+    exceed = 0
+    step = max(1, chunk_size // counts.size)
+    for start in range(0, n_permutations, step):
+        stack = permuted_tables(counts, min(step, n_permutations - start), rng)
+        # a small tolerance so that permuted tables equal to the observed one count as "at least as extreme"
+        exceed += int((pearson_statistics(stack, expected, yates) >= observed - 1e-9).sum())
+    return (1 + exceed) / (1 + n_permutations)
+
+def adjust_p_values(p_values, method="fdr_bh"):
+    """Multiple-testing correction: "fdr_bh" (Benjamini-Hochberg), "holm" or "bonferroni"."""
+    p = np.asarray(p_values, dtype=float)
+    m = len(p)
+    if m == 0:
+        return p
+    if method == "bonferroni":
+        return np.minimum(p * m, 1)
+    order = np.argsort(p)
+    ranked = p[order]
+    if method == "holm":
+        ranked = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    elif method == "fdr_bh":
+        ranked = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"unknown correction: {method}")
+    adjusted = np.empty(m)
+    adjusted[order] = np.minimum(ranked, 1)
+    return adjusted
+
+
+def test_tables(tables, n_permutations=10000, correction="fdr_bh", random_seed=seed):
+    """Chi-square and permutation test of every table, with p-values corrected across all of them.
+
+    tables: {key: contingency table}. Returns one row per key with chi2, dof, p (asymptotic), p_permutation and
+    p_adjusted: the corrected permutation p-values, or the corrected asymptotic ones when n_permutations is 0.
+    Tables with a single row or column are not tested and get NaN."""
+    rng = np.random.default_rng(random_seed)
+    results = []
+    for key, table in tables.items():
+        row = {"key": key, "n": int(np.asarray(table).sum()), "chi2": np.nan, "dof": 0, "p": np.nan,
+               "p_permutation": np.nan}
+        if min(np.shape(table)) > 1:
+            row["chi2"], row["p"], row["dof"], _ = chi2_contingency(table)
+            row["p_permutation"] = permutation_p_value(table, n_permutations, rng) if n_permutations else np.nan
+        results.append(row)
+    results = pd.DataFrame(results, columns=["key", "n", "chi2", "dof", "p", "p_permutation"])
+    p_column = "p_permutation" if n_permutations else "p"
+    tested = results[p_column].notna()
+    results["p_adjusted"] = np.nan
+    results.loc[tested, "p_adjusted"] = adjust_p_values(results.loc[tested, p_column], correction)
+    return results
+
+def test_groups(df, group_columns, row_column, column_column, n_permutations=10000, correction="fdr_bh",
+                random_seed=seed):
+    """test_tables over the contingency tables of every group of df, with the group columns spelled out."""
+    tables = contingency_tables(df, group_columns, row_column, column_column)
+    results = test_tables(tables, n_permutations, correction, random_seed)
+    keys = pd.DataFrame(results.pop("key").tolist(), columns=list(group_columns))
+    return pd.concat([keys, results], axis=1), tables
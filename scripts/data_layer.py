@@ -0,0 +1,196 @@
+import argparse
+import ast
+import io
+import json
+import os
+import re
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+# columns stored in the CSVs as "2021, 2019" or "[2021, 2019]"; kept as native Arrow lists of years (or ages)
+list_columns = ["extracted_years", "suggested_years", "citation_age"]
+
+# small row groups so that filters on e.g. average_year can skip whole groups by their min/max statistics
+row_group_size = 4096
+
+# paper_details holds the Python repr of a Semantic Scholar response; kept as a struct
+details_column = "paper_details"
+details_type = pa.struct([
+    ("paperId", pa.string()),
+    ("title", pa.string()),
+    ("abstract", pa.string()),
+    ("year", pa.int32()),
+    ("authors", pa.list_(pa.struct([("authorId", pa.string()), ("name", pa.string())]))),
+    ("fieldsOfStudy", pa.list_(pa.string()))
+])
+# the fields analyses use, also stored as plain top-level columns (authors as a list of names)
+details_fields = ["title", "year", "authors", "fieldsOfStudy"]
+# bumped whenever the stored layout changes, so older Parquet copies are rebuilt
+layout_version = b"2"
+
+
+def parquet_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+def parse_list_column(values):
+    """Comma-joined numbers -> list<int16>, vectorised; empty or missing cells become null."""
+    text = pc.utf8_trim(pa.array(values, type=pa.string()), characters="[] ")
+    text = pc.if_else(pc.equal(text, ""), pa.scalar(None, pa.string()), text)
+    parts = pc.split_pattern(text, ",")
+    try:
+        years = pc.utf8_trim_whitespace(parts.flatten()).cast(pa.int16())
+        return pa.ListArray.from_arrays(parts.offsets, years, mask=parts.is_null())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # a stray token ("2019a", "n/a"): fall back to picking the numbers out row by row
+        return pa.array([None if v is None else [int(x) for x in re.findall(r"-?\d+", v)]
+                         for v in text.to_pylist()], type=pa.list_(pa.int16()))
+
+def details_field_column(field):
+    return "details_" + field
+
+def parse_details_value(value):
+    """One paper_details cell -> dict: json.loads for JSON strings, literal_eval for the older Python reprs.
+
+    Shared with paper_store.py; an already parsed dict is returned as is."""
+    if isinstance(value, dict):
+        return value
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        details = json.loads(value)
+    except ValueError:
+        try:
+            details = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return None
+    return details if isinstance(details, dict) else None
+
+def details_row(details):
+    year = details.get("year")
+    return {
+        "paperId": details.get("paperId"),
+        "title": details.get("title"),
+        "abstract": details.get("abstract"),
+        "year": int(year) if isinstance(year, (int, float)) else None,
+        "authors": [{"authorId": a.get("authorId"), "name": a.get("name")}
+                    for a in details.get("authors") or [] if isinstance(a, dict)],
+        "fieldsOfStudy": details.get("fieldsOfStudy")
+    }
+
+def json_details(values):
+    """JSON paper_details (as s2.py writes them) -> struct array, parsed in one go by Arrow's JSON reader."""
+    data = "\n".join(values).encode("utf-8")
+    options = pa_json.ParseOptions(explicit_schema=pa.schema(list(details_type)), unexpected_field_behavior="ignore")
+    table = pa_json.read_json(io.BytesIO(data), parse_options=options).combine_chunks()
+    if table.num_rows != len(values):
+        raise ValueError("JSON paper_details and rows do not line up")
+    return pa.StructArray.from_arrays([table.column(f.name).chunk(0) for f in details_type], fields=list(details_type))
+
+def details_struct(values):
+    """paper_details cells -> struct array with the fields listed in details_type.
+
+    JSON cells take the vectorised fast path; Python reprs (and anything the fast path rejects) are parsed row by row."""
+    json_rows = [i for i, v in enumerate(values) if isinstance(v, str) and v.startswith('{"')]
+    parsed = None
+    if json_rows:
+        try:
+            parsed = json_details([values[i] for i in json_rows])
+        except (pa.ArrowInvalid, ValueError):
+            json_rows = []
+    json_set = set(json_rows)
+    other_rows = [i for i in range(len(values)) if i not in json_set]
+    rows = []
+    for i in other_rows:
+        details = parse_details_value(values[i])
+        rows.append(details_row(details) if details is not None else None)
+    other = pa.array(rows, type=details_type)
+    if not json_rows:
+        return other
+    # stitch both parts back into the original row order
+    order = np.empty(len(values), dtype=np.int64)
+    order[json_rows] = np.arange(len(json_rows))
+    order[other_rows] = len(json_rows) + np.arange(len(other_rows))
+    return pa.concat_arrays([parsed, other]).take(pa.array(order))
+
+def details_columns(details):
+    """details_<field> columns for the fields in details_fields; authors are reduced to their names."""
+    # flatten() also applies the struct's own nulls to its children
+    children = dict(zip([f.name for f in details.type], details.flatten()))
+    columns = {}
+    for field in details_fields:
+        values = children[field]
+        if field == "authors":
+            values = pa.ListArray.from_arrays(values.offsets, values.values.field("name"), mask=values.is_null())
+        columns[details_field_column(field)] = values
+    return columns
+
+def csv_to_table(csv_path):
+    df = pd.read_csv(csv_path, low_memory=False)
+    special = [c for c in df.columns if c in list_columns or c == details_column]
+    table = pa.Table.from_pandas(df.drop(columns=special), preserve_index=False)
+    extra = {}
+    for column in special:
+        values = df[column].astype(object).where(df[column].notna(), None).tolist()
+        array = details_struct(values) if column == details_column else parse_list_column(values)
+        table = table.append_column(column, array)
+        if column == details_column:
+            extra = details_columns(array)
+    # keep the column order of the CSV, the flattened details fields go last
+    table = table.select(list(df.columns))
+    for name, array in extra.items():
+        table = table.append_column(name, array)
+    return table.replace_schema_metadata({**(table.schema.metadata or {}), b"data_layer": layout_version})
+
+def convert(csv_path, output_path=None):
+    """Write the typed Parquet copy of a processed CSV; returns its path."""
+    output_path = output_path or parquet_path(csv_path)
+    pq.write_table(csv_to_table(csv_path), output_path, compression="zstd", row_group_size=row_group_size)
+    return output_path
+
+def ensure_parquet(path):
+    """Path of the Parquet copy of a processed CSV, (re)built when missing, older than the CSV or of an older layout."""
+    if not path.endswith(".csv"):
+        return path
+    target = parquet_path(path)
+    if (not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(path)
+            or (pq.read_schema(target).metadata or {}).get(b"data_layer") != layout_version):
+        convert(path, target)
+    return target
+
+def column_names(path):
+    return pq.read_schema(ensure_parquet(path)).names
+
+def load_table(path, columns=None, filters=None):
+    """Arrow table of a processed CSV, read from its Parquet copy.
+
+    `columns` projects, `filters` (e.g. [("average_year", ">=", 2010)]) is pushed down to the row groups."""
+    return pq.read_table(ensure_parquet(path), columns=columns, filters=filters)
+
+def load(path, columns=None, filters=None):
+    """DataFrame of a processed CSV; list columns hold arrays of years, paper_details holds dicts.
+
+    details_title, details_year, details_authors and details_fieldsOfStudy hold the same fields as plain columns."""
+    table = load_table(path, columns, filters)
+    df = table.to_pandas()
+    if details_column in df.columns:
+        # to_pandas turns the nested lists into NumPy arrays; keep the plain dicts that literal_eval used to give
+        df[details_column] = table.column(details_column).to_pylist()
+    return df
+
+def load_years(path, column, filters=None):
+    """All values of a list column (e.g. every extracted year of a venue) as one flat NumPy array."""
+    return pc.list_flatten(load_table(path, [column], filters).column(column)).to_numpy()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert processed CSVs to typed Parquet.")
+    parser.add_argument("files", nargs="+", help="CSV files to convert; the Parquet copy is written next to each")
+    args = parser.parse_args()
+    for csv_path in args.files:
+        output_path = convert(csv_path)
+        print(f"{csv_path} -> {output_path} ({pq.ParquetFile(output_path).metadata.num_rows} rows, "
+              f"{os.path.getsize(csv_path) / 1024:.0f} KB -> {os.path.getsize(output_path) / 1024:.0f} KB)")
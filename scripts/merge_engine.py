@@ -0,0 +1,139 @@
+import json
+import os
+import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Preprocessing'))
+from openreview_stream import iter_records
+
+# API1 decision notes of ICLR 2023 carry the meta-review fields; they are copied into every review of the paper
+api1_decision_fields = [
+    "decision",
+    "metareview:_summary,_strengths_and_weaknesses",
+    "summary_of_AC-reviewer_meeting",
+    "justification_for_why_not_higher_score",
+    "justification_for_why_not_lower_score"
+]
+# API2 decision notes only have a decision and a comment, both wrapped as {"value": ...}
+api2_decision_fields = ["decision", "comment"]
+
+# '.../Paper123/-/Official_Review' (API1) or '.../Submission123/-/Decision' (API2) -> '123'
+paper_number_pattern = re.compile(r'^[^/]+/[^/]+/[^/]+/(?:Paper|Submission)(\d+)(?:/|$)')
+
+
+def paper_number(note):
+    """Submission number of a note, from its invitation (API1) or invitations (API2)."""
+    invitations = note.get("invitations") or [note.get("invitation", "")]
+    for invitation in invitations:
+        match = paper_number_pattern.match(invitation or "")
+        if match:
+            return match.group(1)
+    return None
+
+def iter_notes(source):
+    """Notes from a list, or streamed from a JSON file (or a JSON member of a zip)."""
+    if source is None:
+        return iter(())
+    if isinstance(source, (str, os.PathLike)):
+        return iter_records(source)
+    if isinstance(source, dict):
+        return iter([source])
+    return iter(source)
+
+def note_text(note, api):
+    """Main text of a rebuttal or comment note."""
+    content = note.get("content", {})
+    for key in ("rebuttal", "comment", "response"):
+        if key in content:
+            value = content[key]
+            return value.get("value") if api == 2 and isinstance(value, dict) else value
+    return None
+
+
+class MergeEngine:
+    """Join reviews with decisions, meta-reviews and rebuttals of the same paper.
+
+    Decisions, meta-reviews and rebuttals are indexed once by submission number (rebuttals also by the
+    note they reply to); reviews are then streamed through merge() in one linear pass."""
+
+    def __init__(self, api):
+        self.api = api
+        self.decisions = {}       # paper number -> decision fields
+        self.meta_reviews = {}    # paper number -> meta-review content
+        self.rebuttals = {}       # replyto id -> rebuttal texts
+
+    def index_decisions(self, source):
+        for note in iter_notes(source):
+            number = paper_number(note)
+            if number is None:
+                continue
+            content = note.get("content", {})
+            if self.api == 1:
+                # the first decision of a paper wins in API1 dumps, the last one in API2 dumps
+                if number in self.decisions:
+                    continue
+                self.decisions[number] = {field: content.get(field, None) for field in api1_decision_fields}
+            else:
+                self.decisions[number] = {field: {"value": content.get(field, {}).get("value", "None")}
+                                          for field in api2_decision_fields}
+        return len(self.decisions)
+
+    def index_meta_reviews(self, source):
+        for note in iter_notes(source):
+            number = paper_number(note)
+            if number is None:
+                continue
+            content = note.get("content", {})
+            if self.api == 2:
+                content = {key: value.get("value") if isinstance(value, dict) else value
+                           for key, value in content.items()}
+            self.meta_reviews[number] = content
+        return len(self.meta_reviews)
+
+    def index_rebuttals(self, source):
+        count = 0
+        for note in iter_notes(source):
+            text = note_text(note, self.api)
+            if text is None:
+                continue
+            # replies to a review belong to that review; replies to the forum belong to every review of the paper
+            self.rebuttals.setdefault(note.get("replyto"), []).append(text)
+            count += 1
+        return count
+
+    def _missing_decision(self):
+        if self.api == 1:
+            return {field: None for field in api1_decision_fields}
+        return {field: {"value": "None"} for field in api2_decision_fields}
+
+    def _wrap(self, value):
+        return {"value": value} if self.api == 2 else value
+
+    def merge_one(self, review):
+        content = review.setdefault("content", {})
+        number = paper_number(review)
+        content.update(self.decisions.get(number) or self._missing_decision())
+        if self.meta_reviews:
+            content["meta_review"] = self._wrap(self.meta_reviews.get(number))
+        if self.rebuttals:
+            texts = self.rebuttals.get(review.get("id"), []) + self.rebuttals.get(review.get("forum"), [])
+            content["rebuttals"] = self._wrap(texts)
+        return review
+
+    def merge(self, reviews):
+        """Yield the reviews with decision (and, if indexed, meta-review and rebuttals) added to their content."""
+        for review in iter_notes(reviews):
+            yield self.merge_one(review)
+
+
+def write_json_array(records, path, indent=2, ensure_ascii=True):
+    """Write records as a JSON array one at a time; same text as json.dump(list(records), f, indent=indent)."""
+    pad = " " * indent
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            text = json.dumps(record, indent=indent, ensure_ascii=ensure_ascii)
+            f.write(("[\n" if count == 0 else ",\n") + pad + text.replace("\n", "\n" + pad))
+            count += 1
+        f.write("\n]" if count else "[]")
+    return count
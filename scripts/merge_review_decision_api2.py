@@ -1,50 +1,18 @@
-import json
+from merge_engine import MergeEngine, write_json_array
 
-with open("ICLR2023.json", "r", encoding="utf-8") as f1, open("ICLR2023_decisions.json", "r", encoding="utf-8") as f2:
-    json1_list = json.load(f1)  # json1 contains multiple submissions
-    json2_list = json.load(f2)  # json2 contains multiple decisions
+# reviews are streamed from the JSON; decisions (and optionally meta-reviews and rebuttals) are indexed by submission once
+reviews_file = "ICLR2023.json"
+decisions_file = "ICLR2023_decisions.json"
+meta_reviews_file = None  # e.g. "NeurIPS2023_meta_reviews.json"
+rebuttals_file = None     # e.g. "NeurIPS2023_rebuttals.json"
+output_file = "ICLR2023_with_decision.json"
 
-# ensure json_list are lists
-if not isinstance(json1_list, list):
-    json1_list = [json1_list]
-if not isinstance(json2_list, list):
-    json2_list = [json2_list]
-
-# create a mapping of submission IDs to decisions
-json2_map = {}
-for json2 in json2_list:
-    # for each decision entry, extract the submission ID(s) from the invitations
-    submission_ids = [inv.split("/")[3] for inv in json2.get("invitations", []) if "Submission" in inv]
-
-    # map the submission ID to its decision and comment
-    for submission_id in submission_ids:
-        json2_map[submission_id] = {
-            "decision": {"value": json2["content"].get("decision", {}).get("value", "None")},
-            "comment": {"value": json2["content"].get("comment", {}).get("value", "None")}
-        }
+engine = MergeEngine(api=2)
+engine.index_decisions(decisions_file)
+engine.index_meta_reviews(meta_reviews_file)
+engine.index_rebuttals(rebuttals_file)
 
 # update review json with corresponding decisions
-for json1 in json1_list:
-    invitations = json1.get("invitations", [])
-    # extract the submission ID from the invitations
-    submission_ids = [inv.split("/")[3] for inv in invitations if "Submission" in inv]
-
-    # check if any of the submission IDs have corresponding decisions in json2_map
-    matched = False
-    for submission_id in submission_ids:
-        if submission_id in json2_map:
-            # update content with the matching decision and comment
-            json1["content"].update(json2_map[submission_id])
-            matched = True
-            break  # stop once a match is found
-
-    if not matched:
-        json1["content"].update({
-            "decision": {"value": "None"},
-            "comment": {"value": "None"}
-        })
-
-with open("ICLR2023_with_decision.json", "w", encoding="utf-8") as f:
-    json.dump(json1_list, f, indent=4, ensure_ascii=False)
+count = write_json_array(engine.merge(reviews_file), output_file, indent=4, ensure_ascii=False)
 
-print(f"Updated {len(json1_list)} submissions saved.")
+print(f"Updated {count} submissions saved.")